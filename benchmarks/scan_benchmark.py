@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Benchmark des moteurs de parcours disque sur une arborescence synthétique
+
+Usage:
+    python benchmarks/scan_benchmark.py [--depth 4] [--fanout 4] [--files 40]
+                                        [--sizes lognormal] [--hardlinks 0.05]
+                                        [--symlinks 0.02] [--seed 42] [--runs 3]
+                                        [--engines disk_analyzer,temp_scanner]
+                                        [--output resultats.json]
+                                        [--baseline reference.json] [--threshold 20]
+
+Moteurs mesurés:
+- disk_analyzer      : DiskAnalyzer.analyze_directory
+- disk_scanner_quick : DiskScannerThread.scan_directory (scan rapide)
+- disk_scanner_full  : DiskScannerThread.scan_directory (scan complet priorisé)
+- temp_scanner       : TempScanner._scan_directory
+- file_cleaner       : FileCleanerThread._clean_directory (sans mode sécurité,
+                       sur une copie régénérée à chaque lancement)
+
+L'arborescence est reproductible (même graine, mêmes fichiers): profondeur,
+nombre de sous-dossiers et de fichiers par dossier, distribution des tailles
+(fichiers creux: seules les métadonnées sont écrites), liens physiques et
+symboliques. Chaque moteur s'exécute dans un nouveau processus dont on lit le
+pic de mémoire (RSS); si strace est installé, un lancement supplémentaire
+compte les appels système (moins ceux de l'import et de l'initialisation).
+Les moteurs Qt (DiskScannerThread, FileCleanerThread) nécessitent PySide6.
+
+Le dossier de données de l'application est redirigé vers un dossier
+temporaire: les instantanés et index produits par le benchmark ne touchent
+pas ceux de l'utilisateur. Le script retourne 1 si un moteur est plus lent,
+fait plus d'appels système ou utilise plus de mémoire que la référence au-delà
+de --threshold %.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+SRC_DIR = os.path.join(ROOT_DIR, 'src')
+
+EXTENSIONS = ['.txt', '.log', '.tmp', '.jpg', '.png', '.dll', '.py', '.bak', '.dat', '.json', '']
+SIZE_DISTRIBUTIONS = ('lognormal', 'uniform', 'fixed')
+
+# Mesures comparées à la référence: (clé, sens d'une régression)
+COMPARED_METRICS = (('files_per_s', -1), ('syscalls', 1), ('peak_rss_kb', 1))
+
+
+# Arborescence synthétique
+
+def _file_size(rng, distribution):
+    if distribution == 'fixed':
+        return 4096
+    if distribution == 'uniform':
+        return rng.randint(0, 4 * 1024 * 1024)
+    # Beaucoup de petits fichiers, quelques très gros (jusqu'à 2 GB)
+    return min(int(rng.lognormvariate(9, 2.5)), 2 * 1024 ** 3)
+
+
+def generate_tree(target_dir, depth=4, fanout=4, files_per_dir=40, sizes='lognormal',
+                  hardlinks=0.05, symlinks=0.02, seed=42):
+    """Créer une arborescence reproductible sous target_dir, retourne son manifeste
+
+    Les liens symboliques de dossiers ne visent que des dossiers feuilles et
+    ne sont placés que dans des dossiers non feuilles: aucune boucle possible.
+    """
+    rng = random.Random(seed)
+    now = time.time()
+    manifest = {'files': 0, 'dirs': 0, 'bytes': 0, 'hardlinks': 0, 'symlinks': 0}
+    created_files = []
+    leaves = []
+    inner = []
+
+    stack = [(target_dir, 0)]
+    while stack:
+        path, level = stack.pop()
+        os.makedirs(path, exist_ok=True)
+        manifest['dirs'] += 1
+
+        for i in range(files_per_dir):
+            file_path = os.path.join(path, f"fichier_{i:04d}{rng.choice(EXTENSIONS)}")
+            if created_files and rng.random() < hardlinks:
+                try:
+                    os.link(rng.choice(created_files), file_path)
+                    manifest['hardlinks'] += 1
+                    manifest['files'] += 1
+                    continue
+                except OSError:
+                    pass
+            size = _file_size(rng, sizes)
+            with open(file_path, 'wb') as f:
+                f.truncate(size)
+            # Dates de modification réparties sur deux ans
+            mtime = now - rng.uniform(0, 2 * 365 * 24 * 3600)
+            os.utime(file_path, (mtime, mtime))
+            created_files.append(file_path)
+            manifest['files'] += 1
+            manifest['bytes'] += size
+
+        if level < depth:
+            inner.append(path)
+            for i in range(fanout):
+                stack.append((os.path.join(path, f"dossier_{level}_{i}"), level + 1))
+        else:
+            leaves.append(path)
+
+    link_count = int(manifest['files'] * symlinks)
+    for i in range(link_count):
+        try:
+            if i % 4 == 0 and leaves and inner:
+                os.symlink(rng.choice(leaves), os.path.join(rng.choice(inner), f"lien_dossier_{i}"),
+                           target_is_directory=True)
+            else:
+                target = rng.choice(created_files)
+                os.symlink(target, os.path.join(os.path.dirname(target), f"lien_{i}.lnk"))
+            manifest['symlinks'] += 1
+        except (OSError, NotImplementedError):
+            break  # Liens symboliques non autorisés (Windows sans privilège)
+    return manifest
+
+
+# Moteurs (exécutés dans le processus enfant)
+
+def _prepare_engine(name):
+    """Importer et construire le moteur, retourne une fonction tree -> fichiers vus"""
+    sys.path.insert(0, SRC_DIR)
+
+    if name == 'disk_analyzer':
+        from core.disk_analyzer import DiskAnalyzer
+        analyzer = DiskAnalyzer()
+        return lambda tree: analyzer.analyze_directory(tree, max_depth=64).get('file_count', 0)
+
+    if name in ('disk_scanner_quick', 'disk_scanner_full'):
+        from core.disk_scanner import DiskScannerThread
+        scan_type = 'quick' if name == 'disk_scanner_quick' else 'full'
+        return lambda tree: DiskScannerThread(tree, scan_type).scan_directory()['total_files']
+
+    if name == 'temp_scanner':
+        from core.temp_scanner import TempScanner
+        scanner = TempScanner()
+        return lambda tree: len(scanner._scan_directory(tree, 'Benchmark'))
+
+    if name == 'file_cleaner':
+        from gui_qt.components.file_scanner_threads import FileCleanerThread
+        cleaner = FileCleanerThread([], {}, {'safe_mode': False})
+        return lambda tree: cleaner._clean_directory(tree, '*', safe=False)[0]
+
+    raise ValueError(f"Moteur inconnu: {name}")
+
+
+ENGINES = ('disk_analyzer', 'disk_scanner_quick', 'disk_scanner_full', 'temp_scanner', 'file_cleaner')
+DESTRUCTIVE_ENGINES = ('file_cleaner',)
+
+
+def _peak_rss_kb():
+    """Pic de mémoire résidente du processus (KB), None si inconnu"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == 'darwin' else peak
+    except ImportError:
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset // 1024
+    except Exception:
+        return None
+
+
+def run_child(engine, tree, prepare_only):
+    """Point d'entrée du processus enfant: une mesure, résultat JSON sur stdout"""
+    try:
+        run = _prepare_engine(engine)
+    except ImportError as e:
+        print(json.dumps({'skipped': f"module manquant: {e.name}"}))
+        return 0
+    if prepare_only:
+        print(json.dumps({}))
+        return 0
+
+    start = time.perf_counter()
+    seen = run(tree)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({'seconds': elapsed, 'seen': seen, 'peak_rss_kb': _peak_rss_kb()}))
+    return 0
+
+
+# Mesures (processus parent)
+
+def _child_command(engine, tree, prepare_only=False):
+    command = [sys.executable, os.path.abspath(__file__), '--child', engine, '--tree', tree]
+    if prepare_only:
+        command.append('--prepare-only')
+    return command
+
+
+def _run_json(command, env, timeout):
+    completed = subprocess.run(command, env=env, capture_output=True, text=True, timeout=timeout)
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode != 0 or not lines:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip()
+                           else f"code de retour {completed.returncode}")
+    return json.loads(lines[-1])
+
+
+def parse_strace_summary(text):
+    """Nombre d'appels par appel système d'un résumé 'strace -c'"""
+    counts = {}
+    in_table = False
+    for line in text.splitlines():
+        if line.startswith('------'):
+            if in_table:
+                break
+            in_table = True
+            continue
+        tokens = line.split()
+        if not in_table or len(tokens) < 5:
+            continue
+        # % time, seconds, usecs/call, calls, [errors], syscall
+        try:
+            counts[tokens[-1]] = int(tokens[3])
+        except ValueError:
+            continue
+    return counts
+
+
+def count_syscalls(engine, tree, env, timeout):
+    """Appels système du moteur seul (lancement complet moins initialisation)"""
+    strace = shutil.which('strace')
+    if strace is None:
+        return None
+
+    totals = []
+    for prepare_only in (False, True):
+        with tempfile.NamedTemporaryFile('r', suffix='.strace', delete=False) as f:
+            summary_path = f.name
+        try:
+            _run_json([strace, '-f', '-c', '-o', summary_path]
+                      + _child_command(engine, tree, prepare_only), env, timeout)
+            with open(summary_path, 'r', encoding='utf-8', errors='replace') as f:
+                totals.append(parse_strace_summary(f.read()))
+        finally:
+            os.remove(summary_path)
+
+    full, baseline = totals
+    per_call = {name: count - baseline.get(name, 0) for name, count in full.items()}
+    per_call = {name: count for name, count in per_call.items() if count > 0}
+    return sum(per_call.values()), dict(sorted(per_call.items(), key=lambda item: item[1], reverse=True)[:8])
+
+
+def bench_engine(engine, tree_options, work_dir, runs, env, timeout, with_syscalls):
+    """Mesurer un moteur: médianes du débit et du pic RSS, appels système"""
+    shared_tree = os.path.join(work_dir, 'arbre')
+    destructive = engine in DESTRUCTIVE_ENGINES
+    measures = []
+    for i in range(runs):
+        tree = shared_tree
+        if destructive:
+            tree = os.path.join(work_dir, f"{engine}_{i}")
+            generate_tree(tree, **tree_options)
+        result = _run_json(_child_command(engine, tree), env, timeout)
+        if 'skipped' in result:
+            return {'skipped': result['skipped']}
+        measures.append(result)
+
+    syscalls = None
+    if with_syscalls:
+        tree = shared_tree
+        if destructive:
+            tree = os.path.join(work_dir, f"{engine}_strace")
+            generate_tree(tree, **tree_options)
+        syscalls = count_syscalls(engine, tree, env, timeout)
+
+    seconds = statistics.median(m['seconds'] for m in measures)
+    rss = [m['peak_rss_kb'] for m in measures if m['peak_rss_kb'] is not None]
+    return {
+        'seconds': seconds,
+        'seen': measures[0]['seen'],
+        'peak_rss_kb': statistics.median(rss) if rss else None,
+        'syscalls': syscalls[0] if syscalls else None,
+        'top_syscalls': syscalls[1] if syscalls else None,
+    }
+
+
+def compare(summary, baseline, threshold):
+    """Lister les mesures moins bonnes que la référence au-delà du seuil (%)"""
+    regressions = []
+    for engine, result in summary['engines'].items():
+        reference = baseline.get('engines', {}).get(engine)
+        if not reference or 'skipped' in result or 'skipped' in reference:
+            continue
+        for key, direction in COMPARED_METRICS:
+            value, ref = result.get(key), reference.get(key)
+            if not value or not ref:
+                continue
+            change = (value - ref) / ref * 100 * direction
+            if change > threshold:
+                regressions.append((engine, key, ref, value, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des moteurs de parcours disque")
+    parser.add_argument('--depth', type=int, default=4, help="Profondeur de l'arborescence")
+    parser.add_argument('--fanout', type=int, default=4, help="Sous-dossiers par dossier")
+    parser.add_argument('--files', type=int, default=40, help="Fichiers par dossier")
+    parser.add_argument('--sizes', choices=SIZE_DISTRIBUTIONS, default='lognormal',
+                        help="Distribution des tailles de fichiers")
+    parser.add_argument('--hardlinks', type=float, default=0.05, help="Part de liens physiques")
+    parser.add_argument('--symlinks', type=float, default=0.02, help="Part de liens symboliques")
+    parser.add_argument('--seed', type=int, default=42, help="Graine de génération")
+    parser.add_argument('--runs', type=int, default=3, help="Lancements par moteur")
+    parser.add_argument('--engines', default=','.join(ENGINES), help="Moteurs mesurés (séparés par des virgules)")
+    parser.add_argument('--no-syscalls', action='store_true', help="Ne pas compter les appels système")
+    parser.add_argument('--timeout', type=float, default=600, help="Délai maximal par lancement (s)")
+    parser.add_argument('--output', help="Écrire le résumé JSON dans ce fichier")
+    parser.add_argument('--baseline', help="Résumé JSON de référence à comparer")
+    parser.add_argument('--threshold', type=float, default=20, help="Régression tolérée (%%)")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--tree', help=argparse.SUPPRESS)
+    parser.add_argument('--prepare-only', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return run_child(args.child, args.tree, args.prepare_only)
+
+    engines = [name.strip() for name in args.engines.split(',') if name.strip()]
+    unknown = [name for name in engines if name not in ENGINES]
+    if unknown:
+        parser.error(f"moteur(s) inconnu(s): {', '.join(unknown)}")
+
+    tree_options = {
+        'depth': args.depth, 'fanout': args.fanout, 'files_per_dir': args.files,
+        'sizes': args.sizes, 'hardlinks': args.hardlinks, 'symlinks': args.symlinks,
+        'seed': args.seed,
+    }
+    with_syscalls = not args.no_syscalls and shutil.which('strace') is not None
+
+    with tempfile.TemporaryDirectory(prefix='nettoyeur_bench_') as work_dir:
+        # Dossier de données de l'application isolé (instantanés, index)
+        data_home = os.path.join(work_dir, 'donnees')
+        os.makedirs(data_home)
+        env = dict(os.environ, HOME=data_home, USERPROFILE=data_home, LOCALAPPDATA=data_home)
+
+        start = time.perf_counter()
+        manifest = generate_tree(os.path.join(work_dir, 'arbre'), **tree_options)
+        print(f"Arborescence : {manifest['files']:,} fichiers, {manifest['dirs']:,} dossiers, "
+              f"{manifest['hardlinks']:,} liens physiques, {manifest['symlinks']:,} liens symboliques "
+              f"({time.perf_counter() - start:.1f}s)")
+        if not with_syscalls and not args.no_syscalls:
+            print("strace introuvable: appels système non comptés")
+
+        summary = {'tree': dict(tree_options, **manifest), 'runs': args.runs,
+                   'python': sys.version.split()[0], 'platform': sys.platform, 'engines': {}}
+        for engine in engines:
+            result = bench_engine(engine, tree_options, work_dir, args.runs, env, args.timeout, with_syscalls)
+            if 'skipped' not in result:
+                # Débit d'après les fichiers réellement vus par le moteur (un scan
+                # rapide limité en profondeur n'en voit qu'une partie)
+                result['files_per_s'] = (result['seen'] or 0) / max(result['seconds'], 1e-9)
+            summary['engines'][engine] = result
+
+    print()
+    for engine, result in summary['engines'].items():
+        if 'skipped' in result:
+            print(f"  {engine:<20} ignoré ({result['skipped']})")
+            continue
+        rss = f"{result['peak_rss_kb'] / 1024:.1f} MB" if result['peak_rss_kb'] else "?"
+        syscalls = f"{result['syscalls']:,}" if result['syscalls'] is not None else "-"
+        print(f"  {engine:<20} {result['seconds']:8.3f}s {result['seen'] or 0:10,} vus "
+              f"{result['files_per_s']:12,.0f} fichiers/s RSS max {rss:>10}  appels système {syscalls}")
+        if result['top_syscalls']:
+            print("  " + " " * 20 + ", ".join(f"{name}={count:,}" for name, count in result['top_syscalls'].items()))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('tree', {}).get('files') != summary['tree']['files']:
+            print("Attention: la référence a été mesurée sur une autre arborescence")
+        regressions = compare(summary, baseline, args.threshold)
+        for engine, key, ref, value, change in regressions:
+            print(f"RÉGRESSION {engine} {key}: {ref:,.0f} -> {value:,.0f} (dégradation de {change:.0f}%)")
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark du parseur SMART sur des sorties 'smartctl -j' enregistrées
+
+Usage:
+    python benchmarks/smart_parser_benchmark.py [--fixtures DOSSIER] [--count N]
+
+Sans --fixtures, les exemples NVMe/ATA/SAT de benchmarks/fixtures/smart sont
+dupliqués (numéros de série et compteurs variés) pour obtenir N fichiers.
+Aucun disque ni smartctl n'est nécessaire.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from core.smart_data import parse_smartctl_json
+from core.smart_backends import ReplayBackend
+from core.smart_collector import SmartCollector
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'smart')
+
+
+def generate_fixtures(target_dir, count):
+    """Générer count fixtures à partir des exemples enregistrés"""
+    templates = []
+    for filename in sorted(os.listdir(FIXTURES_DIR)):
+        if filename.endswith('.json'):
+            with open(os.path.join(FIXTURES_DIR, filename), 'r', encoding='utf-8') as f:
+                templates.append(json.load(f))
+
+    for i in range(count):
+        data = json.loads(json.dumps(templates[i % len(templates)]))
+        data['device']['name'] = f"/dev/replay{i}"
+        data['serial_number'] = f"{data.get('serial_number', 'SN')}-{i}"
+        data['power_on_time'] = {'hours': 1000 + i}
+        nvme = data.get('nvme_smart_health_information_log')
+        if nvme:
+            nvme['data_units_written'] += i * 1000
+        with open(os.path.join(target_dir, f"device_{i:06d}.json"), 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+
+def bench_parse(fixtures_dir):
+    """Mesurer le décodage JSON + parse_smartctl_json seuls (fichiers déjà en mémoire)"""
+    payloads = []
+    for filename in os.listdir(fixtures_dir):
+        if filename.endswith('.json'):
+            with open(os.path.join(fixtures_dir, filename), 'r', encoding='utf-8') as f:
+                payloads.append(f.read())
+
+    start = time.perf_counter()
+    for payload in payloads:
+        parse_smartctl_json(json.loads(payload), 'bench')
+    elapsed = time.perf_counter() - start
+    return len(payloads), elapsed
+
+
+def bench_collector(fixtures_dir, workers):
+    """Mesurer la collecte complète via SmartCollector et la source de rejeu"""
+    collector = SmartCollector(max_workers=workers, backend=ReplayBackend(fixtures_dir))
+
+    start = time.perf_counter()
+    results = collector.read_all()
+    elapsed = time.perf_counter() - start
+
+    errors = sum(1 for result in results.values() if isinstance(result, Exception))
+    return len(results), errors, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du parseur SMART (rejeu de fixtures)")
+    parser.add_argument('--fixtures', help="Dossier de sorties 'smartctl -j' enregistrées")
+    parser.add_argument('--count', type=int, default=5000, help="Nombre de fixtures générées")
+    parser.add_argument('--workers', type=int, default=4, help="Lectures concurrentes du collecteur")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fixtures_dir = args.fixtures
+        if not fixtures_dir:
+            fixtures_dir = tmp_dir
+            generate_fixtures(fixtures_dir, args.count)
+
+        count, elapsed = bench_parse(fixtures_dir)
+        print(f"Parseur    : {count} fixtures en {elapsed:.3f}s ({count / max(elapsed, 1e-9):,.0f}/s)")
+
+        count, errors, elapsed = bench_collector(fixtures_dir, args.workers)
+        print(f"Collecteur : {count} disques en {elapsed:.3f}s ({count / max(elapsed, 1e-9):,.0f}/s), {errors} erreurs")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
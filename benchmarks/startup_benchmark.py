@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark du temps de démarrage de l'interface Qt (sans affichage)
+
+Usage:
+    python benchmarks/startup_benchmark.py [--runs N] [--entry main_qt.py]
+                                           [--output resultats.json]
+                                           [--baseline reference.json] [--threshold 20]
+
+Chaque lancement se fait dans un nouveau processus avec QT_QPA_PLATFORM=offscreen
+et le profileur de démarrage (core.startup_profiler) activé; l'application
+quitte dès la première image. Les médianes par phase sont comparées à une
+référence: le script retourne 1 si une phase dépasse la référence de plus de
+--threshold %.
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Phases ignorées lors de la comparaison: trop courtes pour être significatives
+MIN_COMPARED_MS = 5.0
+
+
+def run_once(entry, timeout):
+    """Lancer l'application une fois et lire son rapport de démarrage"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        report_path = os.path.join(tmp_dir, 'startup_profile.json')
+        env = dict(os.environ)
+        env['QT_QPA_PLATFORM'] = 'offscreen'
+        env['NETTOYEUR_STARTUP_PROFILE'] = report_path
+        env['NETTOYEUR_STARTUP_PROFILE_EXIT'] = '1'
+
+        subprocess.run(
+            [sys.executable, os.path.join(ROOT_DIR, entry)],
+            cwd=ROOT_DIR,
+            env=env,
+            capture_output=True,
+            timeout=timeout
+        )
+        if not os.path.exists(report_path):
+            raise RuntimeError(f"Aucun rapport produit par {entry}")
+        with open(report_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+
+def summarize(reports):
+    """Médiane de chaque phase, total et imports les plus longs"""
+    phases = {}
+    for report in reports:
+        for phase in report['phases']:
+            phases.setdefault(phase['name'], []).append(phase['duration_ms'])
+
+    imports = {}
+    for report in reports:
+        for entry in report['imports']:
+            imports.setdefault(entry['module'], []).append(entry['self_ms'])
+
+    top_imports = sorted(
+        ((module, statistics.median(values)) for module, values in imports.items()),
+        key=lambda item: item[1], reverse=True
+    )[:15]
+
+    return {
+        'runs': len(reports),
+        'python': reports[0]['python'],
+        'platform': reports[0]['platform'],
+        'total_ms': statistics.median(report['total_ms'] for report in reports),
+        'phases': {name: statistics.median(values) for name, values in phases.items()},
+        'imports': {module: value for module, value in top_imports},
+    }
+
+
+def compare(summary, baseline, threshold):
+    """Lister les phases plus lentes que la référence au-delà du seuil (%)"""
+    regressions = []
+    checks = dict(summary['phases'])
+    checks['total'] = summary['total_ms']
+    reference = dict(baseline.get('phases', {}))
+    reference['total'] = baseline.get('total_ms')
+
+    for name, value in checks.items():
+        ref = reference.get(name)
+        if not ref or ref < MIN_COMPARED_MS:
+            continue
+        change = (value - ref) / ref * 100
+        if change > threshold:
+            regressions.append((name, ref, value, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du démarrage de l'interface Qt (offscreen)")
+    parser.add_argument('--runs', type=int, default=5, help="Nombre de lancements")
+    parser.add_argument('--entry', default='main_qt.py', help="Point d'entrée (main_qt.py ou src/main.py)")
+    parser.add_argument('--timeout', type=float, default=120, help="Délai maximal par lancement (s)")
+    parser.add_argument('--output', help="Écrire le résumé JSON dans ce fichier")
+    parser.add_argument('--baseline', help="Résumé JSON de référence à comparer")
+    parser.add_argument('--threshold', type=float, default=20, help="Régression tolérée (%%)")
+    args = parser.parse_args()
+
+    reports = []
+    for i in range(args.runs):
+        report = run_once(args.entry, args.timeout)
+        reports.append(report)
+        print(f"Lancement {i + 1}/{args.runs} : {report['total_ms']:.1f} ms")
+
+    summary = summarize(reports)
+    print(f"\nMédiane totale : {summary['total_ms']:.1f} ms")
+    for name, value in summary['phases'].items():
+        print(f"  {name:<28} {value:8.1f} ms")
+    print("\nImports les plus longs (temps propre) :")
+    for module, value in summary['imports'].items():
+        print(f"  {module:<40} {value:8.1f} ms")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(summary, baseline, args.threshold)
+        for name, ref, value, change in regressions:
+            print(f"RÉGRESSION {name}: {ref:.1f} ms -> {value:.1f} ms (+{change:.0f}%)")
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Serveur HTTP local imitant l'API text-to-speech d'ElevenLabs (pour tty.py)
+
+Usage:
+    python benchmarks/tts_stub_server.py [--port 8765] [--latency 0.2]
+                                         [--size 32768] [--rate-limit 10]
+                                         [--truncate 20]
+
+Puis, dans un autre terminal:
+    ELEVENLABS_API_KEY=test ELEVENLABS_API_URL=http://127.0.0.1:8765 python tty.py
+
+Chaque synthèse renvoie des octets déterministes (dépendant du texte et de
+la voix). Avec --rate-limit N, une requête sur N reçoit une réponse 429 avec
+un en-tête Retry-After, pour vérifier la gestion des limites de débit. Avec
+--truncate N, une synthèse sur N est coupée avant la fin annoncée par
+Content-Length, pour vérifier qu'aucun MP3 tronqué n'est conservé.
+"""
+
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubState:
+    """Compteurs partagés par les requêtes"""
+
+    def __init__(self, latency, size, rate_limit, retry_after, truncate=0):
+        self.latency = latency
+        self.truncate = truncate
+        self.size = size
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.syntheses = 0
+        self.rejected = 0
+        self.truncated = 0
+
+
+def make_audio(text, voice_id, size):
+    """Faux MP3: en-tête ID3 suivi d'octets dérivés du texte et de la voix"""
+    seed = hashlib.sha256(f"{voice_id}:{text}".encode('utf-8')).digest()
+    body = (seed * (size // len(seed) + 1))[:max(0, size - 10)]
+    return b'ID3\x04\x00\x00\x00\x00\x00\x00' + body
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=b'', content_type="application/json", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        # Vérification de voix: GET /v1/text-to-speech/<voix>/settings
+        if self.path.startswith("/v1/text-to-speech/") and self.path.endswith("/settings"):
+            self._send(200, json.dumps({"stability": 0.4, "similarity_boost": 0.8}).encode())
+        else:
+            self._send(404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length)
+
+        if not self.path.startswith("/v1/text-to-speech/"):
+            self._send(404)
+            return
+
+        state = self.state
+        with state.lock:
+            state.requests += 1
+            limited = state.rate_limit and state.requests % state.rate_limit == 0
+            if limited:
+                state.rejected += 1
+            else:
+                state.syntheses += 1
+            cut = (not limited and state.truncate
+                   and state.syntheses % state.truncate == 0)
+            if cut:
+                state.truncated += 1
+
+        if limited:
+            self._send(429, b'{"detail": "too_many_concurrent_requests"}',
+                       headers={"Retry-After": str(state.retry_after)})
+            return
+
+        try:
+            payload = json.loads(raw or b'{}')
+        except ValueError:
+            self._send(400)
+            return
+
+        voice_id = self.path[len("/v1/text-to-speech/"):].split("?", 1)[0]
+        if state.latency:
+            time.sleep(state.latency)
+        audio = make_audio(payload.get("text", ""), voice_id, state.size)
+
+        if cut:
+            # Annoncer tout l'audio, n'en envoyer que la moitié puis couper la connexion
+            self.send_response(200)
+            self.send_header("Content-Type", "audio/mpeg")
+            self.send_header("Content-Length", str(len(audio)))
+            self.end_headers()
+            self.wfile.write(audio[:len(audio) // 2])
+            self.close_connection = True
+            return
+
+        self._send(200, audio, "audio/mpeg")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur local imitant l'API TTS d'ElevenLabs")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.2, help="Durée simulée d'une synthèse (s)")
+    parser.add_argument('--size', type=int, default=32768, help="Taille de l'audio renvoyé (octets)")
+    parser.add_argument('--rate-limit', type=int, default=0, help="Répondre 429 à une requête sur N")
+    parser.add_argument('--retry-after', type=float, default=0.5, help="Valeur de Retry-After (s)")
+    parser.add_argument('--truncate', type=int, default=0, help="Couper une synthèse sur N")
+    args = parser.parse_args()
+
+    StubHandler.state = StubState(args.latency, args.size, args.rate_limit, args.retry_after, args.truncate)
+    server = ThreadingHTTPServer((args.host, args.port), StubHandler)
+    print(f"Serveur TTS de test sur http://{args.host}:{args.port} (Ctrl+C pour arrêter)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        state = StubHandler.state
+        print(f"\n{state.requests} requêtes, {state.syntheses} synthèses, "
+              f"{state.rejected} réponses 429, {state.truncated} coupées")
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,21 @@
 import sys
 import os
-from PySide6.QtWidgets import QApplication
 
 # Ajouter le répertoire src au chemin Python
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
+# Importé en premier: référence des mesures du temps de démarrage
+from core import startup_profiler
+
+from PySide6.QtWidgets import QApplication
+startup_profiler.mark("import_pyside6")
+
 from gui_qt.main_window_ui import MainWindowUI
+startup_profiler.mark("import_main_window")
 
 def main():
     app = QApplication(sys.argv)
+    startup_profiler.mark("qapplication")
     win = MainWindowUI()
     win.show()
     sys.exit(app.exec())
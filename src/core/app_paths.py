@@ -0,0 +1,21 @@
+"""
+Chemins des données locales de l'application (index, caches, historiques)
+"""
+
+import os
+
+
+def get_data_dir() -> str:
+    """Obtenir (et créer si besoin) le dossier de données de l'application"""
+    if os.name == 'nt' and 'LOCALAPPDATA' in os.environ:
+        base = os.path.join(os.environ['LOCALAPPDATA'], 'NettoyeurRapide')
+    else:
+        base = os.path.join(os.path.expanduser('~'), '.nettoyeur_rapide')
+
+    os.makedirs(base, exist_ok=True)
+    return base
+
+
+def get_data_path(filename: str) -> str:
+    """Obtenir le chemin d'un fichier dans le dossier de données"""
+    return os.path.join(get_data_dir(), filename)
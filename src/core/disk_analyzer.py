@@ -11,6 +11,8 @@ from typing import Dict, List, Tuple, Optional, Generator
 from collections import defaultdict, Counter
 import mimetypes
 
+from .path_table import build_path_table
+
 class DiskAnalyzer:
     """Classe pour analyser l'utilisation du disque"""
 
@@ -120,33 +122,20 @@ class DiskAnalyzer:
             if time.time() - cache_time < 300:  # Cache de 5 minutes
                 return cached_files[:limit]
 
+        # Les chemins complets ne sont reconstruits que pour les fichiers retenus
         largest_files = []
-
-        try:
-            for root, dirs, files in os.walk(path):
-                for file in files:
-                    try:
-                        file_path = os.path.join(root, file)
-                        file_size = os.path.getsize(file_path)
-
-                        if file_size >= min_size:
-                            largest_files.append({
-                                'path': file_path,
-                                'name': file,
-                                'size': file_size,
-                                'size_formatted': self.format_size(file_size),
-                                'directory': root,
-                                'extension': os.path.splitext(file)[1].lower()
-                            })
-
-                    except (OSError, PermissionError):
-                        continue
-
-        except (OSError, PermissionError):
-            pass
-
-        # Trier par taille
-        largest_files.sort(key=lambda x: x['size'], reverse=True)
+        with build_path_table(path, min_size) as table:
+            for index in table.largest(limit):
+                file_name = table.file_name(index)
+                file_size = table.file_size(index)
+                largest_files.append({
+                    'path': table.file_path(index),
+                    'name': file_name,
+                    'size': file_size,
+                    'size_formatted': self.format_size(file_size),
+                    'directory': table.dir_path(table.file_dir(index)),
+                    'extension': os.path.splitext(file_name)[1].lower()
+                })
 
         # Mettre en cache
         self.large_files_cache[cache_key] = (time.time(), largest_files)
@@ -295,27 +284,19 @@ class DiskAnalyzer:
         if not os.path.exists(path):
             return {}
 
-        # Grouper les fichiers par taille
+        # Grouper les fichiers par taille: seules les tailles partagées par
+        # plusieurs fichiers donnent lieu à la reconstruction des chemins
         size_groups = defaultdict(list)
 
-        try:
-            for root, dirs, files in os.walk(path):
-                for file in files:
-                    try:
-                        file_path = os.path.join(root, file)
-                        file_size = os.path.getsize(file_path)
-
-                        if file_size >= min_size:
-                            size_groups[file_size].append({
-                                'path': file_path,
-                                'name': file,
-                                'size': file_size
-                            })
-                    except (OSError, PermissionError):
-                        continue
-
-        except (OSError, PermissionError):
-            pass
+        with build_path_table(path, min_size) as table:
+            shared_sizes = {size for size, count in Counter(table.iter_sizes()).items() if count > 1}
+            for index, _, file_size, _ in table.iter_files():
+                if file_size in shared_sizes:
+                    size_groups[file_size].append({
+                        'path': table.file_path(index),
+                        'name': table.file_name(index),
+                        'size': file_size
+                    })
 
         # Vérifier les doublons potentiels (même taille)
         duplicates = {}
@@ -1,11 +1,23 @@
 #!/usr/bin/env python3
 """
 DiskScannerThread - Thread pour scanner les disques en arrière-plan
+DiskExportThread - Thread pour exporter l'inventaire complet d'une analyse
+DiskWatchThread - Thread de suivi en direct d'un dossier analysé
 """
 
 import os
+import time
+import struct
+from array import array
 from PySide6.QtCore import QThread, Signal
 
+from .disk_analyzer import DiskAnalyzer
+from .scan_scheduler import ScanIndex, TraversalScheduler
+from .scan_export import iter_file_records, export_records, ExportCancelled
+from .scan_snapshot import list_snapshots, save_snapshot, diff_snapshots, snapshot_profile
+from .fs_watcher import LiveScanState, FsWatcher, create_backend
+from .path_table import PathTable, ROOT_ID
+
 
 class DiskScannerThread(QThread):
     """Thread pour scanner les disques en arrière-plan"""
@@ -13,11 +25,17 @@ class DiskScannerThread(QThread):
     scan_completed = Signal(dict)
     error_occurred = Signal(str)
 
-    def __init__(self, disk_path, scan_type="quick"):
+    def __init__(self, disk_path, scan_type="quick", time_budget=None):
         super().__init__()
         self.disk_path = disk_path
         self.scan_type = scan_type
+        self.time_budget = time_budget  # Secondes, None = pas de limite
         self.is_cancelled = False
+        self._dir_sizes = None  # (chemin, taille cumulée) de tous les dossiers (scan priorisé)
+        # (chemin, profondeur, fichiers, taille des fichiers) de chaque dossier parcouru:
+        # état initial du suivi en direct (LiveScanState.from_scan)
+        self.live_seed = []
+        self.live_large_files = []  # Tous les gros fichiers, avant la coupe du top 20
 
     def run(self):
         try:
@@ -36,7 +54,13 @@ class DiskScannerThread(QThread):
             'file_types': {},
             'large_files': [],
             'directories': [],
-            'scan_time': None
+            'scan_time': None,
+            'partial': False,
+            'coverage': None,
+            'root': self.disk_path,
+            'max_depth': None,
+            'snapshot': None,
+            'changes': None
         }
 
         try:
@@ -44,17 +68,26 @@ class DiskScannerThread(QThread):
             results['scan_time'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
             max_depth = 2 if self.scan_type == "quick" else 10
+            results['max_depth'] = max_depth
 
             # Émettre progression initiale
             self.progress_updated.emit(0, "Début de l'analyse...")
 
-            self._scan_recursive(self.disk_path, results, 0, max_depth)
+            if self.time_budget or self.scan_type == "full":
+                self._scan_prioritized(results, max_depth)
+            else:
+                self._scan_recursive(self.disk_path, results, 0, max_depth)
 
             # Trier les gros fichiers
             self.progress_updated.emit(90, "Tri des résultats...")
             results['large_files'].sort(key=lambda x: x[1], reverse=True)
+            self.live_large_files = results['large_files']
             results['large_files'] = results['large_files'][:20]  # Top 20
 
+            if not self.is_cancelled:
+                self.progress_updated.emit(95, "Comparaison avec l'analyse précédente...")
+                self._save_snapshot(results)
+
             self.progress_updated.emit(100, "Analyse terminée")
 
         except Exception as e:
@@ -62,6 +95,17 @@ class DiskScannerThread(QThread):
 
         return results
 
+    def _save_snapshot(self, results):
+        """Enregistrer l'instantané du scan et le comparer au précédent du même profil"""
+        profile = snapshot_profile(self.scan_type, results['max_depth'], self.time_budget)
+        try:
+            previous = list_snapshots(self.disk_path, profile)
+            results['snapshot'] = save_snapshot(results, self._dir_sizes, profile=profile)
+            if previous:
+                results['changes'] = diff_snapshots(previous[-1], results['snapshot'], top=10)
+        except (OSError, ValueError, struct.error):
+            pass
+
     def _scan_recursive(self, path, results, depth, max_depth):
         """Scanner récursivement les répertoires"""
         if self.is_cancelled or depth > max_depth:
@@ -70,6 +114,10 @@ class DiskScannerThread(QThread):
         try:
             items = os.listdir(path)
             total_items = len(items)
+            # Fichiers directs du dossier, pour l'état initial du suivi en direct
+            seed_index = len(self.live_seed)
+            self.live_seed.append((path, depth, 0, 0))
+            own_files = own_size = 0
 
             for i, item in enumerate(items):
                 if self.is_cancelled:
@@ -78,7 +126,10 @@ class DiskScannerThread(QThread):
                 item_path = os.path.join(path, item)
                 try:
                     if os.path.isfile(item_path):
-                        self._process_file(item_path, results)
+                        before = results['total_size']
+                        if self._process_file(item_path, results):
+                            own_files += 1
+                            own_size += results['total_size'] - before
                     elif os.path.isdir(item_path):
                         dir_size = self._get_directory_size(item_path)
                         if dir_size > 1024 * 1024:  # > 1MB
@@ -95,33 +146,167 @@ class DiskScannerThread(QThread):
                     current_dir = os.path.basename(path) or path
                     self.progress_updated.emit(progress, f"Analyse de {current_dir} ({i+1}/{total_items})...")
 
+            self.live_seed[seed_index] = (path, depth, own_files, own_size)
         except (PermissionError, OSError):
             pass
 
+    def _scan_prioritized(self, results, max_depth):
+        """Scanner les plus gros sous-arbres en premier, avec budget de temps optionnel
+
+        L'ordre de visite est donné par le TraversalScheduler (index du scan
+        précédent, sinon part de l'estimation du parent): chaque dossier n'est
+        lu qu'une fois, au moment de l'explorer. Si un budget de temps est défini,
+        le scan s'arrête à l'échéance et les résultats sont marqués partiels.
+        La couverture indique la fraction de l'espace utilisé du disque
+        (DiskAnalyzer.get_disk_usage) déjà expliquée.
+
+        Les dossiers sont rangés dans une PathTable (parent + nom) et leurs
+        compteurs dans des tableaux indexés par identifiant; la file d'attente
+        ne contient que des identifiants: aucun chemin complet n'est gardé, il
+        est reconstruit au moment d'explorer le dossier.
+        """
+        deadline = time.monotonic() + self.time_budget if self.time_budget else None
+        used = DiskAnalyzer().get_disk_usage(self.disk_path).get('used', 0)
+        index = ScanIndex()
+        scheduler = TraversalScheduler(used, index)
+
+        with PathTable(self.disk_path) as table:
+            scheduler.push(self.disk_path, 0, used or None, ROOT_ID)
+
+            dir_sizes = array('q', [0])
+            file_counts = array('q', [0])  # Fichiers directs de chaque dossier
+            depths = array('i', [0])
+            pending = array('i', [-1])  # Sous-dossiers restant à explorer, -1 si non visité
+            complete = array('I')       # Dossiers dont tout le sous-arbre a été exploré
+
+            while len(scheduler):
+                if self.is_cancelled:
+                    return
+                if deadline is not None and time.monotonic() >= deadline:
+                    results['partial'] = True
+                    break
+
+                dir_id, depth, estimate = scheduler.pop()
+                path = table.dir_path(dir_id)
+                own_size = 0
+                own_files = 0
+                children = array('i')  # Sous-dossiers, mis en file après la lecture du dossier
+                truncated = False  # Sous-dossiers au-delà de max_depth ou dossier interrompu
+
+                try:
+                    with os.scandir(path) as entries:
+                        for entry in entries:
+                            # Échéance vérifiée à chaque entrée: un dossier très large
+                            # ne dépasse pas le budget
+                            if self.is_cancelled:
+                                return
+                            if deadline is not None and time.monotonic() >= deadline:
+                                results['partial'] = True
+                                truncated = True  # Dossier interrompu: jamais complet
+                                break
+                            try:
+                                if entry.is_file(follow_symlinks=False):
+                                    size = entry.stat(follow_symlinks=False).st_size
+                                    own_size += size
+                                    own_files += 1
+                                    self._add_file(entry.path, size, results)
+                                elif entry.is_dir(follow_symlinks=False):
+                                    if depth >= max_depth:
+                                        truncated = True
+                                        continue
+                                    children.append(table.add_directory(dir_id, entry.name))
+                                    dir_sizes.append(0)
+                                    file_counts.append(0)
+                                    depths.append(depth + 1)
+                                    pending.append(-1)
+                            except (PermissionError, OSError):
+                                continue
+                except (PermissionError, OSError):
+                    pass  # Dossier inaccessible: compté vide
+
+                # Sans lecture supplémentaire, chaque sous-dossier reçoit une part égale
+                # de ce que l'estimation du dossier n'explique pas encore
+                share = scheduler.share_of_parent(estimate, own_size, len(children))
+                for child_id in children:
+                    scheduler.push(os.path.join(path, table.dir_name(child_id)), depth + 1, share, child_id)
+                subdirs = len(children)
+
+                dir_sizes[dir_id] = own_size
+                file_counts[dir_id] = own_files
+                # Un sous-arbre tronqué par max_depth n'est jamais complet: sa taille
+                # ne doit pas entrer dans l'index
+                pending[dir_id] = subdirs + (1 if truncated else 0)
+                scheduler.record_directory(own_size)
+                if results['partial']:
+                    break
+
+                # Propager la complétude vers les parents
+                done = dir_id
+                while done >= 0 and pending[done] == 0:
+                    complete.append(done)
+                    done = table.dir_parent(done)
+                    if done >= 0:
+                        pending[done] -= 1
+
+                if deadline is not None:
+                    elapsed = self.time_budget - (deadline - time.monotonic())
+                    progress = min(85, int(max(scheduler.coverage, elapsed / self.time_budget) * 85))
+                else:
+                    progress = min(85, int(scheduler.coverage * 85))
+                current_dir = os.path.basename(path) or path
+                self.progress_updated.emit(progress, f"Analyse de {current_dir} ({scheduler.coverage_text()})...")
+
+            visited = [dir_id for dir_id in range(len(pending)) if pending[dir_id] >= 0]
+            self.live_seed = [(table.dir_path(dir_id), depths[dir_id], file_counts[dir_id], dir_sizes[dir_id])
+                              for dir_id in visited]
+
+            # Remonter les tailles vers les parents (un enfant a toujours un identifiant plus grand)
+            for dir_id in range(len(dir_sizes) - 1, ROOT_ID, -1):
+                dir_sizes[table.dir_parent(dir_id)] += dir_sizes[dir_id]
+
+            for dir_id in visited:
+                if dir_id != ROOT_ID and dir_sizes[dir_id] > 1024 * 1024:  # > 1MB
+                    results['directories'].append((table.dir_path(dir_id), dir_sizes[dir_id]))
+            # Tailles cumulées pour l'instantané, lues avant la fermeture de la table
+            self._dir_sizes = [(seed[0], dir_sizes[dir_id]) for seed, dir_id in zip(self.live_seed, visited)]
+
+            # Seuls les sous-arbres entièrement explorés ont une taille fiable pour l'index
+            completed = ((table.dir_path(dir_id), dir_sizes[dir_id]) for dir_id in complete)
+            index.update({path: size for path, size in completed
+                          if size >= index.min_size or index.get(path) is not None})
+            index.save()
+
+        if used > 0:
+            results['coverage'] = scheduler.coverage
+
     def _process_file(self, file_path, results):
-        """Traiter un fichier individuel"""
+        """Traiter un fichier individuel, retourne True s'il a été comptabilisé"""
         try:
             size = os.path.getsize(file_path)
-            results['total_files'] += 1
-            results['total_size'] += size
+            self._add_file(file_path, size, results)
+            return True
+        except (PermissionError, OSError):
+            return False
 
-            # Extension du fichier
-            ext = os.path.splitext(file_path)[1].lower()
-            if not ext:
-                ext = "sans_extension"
+    def _add_file(self, file_path, size, results):
+        """Comptabiliser un fichier dont la taille est connue"""
+        results['total_files'] += 1
+        results['total_size'] += size
 
-            if ext not in results['file_types']:
-                results['file_types'][ext] = {'count': 0, 'size': 0}
+        # Extension du fichier
+        ext = os.path.splitext(file_path)[1].lower()
+        if not ext:
+            ext = "sans_extension"
 
-            results['file_types'][ext]['count'] += 1
-            results['file_types'][ext]['size'] += size
+        if ext not in results['file_types']:
+            results['file_types'][ext] = {'count': 0, 'size': 0}
 
-            # Ajouter aux gros fichiers
-            if size > 10 * 1024 * 1024:  # > 10MB
-                results['large_files'].append((file_path, size))
+        results['file_types'][ext]['count'] += 1
+        results['file_types'][ext]['size'] += size
 
-        except (PermissionError, OSError):
-            pass
+        # Ajouter aux gros fichiers
+        if size > 10 * 1024 * 1024:  # > 10MB
+            results['large_files'].append((file_path, size))
 
     def _get_directory_size(self, path):
         """Obtenir la taille d'un répertoire"""
@@ -140,4 +325,117 @@ class DiskScannerThread(QThread):
 
     def cancel(self):
         """Annuler le scan"""
-        self.is_cancelled = True
\ No newline at end of file
+        self.is_cancelled = True
+
+
+class DiskExportThread(QThread):
+    """Thread pour exporter l'inventaire complet (tous les fichiers) d'une analyse
+
+    Le dossier analysé est reparcouru avec la même profondeur que le scan et
+    chaque fichier est écrit dès qu'il est lu: mémoire constante, interface
+    jamais bloquée.
+    """
+    progress_updated = Signal(int, str)  # fichiers exportés, message
+    export_completed = Signal(str, int)  # chemin du fichier, fichiers exportés
+    error_occurred = Signal(str)
+
+    def __init__(self, root, file_path, fmt, max_depth=None):
+        super().__init__()
+        self.root = root
+        self.file_path = file_path
+        self.fmt = fmt
+        self.max_depth = max_depth
+        self.is_cancelled = False
+
+    def run(self):
+        def on_progress(count):
+            self.progress_updated.emit(count, f"Export en cours... {count:,} fichiers")
+
+        try:
+            count = export_records(self._records(), self.file_path, self.fmt, on_progress)
+            self.export_completed.emit(self.file_path, count)
+        except ExportCancelled:
+            pass
+        except ImportError as e:
+            self.error_occurred.emit(f"Module manquant pour ce format: {e.name}")
+        except Exception as e:
+            if not self.is_cancelled:
+                self.error_occurred.emit(str(e))
+
+    def _records(self):
+        """Fichiers à exporter; lève ExportCancelled dès que l'export est annulé
+
+        export_records supprime alors le fichier partiel sans toucher au
+        fichier de destination.
+        """
+        for record in iter_file_records(self.root, self.max_depth, lambda: self.is_cancelled):
+            if self.is_cancelled:
+                raise ExportCancelled()
+            yield record
+        if self.is_cancelled:
+            raise ExportCancelled()
+
+    def cancel(self):
+        """Annuler l'export (le fichier partiel est supprimé)"""
+        self.is_cancelled = True
+
+
+class DiskWatchThread(QThread):
+    """Thread de suivi en direct des modifications sous un dossier analysé
+
+    Après un état initial (même profondeur que le scan), les créations,
+    croissances et suppressions de fichiers mettent à jour les totaux, les
+    gros fichiers et les extensions sans nouveau scan. Les rafales
+    d'événements sont regroupées: une seule mise à jour par fenêtre.
+    """
+    results_updated = Signal(dict)
+    status_changed = Signal(str)
+    error_occurred = Signal(str)
+
+    def __init__(self, root, max_depth=None, coalesce=0.5, results=None, seed=None,
+                 large_files=None, state=None):
+        """results / seed / large_files: scan terminé (DiskScannerThread.live_seed,
+        live_large_files) dont part l'état initial; state: état d'un suivi
+        précédent à reprendre. Sans eux, le dossier est relu entièrement."""
+        super().__init__()
+        self.root = root
+        self.max_depth = max_depth
+        self.coalesce = coalesce
+        self.results = results
+        self.seed = seed
+        self.large_files = large_files
+        self.state = state
+        self.is_cancelled = False
+
+    def run(self):
+        try:
+            self.status_changed.emit("Préparation du suivi en direct...")
+            state = self.state
+            if state is None and self.seed:
+                state = LiveScanState.from_scan(self.root, self.max_depth, self.results or {},
+                                                self.seed, self.large_files)
+            elif state is None:
+                state = LiveScanState(self.root, self.max_depth)
+                state.add_tree(state.root, 0, lambda: self.is_cancelled)
+                if self.is_cancelled:
+                    return
+            self.state = state
+
+            watcher = FsWatcher(state, create_backend(), self.coalesce)
+            watcher.start()
+            status = f"Suivi en direct ({watcher.backend.name}, {len(state.depths):,} dossiers)"
+            if watcher.polled_directories:
+                status += (f" - limite de surveillance atteinte, "
+                           f"{watcher.polled_directories:,} dossiers en scrutation")
+            self.status_changed.emit(status)
+            self.results_updated.emit(state.to_results())
+
+            watcher.run(lambda: self.is_cancelled,
+                        lambda current: self.results_updated.emit(current.to_results()))
+        except Exception as e:
+            if not self.is_cancelled:
+                self.error_occurred.emit(str(e))
+
+    def cancel(self):
+        """Arrêter le suivi"""
+        self.is_cancelled = True
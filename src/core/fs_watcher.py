@@ -0,0 +1,640 @@
+"""
+FsWatcher - Suivi en direct des modifications après une analyse disque
+
+LiveScanState tient à jour, par petites variations, les mêmes agrégats que
+DiskScannerThread: totaux, histogramme des extensions, gros fichiers et
+taille cumulée des dossiers. Il part des résultats du scan qui vient de se
+terminer (nombre et taille des fichiers de chaque dossier parcouru): rien
+n'est relu au démarrage du suivi. Un dossier n'est lu, et la taille de
+chacun de ses fichiers mémorisée, qu'au premier événement qui le concerne.
+
+Deux sources d'événements:
+- InotifyBackend : inotify (Linux) via une petite liaison ctypes
+- PollingBackend : repli portable, relit les dossiers dont la date de
+  modification a changé et, moins souvent, tous les dossiers (croissance
+  des fichiers existants)
+
+FsWatcher regroupe les rafales d'événements: les chemins modifiés sont
+dédoublonnés pendant une courte fenêtre, puis chacun est relu une seule fois.
+"""
+
+import os
+import sys
+import stat
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+LARGE_FILE_SIZE = 10 * 1024 * 1024  # Même seuil que DiskScannerThread
+LARGE_DIRECTORY_SIZE = 1024 * 1024
+TOP_LARGE_FILES = 20
+NO_EXTENSION = "sans_extension"
+
+
+def _extension(name: str) -> str:
+    return os.path.splitext(name)[1].lower() or NO_EXTENSION
+
+
+class LiveScanState:
+    """Agrégats du dossier analysé, mis à jour par variations
+
+    Le périmètre suivi est celui du scan: les fichiers jusqu'à max_depth
+    niveaux sous la racine. Un dossier est soit « résumé » (nombre et taille
+    de ses fichiers au moment du scan), soit « lu » (taille de chaque
+    fichier). Au premier événement, un dossier résumé est lu: les fichiers
+    non signalés sont supposés inchangés depuis le scan, l'écart est porté
+    par les fichiers signalés. Quand cet écart ne peut pas être réparti
+    exactement entre extensions (plusieurs extensions signalées à la fois,
+    dossier résumé supprimé), il l'est au prorata: les totaux et les tailles
+    de dossiers restent exacts, l'histogramme des extensions est approché.
+    """
+
+    def __init__(self, root: str, max_depth: Optional[int] = None):
+        self.root = os.path.abspath(root)
+        self.max_depth = max_depth
+        self.files: Dict[str, Dict[str, int]] = {}   # dossier lu -> {nom: taille}
+        self.summaries: Dict[str, Tuple[int, int]] = {}  # dossier résumé -> (fichiers, octets)
+        self.subdirs: Dict[str, Set[str]] = {}       # dossier -> noms des sous-dossiers suivis
+        self.depths: Dict[str, int] = {}             # tous les dossiers suivis
+        self.dir_sizes: Dict[str, int] = {}          # taille cumulée par dossier
+        self.large_files: Dict[str, int] = {}
+        self.file_types: Dict[str, Dict[str, int]] = {}
+        self.total_files = 0
+        self.total_size = 0
+        self.updates = 0
+
+    @classmethod
+    def from_scan(cls, root: str, max_depth: Optional[int], results: Dict,
+                  directories: Iterable[Tuple[str, int, int, int]],
+                  large_files: Optional[Iterable[Tuple[str, int]]] = None) -> 'LiveScanState':
+        """État initial d'après un scan terminé, sans relecture du disque
+
+        directories: (chemin, profondeur, nombre de fichiers, taille des
+        fichiers) de chaque dossier parcouru, fichiers directs seulement.
+        large_files: tous les gros fichiers du scan (défaut: ceux des résultats,
+        limités au top).
+        """
+        state = cls(root, max_depth)
+        state.total_files = results.get('total_files', 0)
+        state.total_size = results.get('total_size', 0)
+        state.file_types = {ext: dict(data) for ext, data in results.get('file_types', {}).items()}
+        if large_files is None:
+            large_files = results.get('large_files', [])
+        state.large_files = {os.path.abspath(path): size for path, size in large_files}
+
+        for path, depth, count, size in directories:
+            path = os.path.abspath(path)
+            state.depths[path] = depth
+            state.summaries[path] = (count, size)
+            state.subdirs.setdefault(path, set())
+            state.dir_sizes[path] = state.dir_sizes.get(path, 0)
+
+        for path, (count, size) in state.summaries.items():
+            parent = state._parent(path)
+            if parent is not None and parent in state.depths:
+                state.subdirs[parent].add(os.path.basename(path))
+            current = path
+            while current is not None and current in state.dir_sizes:
+                state.dir_sizes[current] += size
+                current = state._parent(current)
+        if state.root not in state.depths:
+            state.depths[state.root] = 0
+            state.summaries[state.root] = (0, 0)
+            state.subdirs.setdefault(state.root, set())
+            state.dir_sizes.setdefault(state.root, 0)
+        return state
+
+    # Agrégats
+
+    def _apply(self, directory: str, name: str, old: Optional[int], new: Optional[int]):
+        """Appliquer la variation d'un fichier (None: absent avant / après)"""
+        ext = _extension(name)
+        path = os.path.join(directory, name)
+
+        if old is not None:
+            self.total_files -= 1
+            self.total_size -= old
+            data = self.file_types.get(ext)
+            if data is not None:
+                data['count'] -= 1
+                data['size'] -= old
+                if data['count'] <= 0:
+                    del self.file_types[ext]
+            self.large_files.pop(path, None)
+
+        if new is not None:
+            self.total_files += 1
+            self.total_size += new
+            data = self.file_types.setdefault(ext, {'count': 0, 'size': 0})
+            data['count'] += 1
+            data['size'] += new
+            if new > LARGE_FILE_SIZE:
+                self.large_files[path] = new
+
+        self._add_to_sizes(directory, (new or 0) - (old or 0))
+        self.updates += 1
+
+    def _add_to_sizes(self, directory: str, delta: int):
+        """Reporter une variation sur le dossier et tous ses parents"""
+        if delta:
+            current = directory
+            while current is not None:
+                self.dir_sizes[current] += delta
+                current = self._parent(current)
+
+    def _remove_summary(self, directory: str, count: int, size: int, names: Optional[List[str]]):
+        """Retirer des agrégats des fichiers connus seulement par leur nombre et leur taille
+
+        names: fichiers qui portent ce retrait (leur extension reçoit la part
+        correspondante); None: répartition au prorata de l'histogramme global.
+        """
+        self.total_files -= count
+        self.total_size -= size
+        self._add_to_sizes(directory, -size)
+        self.updates += 1
+
+        if names:
+            weights: Dict[str, float] = {}
+            for name in names:
+                ext = _extension(name)
+                weights[ext] = weights.get(ext, 0) + 1
+                self.large_files.pop(os.path.join(directory, name), None)
+        else:
+            weights = {ext: data['size'] or data['count'] for ext, data in self.file_types.items()}
+            prefix = directory.rstrip(os.sep) + os.sep
+            for path in [path for path in self.large_files if path.startswith(prefix)]:
+                del self.large_files[path]
+
+        total_weight = sum(weights.values())
+        if count <= 0 and size <= 0 or not total_weight:
+            return
+        remaining_count, remaining_size = count, size
+        ordered = sorted(weights.items(), key=lambda item: item[1], reverse=True)
+        for i, (ext, weight) in enumerate(ordered):
+            last = i == len(ordered) - 1
+            part_count = remaining_count if last else round(count * weight / total_weight)
+            part_size = remaining_size if last else int(size * weight / total_weight)
+            remaining_count -= part_count
+            remaining_size -= part_size
+            data = self.file_types.get(ext)
+            if data is None:
+                continue
+            data['count'] -= part_count
+            data['size'] -= part_size
+            if data['count'] <= 0:
+                del self.file_types[ext]
+
+    def _parent(self, directory: str) -> Optional[str]:
+        if directory == self.root:
+            return None
+        return os.path.dirname(directory)
+
+    # Construction et relecture
+
+    def _scan_directory(self, directory: str):
+        """Lire un dossier: ({nom: taille} des fichiers, noms des sous-dossiers)"""
+        files = {}
+        subdirs = set()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file(follow_symlinks=False):
+                        files[entry.name] = entry.stat(follow_symlinks=False).st_size
+                    elif entry.is_dir(follow_symlinks=False):
+                        subdirs.add(entry.name)
+                except OSError:
+                    continue
+        return files, subdirs
+
+    def _load(self, directory: str, changed: Optional[Set[str]], files: Dict[str, int]):
+        """Passer un dossier résumé à l'état lu d'après son contenu actuel 'files'
+
+        changed: noms signalés modifiés (None: tous); les autres fichiers sont
+        supposés inchangés depuis le scan.
+        """
+        count, size = self.summaries.pop(directory)
+        if changed is None:
+            changed = set(files)
+        unchanged = [name for name in files if name not in changed]
+        old_count = count - len(unchanged)
+        old_size = size - sum(files[name] for name in unchanged)
+
+        self._remove_summary(directory, old_count, old_size, sorted(changed))
+        known = {name: files[name] for name in unchanged}
+        self.files[directory] = known
+        for name in changed:
+            if name in files:
+                known[name] = files[name]
+                self._apply(directory, name, None, files[name])
+
+    def add_tree(self, directory: str, depth: int,
+                 is_cancelled: Optional[Callable[[], bool]] = None) -> List[str]:
+        """Ajouter un sous-arbre au suivi (lu entièrement), retourne les dossiers ajoutés"""
+        added = []
+        stack = [(directory, depth)]
+        while stack:
+            if is_cancelled is not None and is_cancelled():
+                break
+            path, level = stack.pop()
+            try:
+                files, subdirs = self._scan_directory(path)
+            except OSError:
+                continue
+
+            self.depths[path] = level
+            self.dir_sizes[path] = 0
+            self.files[path] = {}
+            self.subdirs[path] = set()
+            parent = self._parent(path)
+            if parent is not None and parent in self.subdirs:
+                self.subdirs[parent].add(os.path.basename(path))
+            added.append(path)
+
+            for name, size in files.items():
+                self.files[path][name] = size
+                self._apply(path, name, None, size)
+            if self.max_depth is None or level < self.max_depth:
+                stack.extend((os.path.join(path, name), level + 1) for name in subdirs)
+        return added
+
+    def remove_tree(self, directory: str) -> List[str]:
+        """Retirer un sous-arbre du suivi (dossier supprimé), retourne les dossiers retirés"""
+        removed = []
+        stack = [directory]
+        while stack:
+            path = stack.pop()
+            if path not in self.depths:
+                continue
+            stack.extend(os.path.join(path, name) for name in self.subdirs.get(path, ()))
+            if path in self.summaries:
+                count, size = self.summaries[path]
+                self._remove_summary(path, count, size, None)
+            else:
+                for name, size in list(self.files[path].items()):
+                    self._apply(path, name, size, None)
+            removed.append(path)
+
+        # Retirer les dossiers après coup: les variations remontent les parents
+        for path in removed:
+            for table in (self.files, self.summaries, self.subdirs, self.depths, self.dir_sizes):
+                table.pop(path, None)
+        parent = self._parent(directory)
+        if parent in self.subdirs:
+            self.subdirs[parent].discard(os.path.basename(directory))
+        return removed
+
+    def refresh_entry(self, path: str):
+        """Relire une entrée signalée modifiée: (dossiers ajoutés, dossiers retirés)"""
+        directory, name = os.path.split(path)
+        if directory not in self.depths:
+            return [], []
+
+        if directory in self.summaries:
+            try:
+                files, _ = self._scan_directory(directory)
+            except OSError:
+                return [], self.remove_tree(directory) if directory != self.root else []
+            self._load(directory, {name}, files)
+
+        known = self.files[directory].get(name)
+        try:
+            st = os.lstat(path)
+        except OSError:
+            st = None
+
+        if st is not None and stat.S_ISREG(st.st_mode):
+            if known != st.st_size:
+                self.files[directory][name] = st.st_size
+                self._apply(directory, name, known, st.st_size)
+            return [], []
+
+        # Plus un fichier ordinaire (supprimé, remplacé par un dossier...)
+        if known is not None:
+            del self.files[directory][name]
+            self._apply(directory, name, known, None)
+
+        removed = []
+        if path in self.depths and (st is None or not stat.S_ISDIR(st.st_mode)):
+            removed = self.remove_tree(path)
+
+        added = []
+        if st is not None and stat.S_ISDIR(st.st_mode) and path not in self.depths:
+            depth = self.depths[directory] + 1
+            if self.max_depth is None or depth <= self.max_depth:
+                added = self.add_tree(path, depth)
+        return added, removed
+
+    def refresh_directory(self, directory: str):
+        """Relire tout un dossier suivi: (dossiers ajoutés, dossiers retirés)"""
+        if directory not in self.depths:
+            return [], []
+        try:
+            files, subdirs = self._scan_directory(directory)
+        except OSError:
+            return [], self.remove_tree(directory) if directory != self.root else []
+
+        if directory in self.summaries:
+            self._load(directory, None, files)
+        else:
+            known = self.files[directory]
+            for name in set(known) | set(files):
+                old, new = known.get(name), files.get(name)
+                if old != new:
+                    if new is None:
+                        del known[name]
+                    else:
+                        known[name] = new
+                    self._apply(directory, name, old, new)
+
+        added, removed = [], []
+        tracked = self.subdirs[directory]
+        for name in tracked - subdirs:
+            removed.extend(self.remove_tree(os.path.join(directory, name)))
+        depth = self.depths[directory] + 1
+        if self.max_depth is None or depth <= self.max_depth:
+            for name in subdirs - tracked:
+                added.extend(self.add_tree(os.path.join(directory, name), depth))
+        return added, removed
+
+    def to_results(self) -> Dict:
+        """Résultats au format de DiskScannerThread"""
+        large_files = sorted(self.large_files.items(), key=lambda item: item[1], reverse=True)
+        return {
+            'total_files': self.total_files,
+            'total_size': self.total_size,
+            'file_types': {ext: dict(data) for ext, data in self.file_types.items()},
+            'large_files': large_files[:TOP_LARGE_FILES],
+            'directories': [(path, size) for path, size in self.dir_sizes.items()
+                            if path != self.root and size > LARGE_DIRECTORY_SIZE],
+            'scan_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'partial': False,
+            'coverage': None,
+            'root': self.root,
+            'max_depth': self.max_depth,
+            'snapshot': None,
+            'changes': None,
+            'live': True,
+        }
+
+
+class InotifyBackend:
+    """Événements inotify (Linux) via ctypes, une surveillance par dossier"""
+
+    name = "inotify"
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+                  | IN_CREATE | IN_DELETE | IN_ONLYDIR)
+    EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+    def __init__(self):
+        self._libc = self._load_libc()
+        if self._libc is None:
+            raise OSError(errno.ENOSYS, "inotify indisponible")
+        self.fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 a échoué")
+        self._paths: Dict[int, str] = {}
+        self._watches: Dict[str, int] = {}
+        self.limit_reached = False
+
+    @staticmethod
+    def _load_libc():
+        if not sys.platform.startswith('linux'):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            libc.inotify_init1.argtypes = [ctypes.c_int]
+            libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+            libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        except (OSError, AttributeError):
+            return None
+        return libc
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return cls._load_libc() is not None
+
+    def add_directory(self, path: str) -> bool:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), self.WATCH_MASK)
+        if wd < 0:
+            if ctypes.get_errno() == errno.ENOSPC:
+                self.limit_reached = True  # fs.inotify.max_user_watches atteint
+            return False
+        self._paths[wd] = path
+        self._watches[path] = wd
+        return True
+
+    def remove_directory(self, path: str):
+        wd = self._watches.pop(path, None)
+        if wd is not None:
+            self._paths.pop(wd, None)
+            self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read(self, timeout: float):
+        """Attendre des événements: liste de ('entry', chemin) ou ('resync', None)"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            offset = 0
+            while offset + self.EVENT_HEADER.size <= len(data):
+                wd, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+                offset += self.EVENT_HEADER.size
+                raw_name = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+                if mask & self.IN_Q_OVERFLOW:
+                    events.append(('resync', None))
+                elif mask & self.IN_IGNORED:
+                    path = self._paths.pop(wd, None)
+                    if path is not None:
+                        self._watches.pop(path, None)
+                elif wd in self._paths and raw_name:
+                    events.append(('entry', os.path.join(self._paths[wd], os.fsdecode(raw_name))))
+        return events
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingBackend:
+    """Repli portable: dates de modification des dossiers, relecture complète périodique"""
+
+    name = "scrutation"
+
+    def __init__(self, interval: float = 5.0, full_every: int = 6):
+        self.interval = interval
+        self.full_every = full_every
+        self._mtimes: Dict[str, int] = {}
+        self._polls = 0
+        self._next_poll = time.monotonic() + interval
+        self.limit_reached = False
+
+    def add_directory(self, path: str) -> bool:
+        try:
+            self._mtimes[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            return False
+        return True
+
+    def remove_directory(self, path: str):
+        self._mtimes.pop(path, None)
+
+    def __len__(self) -> int:
+        """Nombre de dossiers scrutés"""
+        return len(self._mtimes)
+
+    def read(self, timeout: float):
+        """Liste de ('directory', chemin) à relire à chaque échéance de scrutation"""
+        wait = self._next_poll - time.monotonic()
+        if wait > 0:
+            time.sleep(min(wait, timeout))
+            if time.monotonic() < self._next_poll:
+                return []
+        self._next_poll = time.monotonic() + self.interval
+        self._polls += 1
+
+        # Les créations/suppressions changent la date du dossier; la croissance
+        # d'un fichier existant non: relecture de tous les dossiers de temps en temps
+        full = self._polls % self.full_every == 0
+        events = []
+        for path, mtime in list(self._mtimes.items()):
+            try:
+                current = os.stat(path).st_mtime_ns
+            except OSError:
+                current = None
+            if full or current != mtime:
+                events.append(('directory', path))
+                if current is not None:
+                    self._mtimes[path] = current
+        return events
+
+    def close(self):
+        self._mtimes.clear()
+
+
+def create_backend(prefer_inotify: bool = True):
+    """inotify si disponible, sinon scrutation"""
+    if prefer_inotify and InotifyBackend.is_available():
+        try:
+            return InotifyBackend()
+        except OSError:
+            pass
+    return PollingBackend()
+
+
+class FsWatcher:
+    """Boucle de suivi: regroupe les événements puis met à jour l'état
+
+    Quand la limite de surveillances du backend est atteinte (inotify:
+    fs.inotify.max_user_watches), les dossiers restants sont confiés à un
+    PollingBackend de repli, lu à chaque tour de boucle avec le backend.
+    """
+
+    def __init__(self, state: LiveScanState, backend, coalesce: float = 0.5):
+        self.state = state
+        self.backend = backend
+        self.coalesce = coalesce
+        self.fallback: Optional[PollingBackend] = None
+        self.events = 0
+        self.flushes = 0
+
+    def _watch(self, directories):
+        for path in directories:
+            if not self.backend.limit_reached and self.backend.add_directory(path):
+                continue
+            if self.backend.limit_reached:
+                if self.fallback is None:
+                    self.fallback = PollingBackend()
+                self.fallback.add_directory(path)
+
+    def _unwatch(self, directories):
+        for path in directories:
+            self.backend.remove_directory(path)
+            if self.fallback is not None:
+                self.fallback.remove_directory(path)
+
+    @property
+    def polled_directories(self) -> int:
+        """Dossiers suivis par scrutation faute de surveillance disponible"""
+        return len(self.fallback) if self.fallback is not None else 0
+
+    def start(self):
+        """Surveiller tous les dossiers de l'état"""
+        self._watch(list(self.state.depths))
+
+    def flush(self, entries: Set[str], directories: Set[str], resync: bool):
+        """Appliquer un lot d'événements regroupés"""
+        state = self.state
+        if resync:
+            directories = set(state.depths)
+        for path in sorted(directories):
+            added, removed = state.refresh_directory(path)
+            self._unwatch(removed)
+            self._watch(added)
+        for path in sorted(entries):
+            if os.path.dirname(path) in directories:
+                continue  # Déjà relu avec son dossier
+            added, removed = state.refresh_entry(path)
+            self._unwatch(removed)
+            self._watch(added)
+        self.flushes += 1
+
+    def run(self, is_cancelled: Callable[[], bool], on_update: Callable[[LiveScanState], None]):
+        """Suivre jusqu'à annulation; on_update est appelé après chaque lot"""
+        entries: Set[str] = set()
+        directories: Set[str] = set()
+        resync = False
+        window_end = None
+
+        while not is_cancelled():
+            timeout = 0.25 if window_end is None else max(0.0, window_end - time.monotonic())
+            events = self.backend.read(min(timeout, 0.25))
+            if self.fallback is not None:
+                events.extend(self.fallback.read(0))
+            for kind, path in events:
+                self.events += 1
+                if kind == 'entry':
+                    entries.add(path)
+                elif kind == 'directory':
+                    directories.add(path)
+                else:
+                    resync = True
+                if window_end is None:
+                    window_end = time.monotonic() + self.coalesce
+
+            if window_end is not None and time.monotonic() >= window_end:
+                before = self.state.updates
+                self.flush(entries, directories, resync)
+                entries, directories, resync, window_end = set(), set(), False, None
+                if self.state.updates != before:
+                    on_update(self.state)
+
+        self.backend.close()
+        if self.fallback is not None:
+            self.fallback.close()
@@ -0,0 +1,363 @@
+"""
+MetricsSampler - Bus de métriques CPU/RAM/disque échantillonnées en arrière-plan
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, Optional, Set
+
+from PySide6.QtCore import QObject, QThread, QEvent, Signal
+
+try:
+    import psutil
+except ImportError:  # psutil optionnel: les widgets affichent "Indisponible"
+    psutil = None
+
+
+class _DiskProbe:
+    """Mesure d'un disque dans son propre thread démon
+
+    Un appel bloqué sur un montage réseau ne peut pas être interrompu: le
+    thread est abandonné et, étant démon, n'empêche pas la fin du programme.
+    """
+
+    def __init__(self, path: str):
+        self.usage = None
+        self.error: Optional[Exception] = None
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(path,),
+                                        name=f"disk-probe {path}", daemon=True)
+        self._thread.start()
+
+    def _run(self, path: str):
+        try:
+            self.usage = psutil.disk_usage(path)
+        except Exception as e:
+            self.error = e
+        finally:
+            self._done.set()
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        return self._done.wait(timeout)
+
+
+class MetricsSampler(QThread):
+    """Thread unique qui échantillonne les métriques système pour tous les abonnés
+
+    Chaque abonné déclare les métriques voulues ('cpu', 'memory', 'disk:<chemin>')
+    et son intervalle. Une métrique est mesurée une seule fois par intervalle,
+    au rythme le plus rapide demandé par un abonné actif (visible). Sans abonné
+    actif, ou quand l'échantillonneur est en pause (fenêtre réduite), le
+    thread dort sans rien mesurer.
+
+    Les disques sont interrogés chacun dans un thread démon avec un délai
+    maximal: un point de montage réseau bloqué ne fige ni l'interface, ni les
+    mesures CPU/RAM, ni la fermeture de l'application. Les disques qui n'ont
+    plus d'abonné sont retirés des dernières valeurs.
+
+    Format émis (dernières valeurs connues de toutes les métriques):
+        {'timestamp': float, 'cpu_percent': float|None, 'memory_percent': float|None,
+         'disks': {chemin: {'total', 'used', 'free', 'percent'} ou {'error': str}},
+         'error': str|None}
+    """
+    metrics_updated = Signal(dict)
+
+    # Fenêtre (secondes) dans laquelle des échéances proches sont regroupées
+    COALESCE_DELAY = 0.05
+
+    def __init__(self, disk_timeout: float = 2.0):
+        super().__init__()
+        self.disk_timeout = disk_timeout
+        self.latest: Dict = {}
+        self._subscribers: Dict[object, Dict] = {}
+        self._next_due: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._paused = False
+        self._force = False
+        self._pending_disks: Dict[str, _DiskProbe] = {}
+
+    # --- Abonnements ---
+
+    def subscribe(self, key, metrics: Iterable[str], interval: float, active: bool = True):
+        """Déclarer (ou remplacer) un abonné et ses métriques"""
+        with self._lock:
+            self._subscribers[key] = {
+                'metrics': set(metrics),
+                'interval': max(0.1, float(interval)),
+                'active': active
+            }
+        self._drop_unsubscribed_disks()
+        self.request_update()
+
+    def unsubscribe(self, key):
+        """Retirer un abonné"""
+        with self._lock:
+            self._subscribers.pop(key, None)
+        self._drop_unsubscribed_disks()
+        self._wake.set()
+
+    def set_active(self, key, active: bool):
+        """Activer ou suspendre un abonné (page visible ou masquée)"""
+        with self._lock:
+            subscriber = self._subscribers.get(key)
+            if subscriber is None or subscriber['active'] == active:
+                return
+            subscriber['active'] = active
+        if active:
+            self.request_update()
+        else:
+            self._wake.set()
+
+    def set_interval(self, key, seconds: float):
+        """Modifier l'intervalle demandé par un abonné"""
+        with self._lock:
+            subscriber = self._subscribers.get(key)
+            if subscriber is None:
+                return
+            subscriber['interval'] = max(0.1, float(seconds))
+        self._wake.set()
+
+    def pause(self):
+        """Suspendre tout échantillonnage (fenêtre réduite)"""
+        self._paused = True
+        self._wake.set()
+
+    def resume(self):
+        """Reprendre l'échantillonnage avec une mesure immédiate"""
+        self._paused = False
+        self.request_update()
+
+    def request_update(self):
+        """Mesurer immédiatement toutes les métriques actives"""
+        self._force = True
+        self._wake.set()
+
+    def _subscribed_disks(self) -> Set[str]:
+        """Disques suivis par au moins un abonné, actif ou non"""
+        with self._lock:
+            return {metric[5:] for subscriber in self._subscribers.values()
+                    for metric in subscriber['metrics'] if metric.startswith('disk:')}
+
+    def _drop_unsubscribed_disks(self):
+        """Retirer des dernières valeurs les disques qui n'ont plus d'abonné"""
+        disks = self.latest.get('disks')
+        if not disks:
+            return
+        subscribed = self._subscribed_disks()
+        if subscribed.issuperset(disks):
+            return
+        latest = dict(self.latest)
+        latest['disks'] = {path: usage for path, usage in disks.items() if path in subscribed}
+        self.latest = latest
+
+    def _active_intervals(self) -> Dict[str, float]:
+        """Intervalle effectif de chaque métrique: le plus rapide des abonnés actifs"""
+        intervals = {}
+        with self._lock:
+            for subscriber in self._subscribers.values():
+                if not subscriber['active']:
+                    continue
+                for metric in subscriber['metrics']:
+                    current = intervals.get(metric)
+                    if current is None or subscriber['interval'] < current:
+                        intervals[metric] = subscriber['interval']
+        return intervals
+
+    # --- Boucle d'échantillonnage ---
+
+    def run(self):
+        """Boucle d'échantillonnage"""
+        if psutil is not None:
+            # Premier appel non bloquant: sert de référence pour les suivants
+            psutil.cpu_percent(interval=None)
+
+        while not self._stopping:
+            self._wake.clear()
+            timeout = None
+
+            if not self._paused:
+                intervals = self._active_intervals()
+                now = time.monotonic()
+                force, self._force = self._force, False
+
+                # Regrouper les métriques presque échues en une seule mesure
+                due = [metric for metric in intervals
+                       if force or self._next_due.get(metric, 0) <= now + self.COALESCE_DELAY]
+                if due:
+                    self.latest = self.sample(due)
+                    self.metrics_updated.emit(self.latest)
+                    now = time.monotonic()
+                    for metric in due:
+                        self._next_due[metric] = now + intervals[metric]
+
+                if intervals:
+                    timeout = max(0.0, min(self._next_due.get(metric, now) for metric in intervals) - now)
+
+            # Sans métrique active, dormir jusqu'au prochain abonnement ou reprise
+            self._wake.wait(timeout)
+
+    def sample(self, metrics: Iterable[str]) -> Dict:
+        """Mesurer les métriques demandées et les fusionner avec les dernières valeurs"""
+        metrics = set(metrics)
+        subscribed = self._subscribed_disks()
+        result = {
+            'timestamp': time.time(),
+            'cpu_percent': self.latest.get('cpu_percent'),
+            'memory_percent': self.latest.get('memory_percent'),
+            'disks': {path: usage for path, usage in self.latest.get('disks', {}).items()
+                      if path in subscribed},
+            'error': None
+        }
+
+        if psutil is None:
+            result['error'] = "psutil n'est pas installé"
+            return result
+
+        if 'cpu' in metrics:
+            try:
+                result['cpu_percent'] = psutil.cpu_percent(interval=None)
+            except Exception:
+                result['cpu_percent'] = None
+
+        if 'memory' in metrics:
+            try:
+                result['memory_percent'] = psutil.virtual_memory().percent
+            except Exception:
+                result['memory_percent'] = None
+
+        disk_paths = [metric[5:] for metric in metrics if metric.startswith('disk:')]
+        result['disks'].update(self._sample_disks(disk_paths))
+        return result
+
+    def _sample_disks(self, paths) -> Dict[str, Dict]:
+        """Mesurer des disques en parallèle, avec délai maximal"""
+        # Oublier les mesures terminées de disques qui ne sont plus demandés
+        for path in [path for path, probe in self._pending_disks.items()
+                     if probe.done() and path not in paths]:
+            del self._pending_disks[path]
+
+        probes = {}
+        for path in paths:
+            probe = self._pending_disks.get(path)
+            # Un appel encore bloqué n'est pas relancé
+            if probe is None or probe.done():
+                probe = _DiskProbe(path)
+                self._pending_disks[path] = probe
+            probes[path] = probe
+
+        deadline = time.monotonic() + self.disk_timeout
+        for probe in probes.values():
+            probe.wait(max(0.0, deadline - time.monotonic()))
+
+        disks = {}
+        for path, probe in probes.items():
+            if not probe.done():
+                disks[path] = {'error': "Délai dépassé"}
+                continue
+
+            self._pending_disks.pop(path, None)
+            if probe.error is not None:
+                disks[path] = {'error': str(probe.error)}
+            else:
+                usage = probe.usage
+                disks[path] = {
+                    'total': usage.total,
+                    'used': usage.used,
+                    'free': usage.free,
+                    'percent': usage.percent
+                }
+        return disks
+
+    def stop(self):
+        """Arrêter l'échantillonnage"""
+        self._stopping = True
+        self._wake.set()
+        self.wait(int((self.disk_timeout + 1) * 1000))
+        # Les mesures encore bloquées sont abandonnées (threads démons)
+        self._pending_disks.clear()
+
+
+class MetricsSubscription(QObject):
+    """Abonnement d'un widget au bus de métriques
+
+    L'abonnement suit la visibilité du widget (pages masquées du
+    QStackedWidget, fenêtre réduite): il n'est actif que si le widget est
+    visible, et ne transmet les mesures qu'à ce moment-là.
+    """
+
+    def __init__(self, widget, callback, metrics: Iterable[str], interval: float,
+                 sampler: Optional[MetricsSampler] = None):
+        super().__init__(widget)
+        self.widget = widget
+        self.callback = callback
+        self.metrics = set(metrics)
+        self.interval = interval
+        self.sampler = sampler or get_metrics_sampler()
+        self.enabled = True
+
+        self.sampler.subscribe(self, self.metrics, interval, active=widget.isVisible())
+        self.sampler.metrics_updated.connect(self._on_metrics_updated)
+        widget.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        """Suivre l'affichage et le masquage du widget"""
+        if watched is self.widget and event.type() in (QEvent.Show, QEvent.Hide):
+            self._update_active()
+        return False
+
+    def _update_active(self):
+        """Synchroniser l'état actif avec la visibilité du widget"""
+        self.sampler.set_active(self, self.enabled and self.widget.isVisible())
+
+    def _on_metrics_updated(self, metrics):
+        """Transmettre une mesure au widget s'il est actif"""
+        if self.enabled and self.widget.isVisible():
+            self.callback(metrics)
+
+    def set_metrics(self, metrics: Iterable[str]):
+        """Changer les métriques suivies (par exemple un autre disque)"""
+        self.metrics = set(metrics)
+        self.sampler.subscribe(self, self.metrics, self.interval,
+                               active=self.enabled and self.widget.isVisible())
+
+    def set_interval(self, seconds: float):
+        """Changer l'intervalle demandé"""
+        self.interval = seconds
+        self.sampler.set_interval(self, seconds)
+
+    def set_enabled(self, enabled: bool):
+        """Suspendre ou reprendre l'abonnement indépendamment de la visibilité"""
+        self.enabled = enabled
+        self._update_active()
+
+    def cancel(self):
+        """Résilier l'abonnement"""
+        self.enabled = False
+        self.widget.removeEventFilter(self)
+        self.sampler.metrics_updated.disconnect(self._on_metrics_updated)
+        self.sampler.unsubscribe(self)
+
+
+_sampler: Optional[MetricsSampler] = None
+
+
+def get_metrics_sampler() -> MetricsSampler:
+    """Obtenir le bus de métriques partagé (démarré au premier appel)"""
+    global _sampler
+    if _sampler is None:
+        _sampler = MetricsSampler()
+        _sampler.start()
+    return _sampler
+
+
+def stop_metrics_sampler():
+    """Arrêter le bus de métriques partagé s'il a été démarré"""
+    global _sampler
+    if _sampler is not None:
+        _sampler.stop()
+        _sampler = None
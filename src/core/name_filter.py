@@ -0,0 +1,193 @@
+"""
+NameFilter - Filtres d'inclusion/exclusion compilés pour les parcours de nettoyage
+
+Les motifs sont de style glob ('*.tmp', '*.dmp', 'cache2/**'):
+- un motif sans séparateur porte sur le nom seul, à n'importe quelle profondeur
+- un motif avec séparateur porte sur le chemin relatif à la racine du parcours,
+  '**' désignant un nombre quelconque de répertoires
+
+Le filtre s'applique aux noms (DirEntry.name) avant tout appel à stat(), et
+indique quels sous-répertoires ne peuvent contenir aucun fichier retenu pour
+qu'ils ne soient pas parcourus.
+"""
+
+import os
+import re
+import fnmatch
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+# Noms insensibles à la casse sous Windows, comme le système de fichiers
+_FLAGS = re.IGNORECASE if os.name == 'nt' else 0
+
+_ANY_DIRS = '**'
+
+Patterns = Union[str, Iterable[str], None]
+
+
+def _as_list(patterns: Patterns) -> List[str]:
+    if not patterns:
+        return []
+    if isinstance(patterns, str):
+        return [patterns]
+    return [pattern for pattern in patterns if pattern]
+
+
+def _compile_names(patterns: Sequence[str]):
+    """Un seul motif regex pour tous les motifs de noms, None s'il n'y en a aucun"""
+    if not patterns:
+        return None
+    return re.compile('|'.join(fnmatch.translate(pattern) for pattern in patterns), _FLAGS)
+
+
+def _compile_path(pattern: str) -> Tuple:
+    """Motif de chemin -> segments (regex compilée, ou '**')"""
+    segments = []
+    for part in pattern.replace('\\', '/').split('/'):
+        if not part or part == '.':
+            continue
+        if part == _ANY_DIRS:
+            if not segments or segments[-1] is not _ANY_DIRS:
+                segments.append(_ANY_DIRS)
+        else:
+            segments.append(re.compile(fnmatch.translate(part), _FLAGS))
+    return tuple(segments)
+
+
+def _full_match(segments: Tuple, parts: Tuple[str, ...]) -> bool:
+    """Le chemin relatif (parts) correspond-il entièrement au motif ?"""
+    if not segments:
+        return not parts
+    head = segments[0]
+    if head is _ANY_DIRS:
+        rest = segments[1:]
+        if not rest:
+            return bool(parts)
+        return any(_full_match(rest, parts[i:]) for i in range(len(parts) + 1))
+    return bool(parts) and head.match(parts[0]) is not None and _full_match(segments[1:], parts[1:])
+
+
+def _prefix_match(segments: Tuple, parts: Tuple[str, ...]) -> bool:
+    """Un fichier situé sous le répertoire (parts) peut-il correspondre au motif ?"""
+    if not parts:
+        return bool(segments)
+    if not segments:
+        return False
+    head = segments[0]
+    if head is _ANY_DIRS:
+        return True
+    return head.match(parts[0]) is not None and _prefix_match(segments[1:], parts[1:])
+
+
+class NameFilter:
+    """Filtre de fichiers compilé une fois (inclusions puis exclusions)"""
+
+    def __init__(self, include: Patterns = "*", exclude: Patterns = None):
+        include = _as_list(include) or ["*"]
+        exclude = _as_list(exclude)
+
+        def is_path(pattern):
+            return '/' in pattern or '\\' in pattern
+
+        self.matches_everything = include == ["*"] and not exclude
+
+        self._include_names = _compile_names([p for p in include if not is_path(p)])
+        self._include_paths = [_compile_path(p) for p in include if is_path(p)]
+        self._exclude_names = _compile_names([p for p in exclude if not is_path(p)])
+        self._exclude_paths = [_compile_path(p) for p in exclude if is_path(p)]
+
+    @classmethod
+    def from_pattern(cls, pattern: Patterns, exclude: Patterns = None) -> 'NameFilter':
+        """Filtre à partir d'un motif (ou d'une liste de motifs)"""
+        if isinstance(pattern, cls):
+            return pattern
+        return cls(pattern, exclude)
+
+    def _excluded(self, name: str, parts: Tuple[str, ...], is_dir: bool = False) -> bool:
+        if self._exclude_names is not None and self._exclude_names.match(name):
+            return True
+        for segments in self._exclude_paths:
+            if _full_match(segments, parts):
+                return True
+            # 'cache2/**' exclut tout le contenu de cache2: le répertoire lui-même
+            # n'est pas ouvert
+            if is_dir and len(segments) > 1 and segments[-1] is _ANY_DIRS and _full_match(segments[:-1], parts):
+                return True
+        return False
+
+    def match_file(self, name: str, rel_dir: Tuple[str, ...] = ()) -> bool:
+        """Le fichier 'name' du répertoire relatif rel_dir est-il retenu ?"""
+        if self.matches_everything:
+            return True
+        parts = rel_dir + (name,)
+        if self._excluded(name, parts):
+            return False
+        if self._include_names is not None and self._include_names.match(name):
+            return True
+        return any(_full_match(segments, parts) for segments in self._include_paths)
+
+    def can_descend(self, name: str, rel_dir: Tuple[str, ...] = ()) -> bool:
+        """Le sous-répertoire 'name' peut-il contenir un fichier retenu ?
+
+        Un répertoire exclu est écarté avec tout son contenu.
+        """
+        if self.matches_everything:
+            return True
+        parts = rel_dir + (name,)
+        if self._excluded(name, parts, is_dir=True):
+            return False
+        if self._include_names is not None:
+            return True
+        return any(_prefix_match(segments, parts) for segments in self._include_paths)
+
+
+def walk_filtered(top: str, name_filter: Optional[NameFilter] = None):
+    """Parcours ascendant (comme os.walk(topdown=False)) filtré par nom
+
+    Produit (chemin, noms des sous-répertoires parcourus, DirEntry des fichiers
+    retenus, nombre des autres entrées). Les fichiers sont filtrés sur leur nom
+    avant tout stat() et les sous-répertoires qui ne peuvent rien contenir de
+    retenu ne sont pas ouverts. Un répertoire illisible compte une autre entrée,
+    son contenu étant inconnu. Les liens symboliques ne sont jamais suivis ni
+    retenus: ils comptent parmi les autres entrées (pas de suppression).
+    """
+    name_filter = name_filter or NameFilter()
+    # Pile de cadres: [chemin, chemin relatif, itérateur des sous-répertoires, noms, fichiers, autres]
+    stack = [[top, (), None, None, None, 0]]
+    while stack:
+        frame = stack[-1]
+        if frame[2] is None:
+            path, rel_dir = frame[0], frame[1]
+            subdirs, files, others = [], [], 0
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_symlink():
+                                others += 1
+                                continue
+                            is_dir = entry.is_dir(follow_symlinks=False)
+                        except OSError:
+                            is_dir = False
+                        if is_dir:
+                            if name_filter.can_descend(entry.name, rel_dir):
+                                subdirs.append(entry.name)
+                            else:
+                                others += 1
+                        elif name_filter.match_file(entry.name, rel_dir):
+                            files.append(entry)
+                        else:
+                            others += 1
+            except OSError:
+                others += 1
+            frame[2] = iter(subdirs)
+            frame[3] = subdirs
+            frame[4] = files
+            frame[5] = others
+
+        name = next(frame[2], None)
+        if name is not None:
+            stack.append([os.path.join(frame[0], name), frame[1] + (name,), None, None, None, 0])
+            continue
+
+        stack.pop()
+        yield frame[0], frame[3], frame[4], frame[5]
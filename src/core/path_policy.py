@@ -0,0 +1,125 @@
+"""
+PathPolicy - Politique de sécurité des chemins pour le nettoyage, compilée une fois
+
+Les règles (autoriser / interdire un préfixe de chemin) sont rangées dans un
+arbre de préfixes par composant de chemin. Les chemins sont normalisés
+(séparateurs, casse, lettre de lecteur retirée) et le verdict de chaque
+répertoire est mémorisé: les fichiers d'un même répertoire héritent de son
+verdict sans aucun travail sur leur nom.
+"""
+
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+ALLOW = True
+DENY = False
+
+
+def split_path(path: str) -> List[str]:
+    """Composants d'un chemin normalisé: séparateurs unifiés, casse ignorée, sans lecteur
+
+    'C:\\Users\\Bob\\AppData' -> ['users', 'bob', 'appdata']
+    """
+    path = path.replace('\\', '/')
+    if len(path) >= 2 and path[1] == ':':
+        path = path[2:]
+    return [part for part in path.casefold().split('/') if part and part != '.']
+
+
+class PathPolicy:
+    """Arbre de préfixes: le verdict du plus long préfixe correspondant l'emporte"""
+
+    def __init__(self, rules: Iterable[Tuple[str, bool]] = (), default: bool = ALLOW):
+        self.default = default
+        self._root: Dict = {}
+        self._dir_cache: Dict[str, bool] = {}
+        for prefix, verdict in rules:
+            self.add_rule(prefix, verdict)
+
+    def add_rule(self, prefix: str, verdict: bool):
+        """Ajouter une règle (préfixe de chemin depuis la racine du lecteur)"""
+        node = self._root
+        for part in split_path(prefix):
+            node = node.setdefault(part, {})
+        node[None] = verdict
+        self._dir_cache.clear()
+
+    def _match(self, parts: List[str]) -> bool:
+        verdict = self.default
+        node = self._root
+        for part in parts:
+            node = node.get(part)
+            if node is None:
+                break
+            if None in node:
+                verdict = node[None]
+        return verdict
+
+    def is_directory_allowed(self, directory: str) -> bool:
+        """Verdict d'un répertoire (mémorisé)"""
+        verdict = self._dir_cache.get(directory)
+        if verdict is None:
+            verdict = self._dir_cache[directory] = self._match(split_path(directory))
+        return verdict
+
+    def is_allowed(self, file_path: str) -> bool:
+        """Verdict d'un fichier: celui de son répertoire
+
+        Les règles désignant des répertoires, le nom du fichier ne change
+        jamais le verdict.
+        """
+        cut = max(file_path.rfind('\\'), file_path.rfind('/'))
+        return self.is_directory_allowed(file_path[:cut] if cut >= 0 else '')
+
+
+def build_cleaning_policy(username: Optional[str] = None) -> PathPolicy:
+    """Politique de nettoyage en mode sécurisé
+
+    - interdits: Windows (dont System32/SysWOW64), Program Files, Program Files (x86)
+    - Windows autorisé seulement pour les téléchargements de mises à jour et les minidumps
+    - ProgramData interdit, sauf Windows Error Reporting et le menu Démarrer
+    - autorisés: caches et fichiers temporaires du profil de l'utilisateur courant
+    """
+    if username is None:
+        username = os.path.basename(os.path.expanduser("~"))
+
+    rules = [
+        # Répertoires système absolument critiques
+        (r"\windows", DENY),
+        (r"\program files", DENY),
+        (r"\program files (x86)", DENY),
+
+        # Windows : sous-répertoires des catégories mises à jour et récupération
+        (r"\windows\softwaredistribution\download", ALLOW),
+        (r"\windows\minidump", ALLOW),
+
+        # ProgramData : autoriser seulement certains sous-répertoires de nettoyage
+        (r"\programdata", DENY),
+        (r"\programdata\microsoft\windows\wer", ALLOW),
+        (r"\programdata\microsoft\windows\start menu", ALLOW),
+    ]
+
+    # Chemins utilisateur autorisés pour le nettoyage
+    for user_path in (
+        r"appdata\local\temp",
+        r"appdata\local\microsoft\windows\inetcache",
+        r"appdata\local\microsoft\windows\explorer",
+        r"appdata\roaming\microsoft\windows\recent",
+        r"appdata\local\google\chrome",
+        r"appdata\local\microsoft\edge",
+        r"appdata\roaming\mozilla\firefox",
+    ):
+        rules.append((f"\\users\\{username}\\{user_path}", ALLOW))
+
+    return PathPolicy(rules)
+
+
+_cleaning_policy: Optional[PathPolicy] = None
+
+
+def get_cleaning_policy() -> PathPolicy:
+    """Obtenir la politique de nettoyage partagée (compilée au premier appel)"""
+    global _cleaning_policy
+    if _cleaning_policy is None:
+        _cleaning_policy = build_cleaning_policy()
+    return _cleaning_policy
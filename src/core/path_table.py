@@ -0,0 +1,365 @@
+"""
+PathTable - Table de chemins compacte pour les très gros scans
+
+Au lieu de garder un chemin absolu par fichier, chaque dossier n'est stocké
+qu'une fois (identifiant du parent + nom) et chaque fichier est une ligne de
+colonnes (dossier, position du nom, taille, date de modification). Les noms
+sont rangés bout à bout dans un réservoir d'octets; les noms fréquents
+(index.js, __init__.py...) y sont partagés.
+
+Au-delà de 'spill_after' fichiers, les blocs pleins des colonnes et du
+réservoir de noms sont écrits dans un fichier temporaire et relus par mmap:
+la mémoire du processus ne garde plus que le bloc en cours de remplissage,
+le reste est à la charge du cache disque du système.
+
+Les chemins complets ne sont reconstruits qu'à la demande (file_path,
+dir_path).
+"""
+
+import os
+import mmap
+import heapq
+import tempfile
+import itertools
+from array import array
+from typing import Callable, Iterator, List, Optional, Tuple
+
+CHUNK_ITEMS = 1 << 20          # valeurs par bloc de colonne
+NAME_CHUNK = 16 * 1024 * 1024  # octets par bloc de noms
+SPILL_AFTER = 2_000_000        # fichiers gardés entièrement en mémoire
+INTERN_LIMIT = 65536           # noms distincts mémorisés pour le partage
+PATH_CACHE_LIMIT = 4096        # chemins de dossiers reconstruits gardés en cache
+
+ROOT_ID = 0
+
+
+def _encode(name: str) -> bytes:
+    return name.encode('utf-8', errors='surrogateescape')
+
+
+def _decode(data: bytes) -> str:
+    return data.decode('utf-8', errors='surrogateescape')
+
+
+class _SpillFile:
+    """Fichier temporaire recevant les blocs pleins, relus par mmap"""
+
+    def __init__(self, spill_dir: Optional[str] = None):
+        self.spill_dir = spill_dir
+        self.active = False
+        self._file = None
+        self._maps: List[mmap.mmap] = []
+
+    def append(self, data: bytes) -> mmap.mmap:
+        """Écrire un bloc et le projeter en lecture seule"""
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(prefix='nettoyeur_paths_', dir=self.spill_dir)
+        # Les projections doivent commencer sur une frontière d'allocation
+        offset = self._file.seek(0, os.SEEK_END)
+        padding = -offset % mmap.ALLOCATIONGRANULARITY
+        if padding:
+            self._file.write(b'\0' * padding)
+            offset += padding
+        self._file.write(data)
+        self._file.flush()
+        mapped = mmap.mmap(self._file.fileno(), len(data), offset=offset, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return mapped
+
+    @property
+    def size(self) -> int:
+        return self._file.seek(0, os.SEEK_END) if self._file is not None else 0
+
+    def close(self):
+        for mapped in self._maps:
+            mapped.close()
+        self._maps = []
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class _Column:
+    """Colonne de valeurs numériques par blocs de CHUNK_ITEMS"""
+
+    def __init__(self, typecode: str, spill: _SpillFile):
+        self.typecode = typecode
+        self._spill = spill
+        self._chunks = []      # blocs pleins: array en mémoire ou memoryview sur mmap
+        self._tail = array(typecode)
+
+    def __len__(self) -> int:
+        return len(self._chunks) * CHUNK_ITEMS + len(self._tail)
+
+    def __getitem__(self, index: int):
+        chunk, position = divmod(index, CHUNK_ITEMS)
+        if chunk < len(self._chunks):
+            return self._chunks[chunk][position]
+        return self._tail[position]
+
+    def append(self, value):
+        self._tail.append(value)
+        if len(self._tail) == CHUNK_ITEMS:
+            self._chunks.append(self._seal(self._tail))
+            self._tail = array(self.typecode)
+
+    def _seal(self, values: array):
+        if not self._spill.active:
+            return values
+        return memoryview(self._spill.append(values.tobytes())).cast(self.typecode)
+
+    def spill(self):
+        """Déplacer les blocs pleins encore en mémoire vers le fichier temporaire"""
+        self._chunks = [self._seal(chunk) if isinstance(chunk, array) else chunk
+                        for chunk in self._chunks]
+
+    def blocks(self) -> Iterator:
+        """Blocs successifs (le dernier est le bloc en cours)"""
+        yield from self._chunks
+        yield self._tail
+
+    def release(self):
+        for chunk in self._chunks:
+            if isinstance(chunk, memoryview):
+                chunk.release()
+        self._chunks = []
+        self._tail = array(self.typecode)
+
+
+class _NamePool:
+    """Réservoir de noms terminés par un octet nul, avec partage des noms fréquents"""
+
+    def __init__(self, spill: _SpillFile):
+        self._spill = spill
+        self._chunks = []      # blocs pleins: bytes en mémoire ou mmap
+        self._current = bytearray()
+        self._interned = {}
+
+    def add(self, name: str) -> int:
+        encoded = _encode(name)
+        offset = self._interned.get(encoded)
+        if offset is not None:
+            return offset
+
+        if len(self._current) + len(encoded) + 1 > NAME_CHUNK:
+            self._chunks.append(self._seal(bytes(self._current)))
+            self._current = bytearray()
+        offset = len(self._chunks) * NAME_CHUNK + len(self._current)
+        self._current += encoded
+        self._current.append(0)
+
+        if len(self._interned) >= INTERN_LIMIT:
+            self._interned.clear()
+        self._interned[encoded] = offset
+        return offset
+
+    def get(self, offset: int) -> str:
+        chunk, position = divmod(offset, NAME_CHUNK)
+        data = self._chunks[chunk] if chunk < len(self._chunks) else self._current
+        return _decode(data[position:data.find(b'\0', position)])
+
+    def _seal(self, data: bytes):
+        return self._spill.append(data) if self._spill.active else data
+
+    def spill(self):
+        self._chunks = [self._seal(chunk) if isinstance(chunk, bytes) else chunk
+                        for chunk in self._chunks]
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self._current) + sum(len(chunk) for chunk in self._chunks
+                                        if isinstance(chunk, bytes))
+
+    def release(self):
+        self._chunks = []
+        self._current = bytearray()
+        self._interned.clear()
+
+
+class PathTable:
+    """Dossiers (parent + nom) et fichiers (dossier, nom, taille, date) en colonnes"""
+
+    def __init__(self, root: str, spill_dir: Optional[str] = None,
+                 spill_after: Optional[int] = SPILL_AFTER):
+        """root: chemin du dossier d'identifiant ROOT_ID
+
+        spill_after: nombre de fichiers au-delà duquel les blocs pleins passent
+        dans un fichier temporaire (None: tout garder en mémoire)
+        """
+        self.root = root
+        self.spill_after = spill_after
+        self._spill = _SpillFile(spill_dir)
+        self._names = _NamePool(self._spill)
+        self._dir_parent = _Column('i', self._spill)
+        self._dir_name = _Column('Q', self._spill)
+        self._file_dir = _Column('I', self._spill)
+        self._file_name = _Column('Q', self._spill)
+        self._file_size = _Column('Q', self._spill)
+        self._file_mtime = _Column('d', self._spill)
+        self._path_cache = {}
+
+        self._dir_parent.append(-1)
+        self._dir_name.append(self._names.add(''))
+
+    def __len__(self) -> int:
+        return len(self._file_dir)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def directory_count(self) -> int:
+        return len(self._dir_parent)
+
+    @property
+    def spilled(self) -> bool:
+        return self._spill.active
+
+    def add_directory(self, parent_id: int, name: str) -> int:
+        """Ajouter un dossier sous parent_id, retourne son identifiant"""
+        self._dir_parent.append(parent_id)
+        self._dir_name.append(self._names.add(name))
+        return len(self._dir_parent) - 1
+
+    def add_file(self, dir_id: int, name: str, size: int, mtime: float = 0.0) -> int:
+        """Ajouter un fichier du dossier dir_id, retourne son index"""
+        self._file_dir.append(dir_id)
+        self._file_name.append(self._names.add(name))
+        self._file_size.append(size)
+        self._file_mtime.append(mtime)
+        if (not self._spill.active and self.spill_after is not None
+                and len(self._file_dir) > self.spill_after):
+            self._start_spill()
+        return len(self._file_dir) - 1
+
+    def _start_spill(self):
+        self._spill.active = True
+        for column in (self._dir_parent, self._dir_name, self._file_dir,
+                       self._file_name, self._file_size, self._file_mtime):
+            column.spill()
+        self._names.spill()
+
+    def dir_parent(self, dir_id: int) -> int:
+        return self._dir_parent[dir_id]
+
+    def dir_name(self, dir_id: int) -> str:
+        return self._names.get(self._dir_name[dir_id])
+
+    def dir_path(self, dir_id: int) -> str:
+        """Reconstruire le chemin complet d'un dossier"""
+        cached = self._path_cache.get(dir_id)
+        if cached is not None:
+            return cached
+
+        parts = []
+        current = dir_id
+        base = None
+        while current != ROOT_ID:
+            base = self._path_cache.get(current)
+            if base is not None:
+                break
+            parts.append(self.dir_name(current))
+            current = self._dir_parent[current]
+        if base is None:
+            base = self.root
+        path = os.path.join(base, *reversed(parts)) if parts else base
+
+        if len(self._path_cache) >= PATH_CACHE_LIMIT:
+            self._path_cache.clear()
+        self._path_cache[dir_id] = path
+        return path
+
+    def file_dir(self, index: int) -> int:
+        return self._file_dir[index]
+
+    def file_name(self, index: int) -> str:
+        return self._names.get(self._file_name[index])
+
+    def file_path(self, index: int) -> str:
+        """Reconstruire le chemin complet d'un fichier"""
+        return os.path.join(self.dir_path(self._file_dir[index]), self.file_name(index))
+
+    def file_size(self, index: int) -> int:
+        return self._file_size[index]
+
+    def file_mtime(self, index: int) -> float:
+        return self._file_mtime[index]
+
+    def iter_sizes(self) -> Iterator[int]:
+        """Tailles de tous les fichiers, dans l'ordre des index"""
+        for block in self._file_size.blocks():
+            yield from block
+
+    def iter_files(self) -> Iterator[Tuple[int, int, int, float]]:
+        """(index, dossier, taille, date) de tous les fichiers, bloc par bloc"""
+        index = 0
+        for dirs, sizes, mtimes in zip(self._file_dir.blocks(), self._file_size.blocks(),
+                                       self._file_mtime.blocks()):
+            for dir_id, size, mtime in zip(dirs, sizes, mtimes):
+                yield index, dir_id, size, mtime
+                index += 1
+
+    def largest(self, limit: int) -> List[int]:
+        """Index des 'limit' plus gros fichiers, du plus gros au plus petit"""
+        top = []
+        base = 0
+        for block in self._file_size.blocks():
+            top = heapq.nlargest(limit, itertools.chain(top, zip(block, range(base, base + len(block)))))
+            base += len(block)
+        return [index for _, index in top]
+
+    @property
+    def memory_bytes(self) -> int:
+        """Octets gardés en mémoire par les colonnes et le réservoir de noms (approximatif)"""
+        total = self._names.memory_bytes
+        for column in (self._dir_parent, self._dir_name, self._file_dir,
+                       self._file_name, self._file_size, self._file_mtime):
+            for block in column.blocks():
+                if isinstance(block, array):
+                    total += len(block) * block.itemsize
+        return total
+
+    @property
+    def spilled_bytes(self) -> int:
+        return self._spill.size
+
+    def close(self):
+        """Libérer les projections mmap et supprimer le fichier temporaire"""
+        for column in (self._dir_parent, self._dir_name, self._file_dir,
+                       self._file_name, self._file_size, self._file_mtime):
+            column.release()
+        self._names.release()
+        self._path_cache.clear()
+        self._spill.close()
+
+
+def build_path_table(root: str, min_size: int = 0, max_depth: Optional[int] = None,
+                     is_cancelled: Optional[Callable[[], bool]] = None,
+                     spill_dir: Optional[str] = None) -> PathTable:
+    """Parcourir root et ranger dans une PathTable les fichiers d'au moins min_size octets"""
+    table = PathTable(root, spill_dir)
+    stack = [(root, ROOT_ID, 0)]
+    while stack:
+        if is_cancelled is not None and is_cancelled():
+            break
+        path, dir_id, depth = stack.pop()
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if max_depth is None or depth < max_depth:
+                                child_id = table.add_directory(dir_id, entry.name)
+                                stack.append((entry.path, child_id, depth + 1))
+                        elif entry.is_file():
+                            st = entry.stat()
+                            if st.st_size >= min_size:
+                                table.add_file(dir_id, entry.name, st.st_size, st.st_mtime)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return table
@@ -0,0 +1,266 @@
+"""
+PublisherInfo - Éditeur d'un exécutable lu dans ses ressources de version (PE)
+"""
+
+import os
+import json
+import struct
+import threading
+from typing import Dict, Optional
+
+from .app_paths import get_data_path
+
+RT_VERSION = 16
+RESOURCE_DIRECTORY_INDEX = 2
+
+# Taille maximale lue pour une ressource de version (protection contre les fichiers corrompus)
+MAX_VERSION_RESOURCE_SIZE = 1024 * 1024
+# VS_VERSIONINFO > StringFileInfo > StringTable > String: au plus 4 niveaux
+MAX_VERSION_BLOCK_DEPTH = 4
+
+
+def extract_executable_path(command: str) -> str:
+    """Extraire le chemin de l'exécutable d'une ligne de commande de démarrage
+
+    '"C:\\Prog\\app.exe" --min' -> 'C:\\Prog\\app.exe'
+    'C:\\Prog\\app.exe /background' -> 'C:\\Prog\\app.exe'
+    """
+    command = os.path.expandvars((command or '').strip())
+    if command.startswith('"'):
+        end = command.find('"', 1)
+        return command[1:end] if end > 0 else command[1:]
+
+    lower = command.lower()
+    for extension in ('.exe', '.dll', '.com'):
+        index = lower.find(extension)
+        if index > 0:
+            return command[:index + len(extension)]
+
+    if os.path.exists(command):
+        return command
+    return command.split(' ', 1)[0]
+
+
+def _rva_to_offset(sections, rva: int) -> Optional[int]:
+    """Convertir une adresse virtuelle relative en position dans le fichier"""
+    for virtual_address, virtual_size, raw_offset, raw_size in sections:
+        if virtual_address <= rva < virtual_address + max(virtual_size, raw_size):
+            return raw_offset + rva - virtual_address
+    return None
+
+
+def _read_version_resource(f) -> Optional[bytes]:
+    """Lire la ressource RT_VERSION brute d'un fichier PE ouvert"""
+    dos_header = f.read(64)
+    if len(dos_header) < 64 or dos_header[:2] != b'MZ':
+        return None
+    pe_offset = struct.unpack_from('<I', dos_header, 0x3C)[0]
+
+    f.seek(pe_offset)
+    header = f.read(24)
+    if len(header) < 24 or header[:4] != b'PE\0\0':
+        return None
+    section_count, optional_size = struct.unpack_from('<H12xH', header, 6)
+
+    optional = f.read(optional_size)
+    if len(optional) < 2:
+        return None
+    magic = struct.unpack_from('<H', optional, 0)[0]
+    directories_offset = {0x10B: 96, 0x20B: 112}.get(magic)
+    if directories_offset is None:
+        return None
+    entry = directories_offset + RESOURCE_DIRECTORY_INDEX * 8
+    if len(optional) < entry + 8:
+        return None
+    resource_rva, resource_size = struct.unpack_from('<II', optional, entry)
+    if not resource_rva or not resource_size:
+        return None
+
+    sections = []
+    for _ in range(section_count):
+        section = f.read(40)
+        if len(section) < 40:
+            return None
+        virtual_size, virtual_address, raw_size, raw_offset = struct.unpack_from('<IIII', section, 8)
+        sections.append((virtual_address, virtual_size, raw_offset, raw_size))
+
+    resource_offset = _rva_to_offset(sections, resource_rva)
+    if resource_offset is None:
+        return None
+    f.seek(resource_offset)
+    resources = f.read(min(resource_size, 16 * MAX_VERSION_RESOURCE_SIZE))
+
+    def first_entry(directory_offset, wanted_id=None):
+        # IMAGE_RESOURCE_DIRECTORY: 16 octets puis les entrées nommées et numérotées
+        if directory_offset + 16 > len(resources):
+            return None
+        named, numbered = struct.unpack_from('<HH', resources, directory_offset + 12)
+        for i in range(named + numbered):
+            position = directory_offset + 16 + i * 8
+            if position + 8 > len(resources):
+                return None
+            name, target = struct.unpack_from('<II', resources, position)
+            if wanted_id is None or (not name & 0x80000000 and name == wanted_id):
+                return target
+        return None
+
+    # Type (RT_VERSION) -> nom -> langue -> données
+    target = first_entry(0, RT_VERSION)
+    for _ in range(2):
+        if target is None or not target & 0x80000000:
+            return None
+        target = first_entry(target & 0x7FFFFFFF)
+    if target is None or target & 0x80000000 or target + 8 > len(resources):
+        return None
+
+    data_rva, data_size = struct.unpack_from('<II', resources, target)
+    data_offset = _rva_to_offset(sections, data_rva)
+    if data_offset is None or data_size > MAX_VERSION_RESOURCE_SIZE:
+        return None
+    f.seek(data_offset)
+    return f.read(data_size)
+
+
+def _parse_version_block(data: bytes, offset: int, end: int, depth: int = 0):
+    """Décoder un bloc VS_VERSIONINFO: (clé, valeur, enfants, fin du bloc)
+
+    Les blocs imbriqués au-delà de MAX_VERSION_BLOCK_DEPTH (fichier malformé)
+    sont ignorés.
+    """
+    length, value_length, value_type = struct.unpack_from('<HHH', data, offset)
+    block_end = min(offset + length, end)
+
+    key_start = offset + 6
+    key_end = key_start
+    while key_end + 1 < block_end and data[key_end:key_end + 2] != b'\0\0':
+        key_end += 2
+    key = data[key_start:key_end].decode('utf-16-le', errors='replace')
+
+    position = (key_end + 2 + 3) & ~3
+    # Valeur texte (wType=1): longueur en caractères UTF-16
+    value_bytes = value_length * 2 if value_type == 1 else value_length
+    value = data[position:min(position + value_bytes, block_end)]
+    position = (position + value_bytes + 3) & ~3
+
+    children = []
+    while depth + 1 < MAX_VERSION_BLOCK_DEPTH and position + 6 <= block_end:
+        child = _parse_version_block(data, position, block_end, depth + 1)
+        children.append(child)
+        next_position = (child[3] + 3) & ~3
+        if next_position <= position:
+            break
+        position = next_position
+
+    return key, value, children, max(block_end, offset + 6)
+
+
+def read_version_strings(path: str) -> Dict[str, str]:
+    """Lire les chaînes de version (CompanyName, ProductName...) d'un fichier PE"""
+    try:
+        with open(path, 'rb') as f:
+            resource = _read_version_resource(f)
+    except (OSError, struct.error):
+        return {}
+    if not resource or len(resource) < 6:
+        return {}
+
+    strings = {}
+    try:
+        _, _, children, _ = _parse_version_block(resource, 0, len(resource))
+        for key, _, tables, _ in children:
+            if key != 'StringFileInfo':
+                continue
+            for _, _, entries, _ in tables:
+                for name, value, _, _ in entries:
+                    text = value.decode('utf-16-le', errors='replace').rstrip('\0').strip()
+                    if text and name not in strings:
+                        strings[name] = text
+    except struct.error:
+        pass
+    return strings
+
+
+def read_company_name(path: str) -> Optional[str]:
+    """Éditeur (CompanyName) d'un exécutable, ou None"""
+    return read_version_strings(path).get('CompanyName')
+
+
+class PublisherCache:
+    """Cache persistant des éditeurs, clé (chemin, date de modification, taille)
+
+    Un fichier modifié ou remplacé change de clé et est relu. Les fichiers sans
+    éditeur sont aussi mémorisés (valeur vide) pour ne pas être relus.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None):
+        self.cache_path = cache_path or get_data_path('publisher_cache.json')
+        self._entries: Dict[str, str] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.load()
+
+    @staticmethod
+    def make_key(path: str) -> Optional[str]:
+        """Clé de cache d'un fichier, None s'il n'existe pas"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return f"{os.path.normcase(os.path.abspath(path))}|{stat.st_mtime_ns}|{stat.st_size}"
+
+    def load(self):
+        """Charger le cache depuis le disque"""
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict):
+            with self._lock:
+                self._entries = {key: value for key, value in data.items() if isinstance(value, str)}
+
+    def save(self):
+        """Enregistrer le cache (écriture atomique) s'il a changé"""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = dict(self._entries)
+            self._dirty = False
+
+        tmp_path = self.cache_path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass
+
+    def lookup(self, command: str) -> Optional[str]:
+        """Éditeur de l'exécutable d'une ligne de commande (cache puis lecture PE)"""
+        path = extract_executable_path(command)
+        key = self.make_key(path)
+        if key is None:
+            return None
+
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key] or None
+
+        company = read_company_name(path)
+        with self._lock:
+            self._entries[key] = company or ''
+            self._dirty = True
+        return company
+
+
+_cache: Optional[PublisherCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_publisher_cache() -> PublisherCache:
+    """Obtenir le cache d'éditeurs partagé"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PublisherCache()
+        return _cache
@@ -0,0 +1,255 @@
+"""
+Quarantine - Quarantaine des fichiers nettoyés, restaurables par session
+
+Les fichiers sont déplacés par os.rename() dans un dossier de quarantaine situé
+sur le même volume (aucune copie de données). Chaque session de nettoyage tient
+un journal en ajout seul (une ligne JSON par déplacement) qui permet de tout
+restaurer, ou de tout purger définitivement, en une seule opération.
+
+Journal: <données>/quarantine/<session>.jsonl
+Fichiers: <données>/quarantine/<session>/ si le dossier de données est sur le
+même volume, sinon <racine du volume>/.nettoyeur_quarantine/<session>/
+"""
+
+import os
+import json
+import errno
+import time
+import shutil
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from .app_paths import get_data_path
+
+VOLUME_DIR_NAME = '.nettoyeur_quarantine'
+
+# Durée de conservation par défaut avant purge automatique
+QUARANTINE_RETENTION_DAYS = 7
+
+# Longueur maximale des noms dans la quarantaine (préfixe numérique compris)
+MAX_NAME_LENGTH = 120
+
+
+def get_quarantine_dir() -> str:
+    """Obtenir (et créer si besoin) le dossier des journaux de quarantaine"""
+    path = get_data_path('quarantine')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _journal_path(session_id: str) -> str:
+    return os.path.join(get_quarantine_dir(), f"{session_id}.jsonl")
+
+
+def _volume_root(path: str) -> str:
+    """Point de montage (ou lecteur) contenant le chemin"""
+    path = os.path.abspath(path)
+    while not os.path.ismount(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return path
+
+
+def _read_journal(session_id: str) -> List[Dict]:
+    """Lire les entrées d'un journal (les lignes incomplètes sont ignorées)"""
+    entries = []
+    try:
+        with open(_journal_path(session_id), 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue  # Dernière ligne tronquée par un arrêt brutal
+    except OSError:
+        pass
+    return entries
+
+
+class QuarantineSession:
+    """Session de quarantaine d'un nettoyage
+
+    move() remplace os.remove(): un renommage sur le même volume, enregistré
+    dans le journal avant le déplacement (un arrêt brutal ne laisse jamais de
+    fichier en quarantaine hors journal). Si aucun dossier de quarantaine
+    n'est utilisable sur le volume du fichier, celui-ci est laissé en place
+    et compté dans 'skipped'.
+    """
+
+    def __init__(self, session_id: Optional[str] = None):
+        self.session_id = session_id or f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self.files = 0
+        self.size = 0
+        self.skipped = 0
+        self._counter = 0
+        self._volume_dirs: Dict[int, Optional[str]] = {}
+        self._parent_devices: Dict[str, int] = {}
+        self._journal = None
+        self._lock = threading.Lock()
+
+    def _write(self, entry: Dict):
+        if self._journal is None:
+            self._journal = open(_journal_path(self.session_id), 'a', encoding='utf-8', buffering=1)
+            self._journal.write(json.dumps({'op': 'session', 'id': self.session_id,
+                                            'created': time.time()}) + '\n')
+        self._journal.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def _session_dir_for(self, device: int, file_path: str) -> Optional[str]:
+        """Dossier de quarantaine de la session sur le volume 'device' (mémorisé)"""
+        if device in self._volume_dirs:
+            return self._volume_dirs[device]
+
+        candidates = []
+        data_dir = get_quarantine_dir()
+        try:
+            if os.stat(data_dir).st_dev == device:
+                candidates.append(data_dir)
+        except OSError:
+            pass
+        candidates.append(os.path.join(_volume_root(file_path), VOLUME_DIR_NAME))
+
+        session_dir = None
+        for base in candidates:
+            path = os.path.join(base, self.session_id)
+            try:
+                os.makedirs(path, exist_ok=True)
+                if os.stat(path).st_dev == device:
+                    session_dir = path
+                    self._write({'op': 'volume', 'dir': path})
+                    break
+            except OSError:
+                continue
+
+        self._volume_dirs[device] = session_dir
+        return session_dir
+
+    def _device_of(self, file_path: str) -> int:
+        # DirEntry.stat() ne renseigne pas st_dev sous Windows: stat du répertoire parent,
+        # une fois par répertoire
+        parent = os.path.dirname(os.path.abspath(file_path))
+        device = self._parent_devices.get(parent)
+        if device is None:
+            device = self._parent_devices[parent] = os.stat(parent).st_dev
+        return device
+
+    def move(self, file_path: str, size: int = 0):
+        """Mettre un fichier en quarantaine (lève OSError en cas d'échec)"""
+        with self._lock:
+            session_dir = self._session_dir_for(self._device_of(file_path), file_path)
+            if session_dir is None:
+                self.skipped += 1
+                raise OSError(errno.EXDEV, "Aucun dossier de quarantaine sur ce volume", file_path)
+
+            self._counter += 1
+            name = f"{self._counter:07d}_{os.path.basename(file_path)}"[:MAX_NAME_LENGTH]
+            destination = os.path.join(session_dir, name)
+            # Journal d'abord: une entrée sans fichier à destination est ignorée à la restauration
+            self._write({'op': 'move', 'src': file_path, 'dst': destination, 'size': size})
+            os.rename(file_path, destination)
+            self.files += 1
+            self.size += size
+
+    def close(self):
+        """Fermer le journal de la session"""
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+
+def _session_dirs(entries: List[Dict]) -> List[str]:
+    return [entry['dir'] for entry in entries if entry.get('op') == 'volume']
+
+
+def _remove_session(session_id: str, entries: List[Dict]):
+    """Supprimer les dossiers de quarantaine et le journal d'une session"""
+    for session_dir in _session_dirs(entries):
+        shutil.rmtree(session_dir, ignore_errors=True)
+    try:
+        os.remove(_journal_path(session_id))
+    except OSError:
+        pass
+
+
+def restore_session(session_id: str) -> Tuple[int, int]:
+    """Remettre en place tous les fichiers d'une session: (restaurés, échecs)
+
+    Un fichier dont l'emplacement d'origine est de nouveau occupé reste en
+    quarantaine. La session n'est supprimée que si tout a été restauré.
+    """
+    entries = _read_journal(session_id)
+    restored = 0
+    failed = 0
+
+    for entry in entries:
+        if entry.get('op') != 'move':
+            continue
+        source, destination = entry['src'], entry['dst']
+        if not os.path.lexists(destination):
+            continue  # Déjà restauré lors d'une tentative précédente
+        if os.path.lexists(source):
+            failed += 1
+            continue
+        try:
+            os.makedirs(os.path.dirname(source), exist_ok=True)
+            os.rename(destination, source)
+            restored += 1
+        except OSError:
+            failed += 1
+
+    if failed:
+        try:
+            with open(_journal_path(session_id), 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'op': 'restore', 'time': time.time(),
+                                    'restored': restored, 'failed': failed}) + '\n')
+        except OSError:
+            pass
+    else:
+        _remove_session(session_id, entries)
+    return restored, failed
+
+
+def purge_session(session_id: str) -> Tuple[int, int]:
+    """Supprimer définitivement une session: (fichiers, octets libérés)"""
+    entries = _read_journal(session_id)
+    moves = [entry for entry in entries if entry.get('op') == 'move' and os.path.lexists(entry['dst'])]
+    _remove_session(session_id, entries)
+    return len(moves), sum(entry.get('size', 0) for entry in moves)
+
+
+def list_sessions() -> List[Dict]:
+    """Sessions en quarantaine, de la plus récente à la plus ancienne"""
+    sessions = []
+    try:
+        names = os.listdir(get_quarantine_dir())
+    except OSError:
+        return sessions
+
+    for name in names:
+        if not name.endswith('.jsonl'):
+            continue
+        session_id = name[:-len('.jsonl')]
+        entries = _read_journal(session_id)
+        header = entries[0] if entries and entries[0].get('op') == 'session' else {}
+        moves = [entry for entry in entries if entry.get('op') == 'move']
+        sessions.append({
+            'id': session_id,
+            'created': header.get('created', 0),
+            'files': len(moves),
+            'size': sum(entry.get('size', 0) for entry in moves),
+        })
+
+    sessions.sort(key=lambda session: session['created'], reverse=True)
+    return sessions
+
+
+def purge_expired(max_age_days: float = QUARANTINE_RETENTION_DAYS) -> int:
+    """Purger les sessions plus anciennes que max_age_days, retourne leur nombre"""
+    limit = time.time() - max_age_days * 24 * 3600
+    purged = 0
+    for session in list_sessions():
+        if session['created'] < limit:
+            purge_session(session['id'])
+            purged += 1
+    return purged
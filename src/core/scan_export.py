@@ -0,0 +1,246 @@
+"""
+ScanExport - Export en continu de l'inventaire complet d'une analyse disque
+
+Les enregistrements (chemin, taille, date de modification, extension) sont
+produits par un parcours scandir et écrits au fil de l'eau: la mémoire reste
+constante quel que soit le nombre de fichiers.
+
+Formats:
+- csv      : CSV avec en-tête
+- jsonl    : JSON Lines, un objet par fichier
+- parquet  : Apache Parquet par groupes de lignes (si pyarrow est installé)
+- compact  : binaire compact (.nrec), chemins compressés par préfixe commun
+"""
+
+import os
+import csv
+import json
+import struct
+import importlib.util
+from collections import namedtuple
+from typing import Callable, Iterator, Optional
+
+FileRecord = namedtuple('FileRecord', ['path', 'size', 'mtime', 'extension'])
+
+COMPACT_MAGIC = b'NREC\x01'
+# Préfixe commun avec le chemin précédent, longueur du suffixe, taille, date de modification
+COMPACT_RECORD = struct.Struct('<IIQd')
+
+PARQUET_BATCH_SIZE = 65536
+
+
+def shared_prefix_length(previous: bytes, current: bytes) -> int:
+    """Longueur du préfixe commun de deux chaînes d'octets
+
+    Recherche dichotomique sur des comparaisons de tranches (faites en C),
+    bien plus rapide qu'une boucle octet par octet sur des chemins longs.
+    """
+    low, high = 0, min(len(previous), len(current))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if previous[:middle] == current[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def iter_file_records(root: str, max_depth: Optional[int] = None,
+                      is_cancelled: Optional[Callable[[], bool]] = None) -> Iterator[FileRecord]:
+    """Parcourir les fichiers sous root (profondeur max_depth comme le scanner)
+
+    Les dossiers sont parcourus en profondeur avec une pile: seule la liste
+    des dossiers en attente est gardée en mémoire.
+    """
+    stack = [(root, 0)]
+    while stack:
+        if is_cancelled is not None and is_cancelled():
+            return
+        path, depth = stack.pop()
+        try:
+            with os.scandir(path) as entries:
+                subdirs = []
+                for entry in entries:
+                    try:
+                        if entry.is_file(follow_symlinks=False):
+                            st = entry.stat(follow_symlinks=False)
+                            yield FileRecord(entry.path, st.st_size, st.st_mtime,
+                                             os.path.splitext(entry.name)[1].lower())
+                        elif entry.is_dir(follow_symlinks=False):
+                            if max_depth is None or depth < max_depth:
+                                subdirs.append(entry.path)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+        # Ordre alphabétique à chaque niveau (pile: dernier empilé, premier visité)
+        subdirs.sort(reverse=True)
+        stack.extend((subdir, depth + 1) for subdir in subdirs)
+
+
+class CsvRecordWriter:
+    """Écriture CSV (une ligne par fichier)"""
+
+    def __init__(self, file_path: str):
+        self._file = open(file_path, 'w', newline='', encoding='utf-8', errors='backslashreplace')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(['Chemin', 'Taille (octets)', 'Modification', 'Extension'])
+
+    def write(self, record: FileRecord):
+        self._writer.writerow([record.path, record.size, f"{record.mtime:.0f}", record.extension])
+
+    def close(self):
+        self._file.close()
+
+
+class JsonLinesRecordWriter:
+    """Écriture JSON Lines (un objet par ligne)"""
+
+    def __init__(self, file_path: str):
+        self._file = open(file_path, 'w', encoding='utf-8', errors='backslashreplace')
+
+    def write(self, record: FileRecord):
+        self._file.write(json.dumps(record._asdict(), ensure_ascii=False) + '\n')
+
+    def close(self):
+        self._file.close()
+
+
+class CompactRecordWriter:
+    """Écriture binaire compacte
+
+    Chaque enregistrement ne stocke que la partie du chemin qui diffère du
+    précédent; les fichiers d'un même dossier se suivent, le préfixe commun
+    est donc presque toujours le dossier entier.
+    """
+
+    def __init__(self, file_path: str):
+        self._file = open(file_path, 'wb')
+        self._file.write(COMPACT_MAGIC)
+        self._previous = b''
+
+    def write(self, record: FileRecord):
+        encoded = record.path.encode('utf-8', errors='surrogateescape')
+        shared = shared_prefix_length(self._previous, encoded)
+        suffix = encoded[shared:]
+        self._file.write(COMPACT_RECORD.pack(shared, len(suffix), record.size, record.mtime))
+        self._file.write(suffix)
+        self._previous = encoded
+
+    def close(self):
+        self._file.close()
+
+
+def read_compact(file_path: str) -> Iterator[FileRecord]:
+    """Relire un fichier écrit par CompactRecordWriter"""
+    with open(file_path, 'rb') as f:
+        if f.read(len(COMPACT_MAGIC)) != COMPACT_MAGIC:
+            raise ValueError(f"Format d'inventaire inconnu: {file_path}")
+        previous = b''
+        while True:
+            header = f.read(COMPACT_RECORD.size)
+            if len(header) < COMPACT_RECORD.size:
+                return
+            shared, length, size, mtime = COMPACT_RECORD.unpack(header)
+            encoded = previous[:shared] + f.read(length)
+            path = encoded.decode('utf-8', errors='surrogateescape')
+            yield FileRecord(path, size, mtime, os.path.splitext(path)[1].lower())
+            previous = encoded
+
+
+class ParquetRecordWriter:
+    """Écriture Parquet (pyarrow) par groupes de PARQUET_BATCH_SIZE lignes"""
+
+    def __init__(self, file_path: str):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._schema = pa.schema([
+            ('path', pa.string()),
+            ('size', pa.int64()),
+            ('mtime', pa.float64()),
+            ('extension', pa.string()),
+        ])
+        self._writer = pq.ParquetWriter(file_path, self._schema)
+        self._columns = ([], [], [], [])
+
+    def write(self, record: FileRecord):
+        self._columns[0].append(record.path.encode('utf-8', errors='surrogateescape')
+                                .decode('utf-8', errors='replace'))
+        self._columns[1].append(record.size)
+        self._columns[2].append(record.mtime)
+        self._columns[3].append(record.extension)
+        if len(self._columns[0]) >= PARQUET_BATCH_SIZE:
+            self._flush()
+
+    def _flush(self):
+        if not self._columns[0]:
+            return
+        table = self._pa.Table.from_arrays(
+            [self._pa.array(column, type=field.type) for column, field in zip(self._columns, self._schema)],
+            schema=self._schema
+        )
+        self._writer.write_table(table)
+        self._columns = ([], [], [], [])
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+
+def is_parquet_available() -> bool:
+    """pyarrow est-il installé ?"""
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+# Format -> (libellé, extension de fichier, classe d'écriture)
+EXPORT_FORMATS = {
+    'csv': ("Inventaire complet CSV", '.csv', CsvRecordWriter),
+    'jsonl': ("Inventaire complet JSON Lines", '.jsonl', JsonLinesRecordWriter),
+    'parquet': ("Inventaire complet Parquet", '.parquet', ParquetRecordWriter),
+    'compact': ("Inventaire complet binaire compact", '.nrec', CompactRecordWriter),
+}
+
+
+def get_available_formats():
+    """Formats utilisables dans cet environnement (Parquet seulement avec pyarrow)"""
+    return [name for name in EXPORT_FORMATS if name != 'parquet' or is_parquet_available()]
+
+
+class ExportCancelled(Exception):
+    """Levée par un flux d'enregistrements quand l'export est annulé"""
+
+
+def export_records(records, file_path: str, fmt: str,
+                   progress: Optional[Callable[[int], None]] = None,
+                   progress_every: int = 10000) -> int:
+    """Écrire des enregistrements dans file_path, retourne leur nombre
+
+    Le fichier est écrit à côté (.part) puis renommé: un export interrompu
+    (exception du flux, par exemple ExportCancelled) supprime le fichier
+    partiel et laisse intact un fichier existant sous le nom choisi.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Format d'export inconnu: {fmt}")
+    writer_class = EXPORT_FORMATS[fmt][2]
+
+    tmp_path = file_path + '.part'
+    count = 0
+    writer = writer_class(tmp_path)
+    try:
+        for record in records:
+            writer.write(record)
+            count += 1
+            if progress is not None and count % progress_every == 0:
+                progress(count)
+    except BaseException:
+        writer.close()
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    writer.close()
+    os.replace(tmp_path, file_path)
+    return count
@@ -0,0 +1,137 @@
+"""
+ScanScheduler - Ordonnancement du parcours disque par taille estimée
+"""
+
+import os
+import json
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+from .app_paths import get_data_path
+
+
+class ScanIndex:
+    """Index persistant des tailles de dossiers issues des scans précédents"""
+
+    def __init__(self, index_path: Optional[str] = None, min_size: int = 1024 * 1024):
+        """Initialisation de l'index
+
+        min_size: taille minimale d'un dossier pour être conservé dans l'index
+        """
+        self.index_path = index_path or get_data_path('scan_index.json')
+        self.min_size = min_size
+        self.sizes: Dict[str, int] = {}
+        self.load()
+
+    def load(self):
+        """Charger l'index depuis le disque"""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self.sizes = {path: int(size) for path, size in data.items()}
+        except (OSError, ValueError):
+            self.sizes = {}
+
+    def save(self):
+        """Sauvegarder l'index sur le disque (écriture atomique)"""
+        tmp_path = self.index_path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.sizes, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            pass
+
+    def get(self, path: str) -> Optional[int]:
+        """Obtenir la taille connue d'un dossier, None si inconnue"""
+        return self.sizes.get(os.path.normcase(path))
+
+    def update(self, dir_sizes: Dict[str, int]):
+        """Mettre à jour l'index avec des tailles de dossiers complètement parcourus"""
+        for path, size in dir_sizes.items():
+            key = os.path.normcase(path)
+            if size >= self.min_size:
+                self.sizes[key] = size
+            else:
+                self.sizes.pop(key, None)
+
+
+class TraversalScheduler:
+    """File de priorité qui explore d'abord les sous-arbres les plus volumineux
+
+    La taille d'un dossier est estimée par l'index du scan précédent quand il
+    la connaît, sinon par une estimation fournie par l'appelant sans lecture
+    supplémentaire (part de son parent, voir share_of_parent). La couverture
+    indique la part de l'espace utilisé du disque déjà expliquée par les
+    fichiers comptabilisés.
+
+    La file ne garde que le chemin, la profondeur et l'estimation de chaque
+    dossier en attente (ou, à la place du chemin, l'identifiant fourni à
+    push): ses entrées sont lues une seule fois, au moment de l'explorer.
+    """
+
+    # Taille supposée d'un dossier dont rien n'est connu
+    DEFAULT_DIR_SIZE = 64 * 1024
+
+    def __init__(self, used_bytes: int = 0, index: Optional[ScanIndex] = None):
+        self.used_bytes = used_bytes
+        self.index = index
+        self.explained_bytes = 0
+        self._heap: List[Tuple[int, int, object, int]] = []
+        self._counter = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def estimate(self, path: str, fallback: Optional[int] = None) -> int:
+        """Estimer la taille d'un dossier: index du scan précédent, sinon fallback"""
+        if self.index is not None:
+            known = self.index.get(path)
+            if known is not None:
+                return known
+        return self.DEFAULT_DIR_SIZE if fallback is None else max(0, int(fallback))
+
+    @staticmethod
+    def share_of_parent(parent_estimate: int, parent_own_size: int, subdirs: int) -> int:
+        """Part de chaque sous-dossier dans la taille estimée du parent
+
+        Ce qui reste de l'estimation du parent, une fois ses propres fichiers
+        comptés, est réparti également entre ses sous-dossiers.
+        """
+        if subdirs <= 0:
+            return 0
+        return max(0, parent_estimate - parent_own_size) // subdirs
+
+    def push(self, path: str, depth: int, fallback: Optional[int] = None, item=None):
+        """Ajouter un dossier à explorer (fallback: estimation si l'index l'ignore)
+
+        item: valeur rendue par pop() à la place du chemin (identifiant de
+        dossier par exemple), le chemin n'étant alors pas conservé
+        """
+        stored = path if item is None else item
+        heapq.heappush(self._heap, (-self.estimate(path, fallback), self._counter, stored, depth))
+        self._counter += 1
+
+    def pop(self) -> Tuple[object, int, int]:
+        """Retirer le dossier dont la taille estimée est la plus grande
+
+        Retourne (chemin ou item, profondeur, taille estimée).
+        """
+        negative, _, stored, depth = heapq.heappop(self._heap)
+        return stored, depth, -negative
+
+    def record_directory(self, size: int):
+        """Enregistrer la taille des fichiers directs d'un dossier exploré"""
+        self.explained_bytes += size
+
+    @property
+    def coverage(self) -> float:
+        """Fraction de l'espace utilisé déjà expliquée (0.0 si inconnue)"""
+        if self.used_bytes <= 0:
+            return 0.0
+        return min(1.0, self.explained_bytes / self.used_bytes)
+
+    def coverage_text(self) -> str:
+        """Message de couverture lisible"""
+        return f"{self.coverage:.0%} de l'espace utilisé expliqué"
@@ -0,0 +1,422 @@
+"""
+ScanSnapshot - Instantanés compacts des analyses disque et comparaison entre deux analyses
+
+Un instantané enregistre, triés par clé, la taille cumulée de chaque dossier
+et le nombre/la taille des fichiers par extension. Les chemins sont
+compressés par préfixe commun avec l'enregistrement précédent (les dossiers
+triés partagent presque tout leur chemin). Les enregistrements sont rangés
+par blocs en colonnes (préfixes, longueurs, valeurs, puis suffixes): chaque
+colonne se relit d'un coup avec array.frombytes().
+
+La comparaison lit les deux instantanés en flux et les joint par fusion des
+listes triées: mémoire constante, une seule passe, puis les plus fortes
+hausses et baisses sont gardées dans des tas bornés.
+
+Les instantanés sont rangés par profil d'analyse (type de scan et
+profondeur): une analyse rapide ne voit que les dossiers proches de la
+racine, la comparer à une analyse complète signalerait comme supprimé tout
+ce qu'elle n'a pas parcouru. Seuls les instantanés d'un même profil sont
+comparés.
+
+Usage en ligne de commande (depuis src/):
+    python -m core.scan_snapshot --root C:\\ [--profile full-p10] [--top 20] [ancien.snap nouveau.snap]
+"""
+
+import os
+import sys
+import json
+import time
+import heapq
+import struct
+import hashlib
+import argparse
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .app_paths import get_data_path
+from .scan_export import shared_prefix_length
+
+SNAPSHOT_MAGIC = b'NSNP\x01'
+SNAPSHOT_EXTENSION = '.snap'
+HEADER_LENGTH = struct.Struct('<I')
+# Bloc: nombre d'enregistrements, longueur des suffixes; puis les colonnes
+# préfixe commun (I), longueur du suffixe (I), valeurs (Q), et les suffixes
+BLOCK_HEADER = struct.Struct('<II')
+BLOCK_SIZE = 65536
+# Colonnes de valeurs: extensions (nombre de fichiers, taille), dossiers (taille cumulée)
+EXTENSION_VALUES = 2
+DIRECTORY_VALUES = 1
+
+# Nombre d'instantanés conservés par dossier analysé
+DEFAULT_KEEP = 10
+WRITE_BUFFER = 1024 * 1024
+
+
+def _encode(key: str) -> bytes:
+    return key.encode('utf-8', errors='surrogateescape')
+
+
+def _decode(key: bytes) -> str:
+    return key.decode('utf-8', errors='surrogateescape')
+
+
+def snapshot_profile(scan_type: str, max_depth: Optional[int], time_budget: Optional[float] = None) -> str:
+    """Profil d'une analyse: seuls les instantanés d'un même profil sont comparables"""
+    profile = scan_type or 'scan'
+    if time_budget:
+        profile += '-limite'
+    if max_depth is not None:
+        profile += f'-p{max_depth}'
+    return ''.join(c if c.isalnum() or c in '-_' else '_' for c in profile)
+
+
+def get_snapshot_dir(root: str, profile: Optional[str] = None) -> str:
+    """Dossier des instantanés d'une racine analysée, par profil (créé si besoin)"""
+    digest = hashlib.sha1(_encode(os.path.normcase(os.path.abspath(root)))).hexdigest()[:12]
+    path = os.path.join(get_data_path('snapshots'), digest)
+    if profile:
+        path = os.path.join(path, profile)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def list_snapshots(root: str, profile: Optional[str] = None) -> List[str]:
+    """Instantanés d'une racine pour un profil, du plus ancien au plus récent"""
+    directory = get_snapshot_dir(root, profile)
+    names = sorted(name for name in os.listdir(directory) if name.endswith(SNAPSHOT_EXTENSION))
+    return [os.path.join(directory, name) for name in names]
+
+
+def list_profiles(root: str) -> List[str]:
+    """Profils ayant des instantanés pour une racine, le plus récemment analysé en dernier"""
+    directory = get_snapshot_dir(root)
+    latest = {}
+    for name in os.listdir(directory):
+        if os.path.isdir(os.path.join(directory, name)):
+            snapshots = list_snapshots(root, name)
+            if snapshots:
+                latest[name] = os.path.basename(snapshots[-1])
+    return sorted(latest, key=latest.get)
+
+
+def _column(typecode: str, values=()) -> array:
+    column = array(typecode, values)
+    if column.itemsize != struct.calcsize('<' + typecode):
+        raise ValueError(f"Type de colonne non portable: {typecode}")
+    return column
+
+
+def _write_column(f, column: array):
+    if sys.byteorder != 'little':
+        column = array(column.typecode, column)
+        column.byteswap()
+    column.tofile(f)
+
+
+def _read_column(f, typecode: str, count: int) -> array:
+    column = _column(typecode)
+    column.frombytes(f.read(count * column.itemsize))
+    if sys.byteorder != 'little':
+        column.byteswap()
+    return column
+
+
+def _write_records(f, items, value_count):
+    """Écrire des (clé en octets, valeurs...) triés, par blocs de BLOCK_SIZE"""
+    previous = b''
+    items = iter(items)
+    while True:
+        shared_column = _column('I')
+        length_column = _column('I')
+        value_columns = [_column('Q') for _ in range(value_count)]
+        suffixes = []
+        for key, *values in items:
+            shared = shared_prefix_length(previous, key)
+            suffix = key[shared:]
+            shared_column.append(shared)
+            length_column.append(len(suffix))
+            for column, value in zip(value_columns, values):
+                column.append(value)
+            suffixes.append(suffix)
+            previous = key
+            if len(suffixes) >= BLOCK_SIZE:
+                break
+        if not suffixes:
+            return
+        blob = b''.join(suffixes)
+        f.write(BLOCK_HEADER.pack(len(suffixes), len(blob)))
+        for column in [shared_column, length_column] + value_columns:
+            _write_column(f, column)
+        f.write(blob)
+
+
+def save_snapshot(results: Dict, dir_sizes: Optional[Dict[str, int]] = None,
+                  path: Optional[str] = None, keep: int = DEFAULT_KEEP,
+                  profile: Optional[str] = None) -> str:
+    """Enregistrer l'instantané d'un résultat de DiskScannerThread
+
+    dir_sizes: tailles cumulées de tous les dossiers parcourus (dictionnaire ou
+    itérable de couples chemin, taille); à défaut, la liste 'directories' du
+    résultat (dossiers de plus de 1 MB).
+    profile: profil de l'analyse (voir snapshot_profile); les instantanés les
+    plus anciens du même profil au-delà de 'keep' sont supprimés.
+    """
+    root = results.get('root') or ''
+    if profile is None:
+        profile = snapshot_profile('scan', results.get('max_depth'))
+    if dir_sizes is None:
+        dir_sizes = dict(results.get('directories', []))
+
+    extensions = sorted(
+        (_encode(ext), data['count'], data['size'])
+        for ext, data in results.get('file_types', {}).items()
+    )
+    pairs = dir_sizes.items() if isinstance(dir_sizes, dict) else dir_sizes
+    directories = sorted((_encode(os.path.normcase(p)), size) for p, size in pairs)
+
+    header = {
+        'root': root,
+        'scan_time': results.get('scan_time'),
+        'created': time.time(),
+        'total_files': results.get('total_files', 0),
+        'total_size': results.get('total_size', 0),
+        'partial': bool(results.get('partial')),
+        'max_depth': results.get('max_depth'),
+        'profile': profile,
+        'extensions': len(extensions),
+        'directories': len(directories),
+    }
+
+    if path is None:
+        directory = get_snapshot_dir(root, profile)
+        path = os.path.join(directory, time.strftime('%Y%m%d-%H%M%S') + SNAPSHOT_EXTENSION)
+
+    tmp_path = path + '.tmp'
+    encoded_header = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    with open(tmp_path, 'wb', buffering=WRITE_BUFFER) as f:
+        f.write(SNAPSHOT_MAGIC)
+        f.write(HEADER_LENGTH.pack(len(encoded_header)))
+        f.write(encoded_header)
+        _write_records(f, extensions, EXTENSION_VALUES)
+        _write_records(f, directories, DIRECTORY_VALUES)
+    os.replace(tmp_path, path)
+
+    if root and keep:
+        for old_path in list_snapshots(root, profile)[:-keep]:
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+    return path
+
+
+class SnapshotReader:
+    """Lecture en flux d'un instantané: en-tête, puis extensions, puis dossiers"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        if self._file.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+            self._file.close()
+            raise ValueError(f"Instantané invalide: {path}")
+        length, = HEADER_LENGTH.unpack(self._file.read(HEADER_LENGTH.size))
+        self.header = json.loads(self._file.read(length).decode('utf-8'))
+
+    def _records(self, count: int, value_count: int) -> Iterator[Tuple]:
+        """(clé, valeurs...) de 'count' enregistrements, bloc par bloc"""
+        f = self._file
+        previous = b''
+        remaining = count
+        while remaining > 0:
+            block_count, blob_length = BLOCK_HEADER.unpack(f.read(BLOCK_HEADER.size))
+            shared_column = _read_column(f, 'I', block_count)
+            length_column = _read_column(f, 'I', block_count)
+            value_columns = [_read_column(f, 'Q', block_count) for _ in range(value_count)]
+            blob = f.read(blob_length)
+            remaining -= block_count
+
+            offset = 0
+            if value_count == 1:
+                for shared, length, value in zip(shared_column, length_column, value_columns[0]):
+                    end = offset + length
+                    previous = previous[:shared] + blob[offset:end]
+                    offset = end
+                    yield previous, value
+            else:
+                for shared, length, values in zip(shared_column, length_column, zip(*value_columns)):
+                    end = offset + length
+                    previous = previous[:shared] + blob[offset:end]
+                    offset = end
+                    yield (previous,) + values
+
+    def extensions(self) -> Iterator[Tuple[bytes, int, int]]:
+        """(extension, nombre, taille) triés par extension; à lire en premier"""
+        return self._records(self.header['extensions'], EXTENSION_VALUES)
+
+    def directories(self) -> Iterator[Tuple[bytes, int]]:
+        """(chemin, taille cumulée) triés par chemin; après les extensions"""
+        return self._records(self.header['directories'], DIRECTORY_VALUES)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _top_changes(old: Iterator[Tuple], new: Iterator[Tuple], top: int) -> Dict[str, List]:
+    """Plus fortes hausses et baisses entre deux flux triés (clé, ..., taille)
+
+    Jointure par fusion des deux flux (une clé absente d'un côté compte pour
+    0) et tas bornés à 'top' éléments. La boucle est volontairement écrite
+    d'un seul tenant: c'est le chemin critique sur des millions de dossiers.
+    """
+    if top <= 0:
+        return {'growers': [], 'shrinkers': []}
+    growers = []     # (hausse, clé, avant, après), minimum en tête
+    shrinkers = []   # (baisse, clé, avant, après), minimum en tête
+    grow_floor = 0   # Plus petite hausse retenue une fois le tas plein
+    shrink_floor = 0
+    push = heapq.heappush
+    replace = heapq.heapreplace
+
+    old_item = next(old, None)
+    new_item = next(new, None)
+    while old_item is not None or new_item is not None:
+        if new_item is None or (old_item is not None and old_item[0] < new_item[0]):
+            key, before, after = old_item[0], old_item[-1], 0
+            old_item = next(old, None)
+        elif old_item is None or new_item[0] < old_item[0]:
+            key, before, after = new_item[0], 0, new_item[-1]
+            new_item = next(new, None)
+        else:
+            key, before, after = old_item[0], old_item[-1], new_item[-1]
+            old_item = next(old, None)
+            new_item = next(new, None)
+            if before == after:
+                continue
+
+        delta = after - before
+        if delta > grow_floor or (delta > 0 and len(growers) < top):
+            if len(growers) < top:
+                push(growers, (delta, key, before, after))
+            else:
+                replace(growers, (delta, key, before, after))
+            if len(growers) == top:
+                grow_floor = growers[0][0]
+        elif -delta > shrink_floor or (delta < 0 and len(shrinkers) < top):
+            if len(shrinkers) < top:
+                push(shrinkers, (-delta, key, before, after))
+            else:
+                replace(shrinkers, (-delta, key, before, after))
+            if len(shrinkers) == top:
+                shrink_floor = shrinkers[0][0]
+
+    def as_list(heap, sign):
+        return [(_decode(key), before, after, sign * amount)
+                for amount, key, before, after in sorted(heap, reverse=True)]
+
+    return {'growers': as_list(growers, 1), 'shrinkers': as_list(shrinkers, -1)}
+
+
+def diff_snapshots(old_path: str, new_path: str, top: int = 20) -> Dict:
+    """Comparer deux instantanés par dossier et par extension
+
+    Retourne les 'top' plus fortes hausses et baisses en octets, sous la forme
+    (clé, taille avant, taille après, variation). Avec top <= 0, seuls les
+    totaux de l'en-tête sont comparés.
+    Lève ValueError si les deux analyses n'ont pas le même profil.
+    """
+    with SnapshotReader(old_path) as old, SnapshotReader(new_path) as new:
+        old_header, new_header = old.header, new.header
+        if old_header.get('profile') != new_header.get('profile'):
+            raise ValueError(
+                f"Profils d'analyse différents: {old_header.get('profile')} / {new_header.get('profile')}"
+            )
+        if top > 0:
+            extensions = _top_changes(old.extensions(), new.extensions(), top)
+            directories = _top_changes(old.directories(), new.directories(), top)
+        else:
+            extensions = {'growers': [], 'shrinkers': []}
+            directories = {'growers': [], 'shrinkers': []}
+
+    return {
+        'old': old_header,
+        'new': new_header,
+        'total_delta': new_header.get('total_size', 0) - old_header.get('total_size', 0),
+        'files_delta': new_header.get('total_files', 0) - old_header.get('total_files', 0),
+        'partial': old_header.get('partial') or new_header.get('partial'),
+        'extensions': extensions,
+        'directories': directories,
+    }
+
+
+def _format_bytes(size: float) -> str:
+    sign = '-' if size < 0 else '+'
+    size = abs(size)
+    for unit in ["B", "KB", "MB", "GB", "TB"]:
+        if size < 1024.0:
+            return f"{sign}{size:.1f} {unit}"
+        size /= 1024.0
+    return f"{sign}{size:.1f} PB"
+
+
+def format_diff(diff: Dict, top: int = 10) -> str:
+    """Texte lisible d'une comparaison (plus fortes hausses puis baisses)"""
+    lines = [
+        f"Depuis l'analyse du {diff['old'].get('scan_time') or '?'} : "
+        f"{_format_bytes(diff['total_delta'])} ({diff['files_delta']:+,} fichiers)"
+    ]
+    if diff.get('partial'):
+        lines.append("⚠️ Au moins une des deux analyses est partielle")
+
+    for title, section in (("Dossiers", diff['directories']), ("Extensions", diff['extensions'])):
+        for label, key in (("en hausse", 'growers'), ("en baisse", 'shrinkers')):
+            changes = section[key][:top]
+            if not changes:
+                continue
+            lines.append(f"\n{title} {label} :")
+            for name, before, after, delta in changes:
+                lines.append(f"  {_format_bytes(delta):>12}  {name or '(sans extension)'}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comparer deux instantanés d'analyse disque")
+    parser.add_argument('snapshots', nargs='*', help="Ancien et nouvel instantané (défaut: les deux derniers de --root)")
+    parser.add_argument('--root', help="Dossier analysé dont comparer les deux derniers instantanés")
+    parser.add_argument('--profile', help="Profil d'analyse comparé (défaut: celui de la dernière analyse de --root)")
+    parser.add_argument('--top', type=int, default=20, help="Nombre de hausses/baisses affichées")
+    args = parser.parse_args()
+
+    if len(args.snapshots) == 2:
+        old_path, new_path = args.snapshots
+    elif args.root:
+        profiles = list_profiles(args.root)
+        profile = args.profile or (profiles[-1] if profiles else None)
+        snapshots = list_snapshots(args.root, profile) if profile else []
+        if len(snapshots) < 2:
+            print("Il faut au moins deux analyses de ce dossier avec le même profil")
+            if profiles:
+                print("Profils disponibles: " + ", ".join(profiles))
+            return 1
+        old_path, new_path = snapshots[-2:]
+    else:
+        parser.error("indiquer deux instantanés ou --root")
+
+    start = time.perf_counter()
+    try:
+        diff = diff_snapshots(old_path, new_path, args.top)
+    except ValueError as e:
+        print(e)
+        return 1
+    print(format_diff(diff, args.top))
+    print(f"\nComparaison en {time.perf_counter() - start:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
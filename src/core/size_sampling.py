@@ -0,0 +1,133 @@
+"""
+SizeSampling - Estimation de la taille des gros répertoires par échantillonnage
+
+Les arborescences sont parcourues avec os.scandir. Sous Windows,
+DirEntry.stat() reprend la taille lue par FindNextFile pendant le listage:
+la somme exacte ne coûte aucun appel système et tout est mesuré. Ailleurs,
+chaque stat() est un appel système: pour un scan rapide, les répertoires de
+plus de 'threshold' fichiers ne sont pas mesurés entièrement, un échantillon
+aléatoire de leurs fichiers est lu et la taille totale est extrapolée
+(estimateur de la moyenne par répertoire, avec correction de population
+finie). L'échantillon grandit par lots jusqu'à ce que la marge de
+l'intervalle de confiance à 95 % ne dépasse plus 'target_margin' (au pire,
+tout le répertoire est lu et le résultat est exact).
+Les répertoires sont des strates indépendantes: leurs variances s'additionnent.
+"""
+
+import os
+import math
+import random
+from typing import Callable, List, Optional
+
+DEFAULT_THRESHOLD = 100
+SAMPLE_BATCH = 64
+TARGET_MARGIN = 0.03       # marge relative visée par répertoire (IC 95 %)
+Z_95 = 1.96
+
+# Sous Windows, DirEntry.stat() ne fait pas d'appel système (taille du listage)
+STAT_IS_FREE = os.name == 'nt'
+
+
+class SizeEstimate:
+    """Total (exact ou estimé) du nombre de fichiers et des octets de répertoires"""
+
+    def __init__(self, threshold: Optional[int] = DEFAULT_THRESHOLD,
+                 rng: Optional[random.Random] = None,
+                 stat_is_free: bool = STAT_IS_FREE):
+        """threshold: nombre de fichiers au-delà duquel un répertoire est
+        échantillonné (None: tout mesurer); ignoré si stat_is_free"""
+        self.threshold = threshold
+        self.rng = rng or random.Random()
+        self.stat_is_free = stat_is_free
+        self.files = 0.0
+        self.bytes = 0.0
+        self.variance = 0.0
+        self.sampled_dirs = 0
+        self.stat_calls = 0
+
+    def _entry_size(self, entry: os.DirEntry) -> int:
+        """Taille d'un fichier ordinaire (0 si devenu illisible)"""
+        if not self.stat_is_free:
+            self.stat_calls += 1
+        try:
+            return entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            return 0
+
+    def add_tree(self, top: str, is_running: Optional[Callable[[], bool]] = None):
+        """Ajouter tous les fichiers ordinaires sous 'top' (liens symboliques ignorés)"""
+        stack = [top]
+        while stack:
+            if is_running is not None and not is_running():
+                return
+            path = stack.pop()
+            files = []
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                files.append(entry)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+            self.add_entries(files)
+
+    def add_entries(self, files: List[os.DirEntry]):
+        """Ajouter les fichiers ordinaires d'un répertoire (mesurés ou échantillonnés)"""
+        population = len(files)
+        self.files += population
+        if self.stat_is_free or self.threshold is None or population <= self.threshold:
+            for entry in files:
+                self.bytes += self._entry_size(entry)
+            return
+
+        order = self.rng.sample(files, population)
+        n = 0
+        total = 0.0
+        total_sq = 0.0
+        variance = 0.0
+
+        while n < population:
+            for entry in order[n:n + SAMPLE_BATCH]:
+                value = self._entry_size(entry)
+                total += value
+                total_sq += value * value
+            n = min(population, n + SAMPLE_BATCH)
+
+            mean = total / n
+            sample_var = (total_sq - n * mean * mean) / (n - 1) if n > 1 else 0.0
+            variance = population ** 2 * (1 - n / population) * max(sample_var, 0.0) / n
+            estimate = population * mean
+            if estimate <= 0 or Z_95 * math.sqrt(variance) <= TARGET_MARGIN * estimate:
+                break
+
+        self.bytes += population * total / n
+        self.variance += variance
+        if n < population:
+            self.sampled_dirs += 1
+
+    @property
+    def margin_bytes(self) -> float:
+        """Demi-largeur de l'intervalle de confiance à 95 % (octets)"""
+        return Z_95 * math.sqrt(self.variance)
+
+    @property
+    def file_count(self) -> int:
+        return int(round(self.files))
+
+    @property
+    def size_mb(self) -> int:
+        return int(self.bytes // (1024 * 1024))
+
+    def describe(self) -> str:
+        """Précision de l'estimation pour l'affichage ('' si tout a été mesuré)"""
+        if not self.sampled_dirs:
+            return ""
+        margin_mb = self.margin_bytes / (1024 * 1024)
+        percent = self.margin_bytes / self.bytes * 100 if self.bytes else 0.0
+        return (f"estimation ±{margin_mb:.1f} MB (±{percent:.1f} %, IC 95 %) "
+                f"sur {self.sampled_dirs} répertoire(s) échantillonné(s)")
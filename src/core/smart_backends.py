@@ -0,0 +1,158 @@
+"""
+SmartBackends - Sources de données SMART interchangeables (smartctl réel ou rejeu)
+"""
+
+import os
+import json
+import subprocess
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+from .smart_data import check_smartctl_available, get_device_path_for_drive, run_smartctl_json
+
+
+class SmartBackend(ABC):
+    """Interface d'une source de données SMART au format 'smartctl -j'"""
+
+    # Les lectures de cette source alimentent-elles l'historique SMART ?
+    persist_history = True
+
+    @abstractmethod
+    def is_available(self) -> bool:
+        """Vérifier si la source peut être interrogée"""
+
+    @abstractmethod
+    def scan_devices(self) -> Optional[List[Dict]]:
+        """Énumérer les périphériques: liste de {'name', 'type', 'protocol'}
+
+        None si l'énumération a échoué (elle sera retentée), à distinguer
+        d'une liste vide.
+        """
+
+    @abstractmethod
+    def read_json(self, device: str, device_type: Optional[str] = None) -> dict:
+        """Lire les données SMART d'un périphérique (JSON 'smartctl -a -j' décodé)"""
+
+    def resolve_device(self, device: str) -> str:
+        """Convertir une lettre de lecteur en chemin de périphérique si nécessaire"""
+        return device
+
+
+class SmartctlBackend(SmartBackend):
+    """Source réelle: exécute smartctl sur la machine"""
+
+    def is_available(self) -> bool:
+        return check_smartctl_available()
+
+    def scan_devices(self) -> Optional[List[Dict]]:
+        try:
+            result = subprocess.run(
+                ["smartctl", "--scan-open", "-j"],
+                capture_output=True,
+                text=True,
+                timeout=30
+            )
+            data = json.loads(result.stdout)
+        except (subprocess.TimeoutExpired, OSError, json.JSONDecodeError):
+            # Délai dépassé, smartctl absent ou non exécutable, sortie invalide
+            return None
+        if not isinstance(data, dict):
+            return None
+        return _devices_from_scan(data)
+
+    def read_json(self, device: str, device_type: Optional[str] = None) -> dict:
+        return run_smartctl_json(device, device_type)
+
+    def resolve_device(self, device: str) -> str:
+        if len(device) == 1 and device.isalpha():
+            return get_device_path_for_drive(device)
+        return device
+
+
+class ReplayBackend(SmartBackend):
+    """Source de rejeu: lit des sorties 'smartctl -j' enregistrées (NVMe, ATA, SAT)
+
+    Chaque fichier *.json du dossier est un périphérique. Son nom est celui
+    enregistré dans le JSON (device.name), sinon le nom du fichier. Une
+    lettre de lecteur ou un nom inconnu désigne le premier fichier: l'onglet
+    SMART, qui interroge 'C:', fonctionne ainsi sur n'importe quel jeu de
+    fixtures. Les lectures rejouées ne sont pas ajoutées à l'historique.
+    """
+
+    persist_history = False
+
+    def __init__(self, fixtures_dir: str):
+        self.fixtures_dir = fixtures_dir
+        self._files: Optional[Dict[str, str]] = None
+        self._types: Dict[str, Optional[str]] = {}
+        self._protocols: Dict[str, Optional[str]] = {}
+
+    def _index(self) -> Dict[str, str]:
+        """Associer chaque nom de périphérique à son fichier (une seule fois)"""
+        if self._files is None:
+            self._files = {}
+            try:
+                names = sorted(os.listdir(self.fixtures_dir))
+            except OSError:
+                names = []
+
+            for filename in names:
+                if not filename.endswith('.json'):
+                    continue
+                path = os.path.join(self.fixtures_dir, filename)
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        device = json.load(f).get("device", {})
+                except (OSError, ValueError, AttributeError):
+                    continue
+                name = device.get("name") or os.path.splitext(filename)[0]
+                self._files[name] = path
+                self._types[name] = device.get("type")
+                self._protocols[name] = device.get("protocol")
+        return self._files
+
+    def is_available(self) -> bool:
+        return bool(self._index())
+
+    def scan_devices(self) -> List[Dict]:
+        return [
+            {'name': name, 'type': self._types.get(name), 'protocol': self._protocols.get(name)}
+            for name in self._index()
+        ]
+
+    def resolve_device(self, device: str) -> str:
+        files = self._index()
+        if device in files or not files:
+            return device
+        return next(iter(files))
+
+    def read_json(self, device: str, device_type: Optional[str] = None) -> dict:
+        path = self._index().get(device)
+        if path is None:
+            raise RuntimeError(f"No such device: {device}")
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except ValueError as e:
+            raise RuntimeError(f"Erreur de parsing JSON smartctl: {e}")
+
+
+def _devices_from_scan(data: dict) -> List[Dict]:
+    """Extraire la liste des périphériques d'une sortie 'smartctl --scan-open -j'"""
+    devices = []
+    for device in data.get("devices", []):
+        if isinstance(device, dict) and device.get("name"):
+            devices.append({
+                'name': device["name"],
+                'type': device.get("type"),
+                'protocol': device.get("protocol"),
+            })
+    return devices
+
+
+def get_default_backend() -> SmartBackend:
+    """Source par défaut: rejeu si NETTOYEUR_SMART_REPLAY_DIR est défini, sinon smartctl"""
+    replay_dir = os.environ.get('NETTOYEUR_SMART_REPLAY_DIR')
+    if replay_dir:
+        return ReplayBackend(replay_dir)
+    return SmartctlBackend()
@@ -0,0 +1,138 @@
+"""
+SmartCollector - Collecte SMART groupée et mise en cache pour tous les disques
+"""
+
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .smart_data import parse_smartctl_json, WindowsSsdHealth
+from .smart_history import SmartHistoryStore
+from .smart_backends import SmartBackend, get_default_backend
+
+
+class SmartCollector:
+    """Collecteur SMART: énumération unique, lectures concurrentes, cache par disque
+
+    - les données viennent d'une SmartBackend (smartctl réel ou rejeu de fixtures)
+    - la disponibilité de smartctl est mémorisée (check_smartctl_available)
+    - les disques sont énumérés avec 'smartctl --scan-open -j'; seule une
+      énumération réussie et non vide est mémorisée, un échec est retenté
+    - tous les disques sont interrogés en parallèle (un sous-processus par disque)
+    - chaque résultat est conservé ttl secondes
+    - chaque nouvelle lecture est ajoutée à l'historique SMART s'il est fourni
+    """
+
+    def __init__(self, ttl: float = 300, max_workers: int = 4,
+                 history: Optional[SmartHistoryStore] = None,
+                 backend: Optional[SmartBackend] = None):
+        self.backend = backend or get_default_backend()
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self.history = history
+        self._devices: Optional[List[Dict]] = None
+        self._cache: Dict[str, Tuple[float, WindowsSsdHealth]] = {}
+        self._lock = threading.Lock()
+
+    def is_available(self) -> bool:
+        """Vérifier si la source SMART est disponible (résultat mémorisé)"""
+        return self.backend.is_available()
+
+    def scan_devices(self, refresh: bool = False) -> List[Dict]:
+        """Énumérer les disques avec 'smartctl --scan-open -j'
+
+        Le résultat n'est mémorisé que s'il est non vide: un délai dépassé ou
+        une énumération vide est retenté à l'appel suivant.
+        """
+        with self._lock:
+            if self._devices is not None and not refresh:
+                return list(self._devices)
+
+        devices = self.backend.scan_devices()
+        if not devices:
+            return []
+
+        with self._lock:
+            self._devices = devices
+        return list(devices)
+
+    def read_device(self, device: str, device_type: Optional[str] = None,
+                    max_age: Optional[float] = None) -> WindowsSsdHealth:
+        """Lire un disque, en réutilisant le cache si le résultat est assez récent"""
+        max_age = self.ttl if max_age is None else max_age
+        now = time.monotonic()
+
+        with self._lock:
+            cached = self._cache.get(device)
+        if cached and now - cached[0] < max_age:
+            return cached[1]
+
+        device_path = self.backend.resolve_device(device)
+        try:
+            health = parse_smartctl_json(self.backend.read_json(device_path, device_type), device_path)
+        except RuntimeError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Erreur lors de la lecture SMART: {str(e)}")
+
+        with self._lock:
+            self._cache[device] = (time.monotonic(), health)
+
+        if self.history is not None:
+            try:
+                self.history.append(health)
+            except sqlite3.Error:
+                pass
+        return health
+
+    def read_all(self, max_age: Optional[float] = None) -> Dict[str, object]:
+        """Lire tous les disques en parallèle
+
+        Retourne un dictionnaire nom du périphérique -> WindowsSsdHealth, ou
+        l'exception levée pour ce périphérique.
+        """
+        devices = self.scan_devices()
+        if not devices:
+            return {}
+
+        def read_one(device):
+            try:
+                return self.read_device(device['name'], device.get('type'), max_age)
+            except Exception as e:
+                return e
+
+        workers = max(1, min(self.max_workers, len(devices)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(read_one, devices)
+            return {device['name']: result for device, result in zip(devices, results)}
+
+    def invalidate(self, device: Optional[str] = None):
+        """Vider le cache d'un disque, ou de tous les disques"""
+        with self._lock:
+            if device is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(device, None)
+
+
+_collector: Optional[SmartCollector] = None
+_collector_lock = threading.Lock()
+
+
+def get_smart_collector() -> SmartCollector:
+    """Obtenir le collecteur partagé par l'application"""
+    global _collector
+    with _collector_lock:
+        if _collector is None:
+            backend = get_default_backend()
+            history = None
+            # Les lectures rejouées ne doivent pas se mêler à l'historique réel
+            if backend.persist_history:
+                try:
+                    history = SmartHistoryStore()
+                except (OSError, sqlite3.Error):
+                    history = None
+            _collector = SmartCollector(history=history, backend=backend)
+        return _collector
@@ -6,31 +6,57 @@ SmartControllerThread - Thread pour le contrôle SMART des disques avec données
 import sys
 from PySide6.QtCore import QThread, Signal
 
-from .smart_data import read_windows_ssd, check_smartctl_available, get_health_status, WindowsSsdHealth
+from .smart_data import get_health_status, WindowsSsdHealth
+from .smart_collector import get_smart_collector
+
+
+SMARTCTL_MISSING_MESSAGE = (
+    "smartctl n'est pas installé. Veuillez installer smartmontools pour obtenir des données SMART réelles.\n\n"
+    "Téléchargement: https://sourceforge.net/projects/smartmontools/files/smartmontools/"
+)
 
 
 class SmartControllerThread(QThread):
     """Thread pour le contrôle SMART des disques avec données réelles"""
     smart_data_received = Signal(dict)
+    all_smart_data_received = Signal(dict)  # périphérique -> infos SMART
     error_occurred = Signal(str)
 
-    def __init__(self, disk_path):
+    def __init__(self, disk_path, all_drives=False):
         super().__init__()
         self.disk_path = disk_path
+        self.all_drives = all_drives
+        self.collector = get_smart_collector()
 
     def run(self):
         """Effectuer le contrôle SMART"""
         try:
-            smart_data = self.get_smart_info()
-            self.smart_data_received.emit(smart_data)
+            if self.all_drives:
+                self.all_smart_data_received.emit(self.get_all_smart_info())
+            else:
+                smart_data = self.get_smart_info()
+                self.smart_data_received.emit(smart_data)
         except Exception as e:
             self.error_occurred.emit(f"Erreur SMART: {str(e)}")
 
+    def get_all_smart_info(self):
+        """Obtenir les informations SMART de tous les disques (lectures parallèles, en cache)"""
+        if not self.collector.is_available():
+            raise RuntimeError(SMARTCTL_MISSING_MESSAGE)
+
+        all_info = {}
+        for device, health in self.collector.read_all().items():
+            if isinstance(health, WindowsSsdHealth):
+                all_info[device] = self._to_smart_info(health)
+            else:
+                all_info[device] = {'device_path': device, 'error': str(health)}
+        return all_info
+
     def get_smart_info(self):
         """Obtenir les informations SMART du disque avec smartctl"""
-        # Vérifier si smartctl est disponible
-        if not check_smartctl_available():
-            raise RuntimeError("smartctl n'est pas installé. Veuillez installer smartmontools pour obtenir des données SMART réelles.\n\nTéléchargement: https://sourceforge.net/projects/smartmontools/files/smartmontools/")
+        # Vérifier si smartctl est disponible (résultat mémorisé)
+        if not self.collector.is_available():
+            raise RuntimeError(SMARTCTL_MISSING_MESSAGE)
 
         try:
             # Obtenir la lettre du lecteur
@@ -39,36 +65,10 @@ class SmartControllerThread(QThread):
             else:
                 drive_letter = 'C:'  # Défaut
 
-            # Lire les données SMART avec smartctl
-            ssd_health = read_windows_ssd(drive_letter)
-
-            # Convertir en format compatible avec l'interface existante
-            smart_info = {
-                'disk_model': ssd_health.model or 'Modèle inconnu',
-                'serial_number': ssd_health.serial or 'Série inconnue',
-                'health_status': get_health_status(ssd_health),
-                'temperature': f"{ssd_health.temperature_c}°C" if ssd_health.temperature_c else 'Inconnue',
-                'power_on_hours': str(ssd_health.power_on_hours) if ssd_health.power_on_hours else 'Inconnu',
-                'power_cycles': str(ssd_health.power_cycles) if ssd_health.power_cycles else 'Inconnu',
-                'firmware_version': ssd_health.firmware or 'Inconnu',
-                'interface_type': ssd_health.protocol or 'Inconnu',
-                'device_path': ssd_health.device,
-
-                # NVMe specific
-                'percent_used': f"{ssd_health.percent_used}%" if ssd_health.percent_used is not None else None,
-                'data_written_gb': f"{ssd_health.data_written_gb} GB" if ssd_health.data_written_gb is not None else None,
-                'media_errors': str(ssd_health.media_errors) if ssd_health.media_errors is not None else '0',
-
-                # ATA/SATA specific (pour compatibilité)
-                'reallocated_sectors': ssd_health.media_errors if ssd_health.media_errors is not None else 0,
-                'pending_sectors': 0,
-
-                # Métadonnées
-                'smart_passed': ssd_health.smart_passed,
-                'data_source': 'smartctl_real',
-            }
-
-            return smart_info
+            # Lire les données SMART avec smartctl (cache par périphérique)
+            ssd_health = self.collector.read_device(drive_letter)
+
+            return self._to_smart_info(ssd_health)
 
         except Exception as e:
             # Si smartctl échoue, retourner une erreur informative
@@ -79,4 +79,54 @@ class SmartControllerThread(QThread):
             elif "No such device" in str(e) or "not found" in str(e):
                 raise RuntimeError(f"Périphérique non trouvé: {self.disk_path}")
             else:
-                raise RuntimeError(f"Erreur lors de la lecture SMART: {str(e)}")
\ No newline at end of file
+                raise RuntimeError(f"Erreur lors de la lecture SMART: {str(e)}")
+
+    def _to_smart_info(self, ssd_health):
+        """Convertir en format compatible avec l'interface existante"""
+        smart_info = {
+            'disk_model': ssd_health.model or 'Modèle inconnu',
+            'serial_number': ssd_health.serial or 'Série inconnue',
+            'health_status': get_health_status(ssd_health),
+            'temperature': f"{ssd_health.temperature_c}°C" if ssd_health.temperature_c else 'Inconnue',
+            'power_on_hours': str(ssd_health.power_on_hours) if ssd_health.power_on_hours else 'Inconnu',
+            'power_cycles': str(ssd_health.power_cycles) if ssd_health.power_cycles else 'Inconnu',
+            'firmware_version': ssd_health.firmware or 'Inconnu',
+            'interface_type': ssd_health.protocol or 'Inconnu',
+            'device_path': ssd_health.device,
+
+            # NVMe specific
+            'percent_used': f"{ssd_health.percent_used}%" if ssd_health.percent_used is not None else None,
+            'data_written_gb': f"{ssd_health.data_written_gb} GB" if ssd_health.data_written_gb is not None else None,
+            'media_errors': str(ssd_health.media_errors) if ssd_health.media_errors is not None else '0',
+
+            # ATA/SATA specific (repli sur media_errors pour compatibilité)
+            'reallocated_sectors': self._first_known(ssd_health.reallocated_sectors, ssd_health.media_errors, 0),
+            'pending_sectors': self._first_known(ssd_health.pending_sectors, 0),
+
+            # Projection d'usure d'après l'historique SMART
+            'wear_projection': self._get_wear_projection(ssd_health),
+
+            # Métadonnées
+            'smart_passed': ssd_health.smart_passed,
+            'data_source': 'smartctl_real',
+        }
+
+        return smart_info
+
+    def _get_wear_projection(self, ssd_health):
+        """Projection de fin de vie depuis l'historique, None si indisponible"""
+        history = self.collector.history
+        if history is None:
+            return None
+        try:
+            return history.project_end_of_life(history.disk_key(ssd_health))
+        except Exception:
+            return None
+
+    @staticmethod
+    def _first_known(*values):
+        """Première valeur non None"""
+        for value in values:
+            if value is not None:
+                return value
+        return None
@@ -6,6 +6,7 @@ Module pour la gestion des données SMART avec smartctl
 import subprocess
 import json
 import sys
+import functools
 from dataclasses import dataclass
 from typing import Optional
 
@@ -21,14 +22,28 @@ class WindowsSsdHealth:
     temperature_c: Optional[int] = None
     power_on_hours: Optional[int] = None
     power_cycles: Optional[int] = None
-    percent_used: Optional[int] = None       # NVMe
-    data_written_gb: Optional[int] = None    # NVMe
+    percent_used: Optional[int] = None       # NVMe (ATA: statistiques du périphérique)
+    data_written_gb: Optional[int] = None    # NVMe, ATA (attribut 241)
     media_errors: Optional[int] = None
     smart_passed: Optional[bool] = None
+    reallocated_sectors: Optional[int] = None  # ATA/SATA
+    pending_sectors: Optional[int] = None      # ATA/SATA
+
+
+_smartctl_available: Optional[bool] = None
 
 
 def check_smartctl_available():
-    """Vérifier si smartctl est disponible"""
+    """Vérifier si smartctl est disponible
+
+    Seuls les résultats sûrs sont mémorisés pour la session: smartctl trouvé,
+    ou absent (FileNotFoundError). Un délai dépassé ou un code de retour en
+    erreur est retenté à l'appel suivant. clear_smartctl_cache() force une
+    nouvelle détection.
+    """
+    global _smartctl_available
+    if _smartctl_available is not None:
+        return _smartctl_available
     try:
         result = subprocess.run(
             ["smartctl", "--version"],
@@ -36,13 +51,27 @@ def check_smartctl_available():
             text=True,
             timeout=5
         )
-        return result.returncode == 0
-    except (subprocess.TimeoutExpired, FileNotFoundError):
+    except FileNotFoundError:
+        _smartctl_available = False
         return False
+    except (subprocess.TimeoutExpired, OSError):
+        # Délai dépassé ou exécution refusée: retenté à l'appel suivant
+        return False
+    if result.returncode == 0:
+        _smartctl_available = True
+    return result.returncode == 0
+
+
+def clear_smartctl_cache():
+    """Oublier le résultat mémorisé de check_smartctl_available()"""
+    global _smartctl_available
+    _smartctl_available = None
 
 
+@functools.lru_cache(maxsize=None)
 def get_device_path_for_drive(drive_letter: str) -> str:
-    """Obtenir le chemin du périphérique pour une lettre de lecteur Windows"""
+    """Obtenir le chemin du périphérique pour une lettre de lecteur Windows
+    (mémorisé: PowerShell n'est lancé qu'une fois par lettre)"""
     if sys.platform != 'win32':
         return drive_letter
 
@@ -67,10 +96,11 @@ def get_device_path_for_drive(drive_letter: str) -> str:
         return f"\\\\.\\PhysicalDrive0"
 
 
-def read_windows_ssd(device: str) -> WindowsSsdHealth:
+def read_windows_ssd(device: str, device_type: Optional[str] = None) -> WindowsSsdHealth:
     """
     Lire les informations SMART en utilisant smartctl
     device: chemin du périphérique ou lettre de lecteur
+    device_type: type smartctl optionnel (-d), par exemple 'nvme' ou 'sat'
     """
 
     # Si c'est une lettre de lecteur, convertir en chemin de périphérique
@@ -79,10 +109,28 @@ def read_windows_ssd(device: str) -> WindowsSsdHealth:
     else:
         device_path = device
 
+    try:
+        data = run_smartctl_json(device_path, device_type)
+        return parse_smartctl_json(data, device_path)
+    except RuntimeError:
+        raise
+    except Exception as e:
+        raise RuntimeError(f"Erreur lors de la lecture SMART: {str(e)}")
+
+
+def run_smartctl_json(device_path: str, device_type: Optional[str] = None) -> dict:
+    """
+    Exécuter 'smartctl -a -j' sur un périphérique et retourner le JSON décodé
+    """
+    cmd = ["smartctl", "-a", "-j"]
+    if device_type:
+        cmd += ["-d", device_type]
+    cmd.append(device_path)
+
     try:
         # Exécuter smartctl avec format JSON
         result = subprocess.run(
-            ["smartctl", "-a", "-j", device_path],
+            cmd,
             capture_output=True,
             text=True,
             timeout=30
@@ -93,75 +141,7 @@ def read_windows_ssd(device: str) -> WindowsSsdHealth:
             raise RuntimeError(f"smartctl failed: {result.stderr.strip()}")
 
         # Parser la sortie JSON
-        data = json.loads(result.stdout)
-
-        # Extraire les informations générales
-        model = data.get("model_name")
-        serial = data.get("serial_number")
-        firmware = data.get("firmware_version")
-        protocol = data.get("device", {}).get("protocol")
-
-        # Température
-        temperature_c = None
-        temp_data = data.get("temperature", {})
-        if isinstance(temp_data, dict):
-            temperature_c = temp_data.get("current")
-        elif isinstance(temp_data, (int, float)):
-            temperature_c = int(temp_data)
-
-        # Heures de fonctionnement et cycles
-        power_on_hours = None
-        power_cycles = data.get("power_cycle_count")
-
-        time_data = data.get("power_on_time", {})
-        if isinstance(time_data, dict):
-            power_on_hours = time_data.get("hours")
-
-        # Statut SMART
-        smart_passed = None
-        smart_status = data.get("smart_status", {})
-        if isinstance(smart_status, dict):
-            smart_passed = smart_status.get("passed")
-
-        # Informations spécifiques NVMe
-        nvme_data = data.get("nvme_smart_health_information_log", {})
-        percent_used = nvme_data.get("percentage_used")
-        media_errors = nvme_data.get("media_errors")
-
-        # Calculer les données écrites (en GB)
-        data_units_written = nvme_data.get("data_units_written")
-        data_written_gb = None
-        if isinstance(data_units_written, int):
-            # data_units_written est en unités de 512KB, convertir en GB
-            data_written_gb = int(data_units_written * 512_000 / 1e9)
-
-        # Informations ATA/SATA (secteurs réalloués, etc.)
-        reallocated_sectors = None
-        pending_sectors = None
-
-        ata_smart = data.get("ata_smart_attributes", {}).get("table", [])
-        if isinstance(ata_smart, list):
-            for attr in ata_smart:
-                attr_id = attr.get("id")
-                if attr_id == 5:  # Reallocated Sectors Count
-                    reallocated_sectors = attr.get("raw", {}).get("value")
-                elif attr_id == 197:  # Current Pending Sector Count
-                    pending_sectors = attr.get("raw", {}).get("value")
-
-        return WindowsSsdHealth(
-            device=device_path,
-            model=model,
-            serial=serial,
-            firmware=firmware,
-            protocol=protocol,
-            temperature_c=temperature_c,
-            power_on_hours=power_on_hours,
-            power_cycles=power_cycles,
-            percent_used=percent_used,
-            data_written_gb=data_written_gb,
-            media_errors=media_errors,
-            smart_passed=smart_passed
-        )
+        return json.loads(result.stdout)
 
     except json.JSONDecodeError as e:
         raise RuntimeError(f"Erreur de parsing JSON smartctl: {e}")
@@ -169,8 +149,108 @@ def read_windows_ssd(device: str) -> WindowsSsdHealth:
         raise RuntimeError("Timeout lors de l'exécution de smartctl")
     except FileNotFoundError:
         raise RuntimeError("smartctl n'est pas installé. Veuillez installer smartmontools.")
-    except Exception as e:
-        raise RuntimeError(f"Erreur lors de la lecture SMART: {str(e)}")
+
+
+def _ata_written_gb(attr: dict, block_size) -> Optional[int]:
+    """Volume écrit (GB) d'après l'attribut ATA 241
+
+    L'unité dépend du constructeur et se lit dans le nom de l'attribut:
+    secteurs logiques (Total_LBAs_Written), Gio ou blocs de 32 Mio.
+    """
+    raw = attr.get("raw", {}).get("value")
+    if not isinstance(raw, int):
+        return None
+    name = attr.get("name", "")
+    if name.endswith("32MiB"):
+        unit = 32 * 1024 * 1024
+    elif name.endswith("GiB"):
+        unit = 1024 ** 3
+    else:
+        unit = block_size if isinstance(block_size, int) and block_size > 0 else 512
+    return int(raw * unit / 1e9)
+
+
+def parse_smartctl_json(data: dict, device_path: str) -> WindowsSsdHealth:
+    """
+    Convertir la sortie JSON de 'smartctl -a -j' en WindowsSsdHealth
+    """
+    # Extraire les informations générales
+    model = data.get("model_name")
+    serial = data.get("serial_number")
+    firmware = data.get("firmware_version")
+    protocol = data.get("device", {}).get("protocol")
+
+    # Température
+    temperature_c = None
+    temp_data = data.get("temperature", {})
+    if isinstance(temp_data, dict):
+        temperature_c = temp_data.get("current")
+    elif isinstance(temp_data, (int, float)):
+        temperature_c = int(temp_data)
+
+    # Heures de fonctionnement et cycles
+    power_on_hours = None
+    power_cycles = data.get("power_cycle_count")
+
+    time_data = data.get("power_on_time", {})
+    if isinstance(time_data, dict):
+        power_on_hours = time_data.get("hours")
+
+    # Statut SMART
+    smart_passed = None
+    smart_status = data.get("smart_status", {})
+    if isinstance(smart_status, dict):
+        smart_passed = smart_status.get("passed")
+
+    # Informations spécifiques NVMe
+    nvme_data = data.get("nvme_smart_health_information_log", {})
+    percent_used = nvme_data.get("percentage_used")
+    media_errors = nvme_data.get("media_errors")
+
+    # Calculer les données écrites (en GB)
+    data_units_written = nvme_data.get("data_units_written")
+    data_written_gb = None
+    if isinstance(data_units_written, int):
+        # data_units_written est en unités de 512KB, convertir en GB
+        data_written_gb = int(data_units_written * 512_000 / 1e9)
+
+    # Usure ATA: présente seulement si smartctl a lu les statistiques du périphérique
+    if percent_used is None:
+        endurance = data.get("endurance_used", {})
+        if isinstance(endurance, dict):
+            percent_used = endurance.get("current_percent")
+
+    # Informations ATA/SATA (secteurs réalloués, etc.)
+    reallocated_sectors = None
+    pending_sectors = None
+
+    ata_smart = data.get("ata_smart_attributes", {}).get("table", [])
+    if isinstance(ata_smart, list):
+        for attr in ata_smart:
+            attr_id = attr.get("id")
+            if attr_id == 5:  # Reallocated Sectors Count
+                reallocated_sectors = attr.get("raw", {}).get("value")
+            elif attr_id == 197:  # Current Pending Sector Count
+                pending_sectors = attr.get("raw", {}).get("value")
+            elif attr_id == 241 and data_written_gb is None:  # Total LBAs Written
+                data_written_gb = _ata_written_gb(attr, data.get("logical_block_size", 512))
+
+    return WindowsSsdHealth(
+        device=device_path,
+        model=model,
+        serial=serial,
+        firmware=firmware,
+        protocol=protocol,
+        temperature_c=temperature_c,
+        power_on_hours=power_on_hours,
+        power_cycles=power_cycles,
+        percent_used=percent_used,
+        data_written_gb=data_written_gb,
+        media_errors=media_errors,
+        smart_passed=smart_passed,
+        reallocated_sectors=reallocated_sectors,
+        pending_sectors=pending_sectors
+    )
 
 
 def get_health_status(ssd_health: WindowsSsdHealth) -> str:
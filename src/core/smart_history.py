@@ -0,0 +1,160 @@
+"""
+SmartHistory - Historique SMART local (SQLite) avec tendances et projection d'usure
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from .app_paths import get_data_path
+from .smart_data import WindowsSsdHealth
+
+
+class SmartHistoryStore:
+    """Série temporelle des lectures SMART, une ligne par lecture
+
+    Un résumé par disque (premier et dernier échantillon) est maintenu à chaque
+    ajout: la projection de fin de vie ne relit jamais l'historique complet.
+    """
+
+    SAMPLE_COLUMNS = ('percent_used', 'data_written_gb', 'media_errors',
+                      'temperature_c', 'reallocated_sectors', 'pending_sectors')
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or get_data_path('smart_history.db')
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS samples (
+                disk TEXT NOT NULL,
+                ts REAL NOT NULL,
+                percent_used INTEGER,
+                data_written_gb INTEGER,
+                media_errors INTEGER,
+                temperature_c INTEGER,
+                reallocated_sectors INTEGER,
+                pending_sectors INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS samples_disk_ts ON samples (disk, ts);
+            CREATE TABLE IF NOT EXISTS disks (
+                disk TEXT PRIMARY KEY,
+                sample_count INTEGER NOT NULL,
+                first_ts REAL,
+                first_percent_used INTEGER,
+                first_written_gb INTEGER,
+                last_ts REAL,
+                last_percent_used INTEGER,
+                last_written_gb INTEGER
+            );
+        ''')
+        self._conn.commit()
+
+    @staticmethod
+    def disk_key(health: WindowsSsdHealth) -> str:
+        """Identifiant stable d'un disque: numéro de série, sinon chemin du périphérique"""
+        return health.serial or health.device
+
+    def append(self, health: WindowsSsdHealth, ts: Optional[float] = None):
+        """Ajouter une lecture SMART à l'historique"""
+        ts = time.time() if ts is None else ts
+        disk = self.disk_key(health)
+        values = [getattr(health, column) for column in self.SAMPLE_COLUMNS]
+
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO samples VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                [disk, ts] + values
+            )
+
+            # Le premier échantillon utile (usure et volume écrit connus) sert de référence
+            self._conn.execute('''
+                INSERT INTO disks VALUES (?, 1, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(disk) DO UPDATE SET
+                    sample_count = sample_count + 1,
+                    first_ts = CASE WHEN first_written_gb IS NULL THEN excluded.first_ts ELSE first_ts END,
+                    first_percent_used = CASE WHEN first_written_gb IS NULL THEN excluded.first_percent_used ELSE first_percent_used END,
+                    first_written_gb = COALESCE(first_written_gb, excluded.first_written_gb),
+                    last_ts = CASE WHEN excluded.last_written_gb IS NULL THEN last_ts ELSE excluded.last_ts END,
+                    last_percent_used = COALESCE(excluded.last_percent_used, last_percent_used),
+                    last_written_gb = COALESCE(excluded.last_written_gb, last_written_gb)
+            ''', (disk, ts, health.percent_used, health.data_written_gb,
+                  ts, health.percent_used, health.data_written_gb))
+            self._conn.commit()
+
+    def get_trend(self, disk: str, since: Optional[float] = None) -> List[Dict]:
+        """Obtenir les échantillons d'un disque (les plus anciens d'abord)"""
+        query = 'SELECT ts, ' + ', '.join(self.SAMPLE_COLUMNS) + ' FROM samples WHERE disk = ?'
+        params = [disk]
+        if since is not None:
+            query += ' AND ts >= ?'
+            params.append(since)
+        query += ' ORDER BY ts'
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        columns = ('ts',) + self.SAMPLE_COLUMNS
+        return [dict(zip(columns, row)) for row in rows]
+
+    def list_disks(self) -> List[str]:
+        """Lister les disques présents dans l'historique"""
+        with self._lock:
+            rows = self._conn.execute('SELECT disk FROM disks ORDER BY disk').fetchall()
+        return [row[0] for row in rows]
+
+    def project_end_of_life(self, disk: str) -> Optional[Dict]:
+        """Projeter la fin de vie d'un SSD à partir de son rythme d'écriture
+
+        L'usure par Go écrit (percent_used / data_written_gb) et le rythme
+        d'écriture observé entre le premier et le dernier échantillon donnent
+        le nombre de jours restants avant 100 % d'usure. Retourne None si
+        l'historique ne permet pas encore d'estimer un rythme.
+
+        Une lecture sans usure ou sans volume écrit ne remplace pas la
+        dernière valeur connue. Pour les disques SATA, le volume écrit vient
+        de l'attribut 241, mais l'usure n'est connue que si smartctl lit les
+        statistiques du périphérique (absentes de 'smartctl -a' sur beaucoup
+        de disques): sans elle, aucune projection n'est possible.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT first_ts, first_written_gb, last_ts, last_percent_used, last_written_gb '
+                'FROM disks WHERE disk = ?', (disk,)
+            ).fetchone()
+
+        if not row:
+            return None
+
+        first_ts, first_written, last_ts, percent_used, last_written = row
+        if None in (first_ts, first_written, last_ts, percent_used, last_written):
+            return None
+
+        elapsed_days = (last_ts - first_ts) / 86400
+        if elapsed_days <= 0 or last_written <= 0:
+            return None
+
+        write_rate_gb_per_day = (last_written - first_written) / elapsed_days
+        result = {
+            'percent_used': percent_used,
+            'data_written_gb': last_written,
+            'write_rate_gb_per_day': write_rate_gb_per_day,
+            'days_remaining': None,
+            'end_of_life_ts': None,
+        }
+
+        if write_rate_gb_per_day <= 0 or percent_used <= 0:
+            return result
+
+        wear_per_gb = percent_used / last_written
+        remaining_gb = max(0, 100 - percent_used) / wear_per_gb
+        days_remaining = remaining_gb / write_rate_gb_per_day
+
+        result['days_remaining'] = days_remaining
+        result['end_of_life_ts'] = last_ts + days_remaining * 86400
+        return result
+
+    def close(self):
+        """Fermer la base"""
+        with self._lock:
+            self._conn.close()
@@ -2,29 +2,57 @@
 StartupManager - Module pour gérer les programmes au démarrage
 """
 
+from .startup_sources import get_default_sources, collect_items, find_source
+
+
 class StartupManager:
     """Classe pour gérer les programmes au démarrage"""
 
-    def __init__(self):
+    def __init__(self, sources=None):
         """Initialisation du gestionnaire de démarrage"""
-        pass
+        self.sources = sources if sources is not None else get_default_sources()
 
     def get_startup_programs(self):
         """Obtenir la liste des programmes au démarrage"""
-        return []
+        items, _ = collect_items(self.sources)
+        return items
+
+    def _find_program(self, program_name):
+        """Retrouver un programme par son nom"""
+        for item in self.get_startup_programs():
+            if item["name"] == program_name:
+                return item
+        return None
+
+    def _set_enabled(self, program_name, enabled):
+        item = self._find_program(program_name)
+        if item is None or not item.get("can_toggle"):
+            return False
+        try:
+            find_source(self.sources, item).set_enabled(item, enabled)
+        except Exception:
+            return False
+        return True
 
     def disable_startup_program(self, program_name):
         """Désactiver un programme au démarrage"""
-        return False
+        return self._set_enabled(program_name, False)
 
     def enable_startup_program(self, program_name):
         """Activer un programme au démarrage"""
-        return False
+        return self._set_enabled(program_name, True)
 
     def remove_startup_program(self, program_name):
         """Supprimer un programme du démarrage"""
-        return False
+        item = self._find_program(program_name)
+        if item is None:
+            return False
+        try:
+            find_source(self.sources, item).delete(item)
+        except Exception:
+            return False
+        return True
 
     def add_startup_program(self, program_path, program_name):
         """Ajouter un programme au démarrage"""
-        return False
\ No newline at end of file
+        return False
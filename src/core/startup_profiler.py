@@ -0,0 +1,202 @@
+"""
+StartupProfiler - Mesure du temps de démarrage de l'application
+
+Activation (à importer en tout début de programme, avant PySide6):
+    - variable d'environnement NETTOYEUR_STARTUP_PROFILE=1 (rapport dans le
+      dossier de données) ou NETTOYEUR_STARTUP_PROFILE=<chemin du rapport JSON>
+    - option en ligne de commande --profile-startup[=<chemin>]
+    - NETTOYEUR_STARTUP_PROFILE_EXIT=1 ou --profile-startup-exit: quitter dès
+      la première image affichée (benchmarks)
+
+Le rapport JSON contient la durée de chaque phase (imports, QApplication,
+construction de la fenêtre, première image) et les modules les plus longs à
+importer (temps cumulé et temps propre).
+"""
+
+import builtins
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Référence: premier import de ce module
+_T0 = time.perf_counter()
+_marks: List[Tuple[str, float]] = []
+
+_enabled = False
+_exit_after_first_frame = False
+_report_path: Optional[str] = None
+
+# Temps d'import par module: nom -> [cumulé, propre] (secondes)
+_import_times: Dict[str, List[float]] = {}
+_import_stack: List[float] = []
+_original_import = builtins.__import__
+_main_thread_id = threading.get_ident()
+
+CLI_SWITCH = '--profile-startup'
+CLI_EXIT_SWITCH = '--profile-startup-exit'
+TOP_IMPORTS = 30
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    """Remplaçant de __import__ qui mesure les modules importés pour la première fois"""
+    if threading.get_ident() != _main_thread_id:
+        return _original_import(name, globals, locals, fromlist, level)
+
+    module_name = name
+    if level and globals:
+        package = globals.get('__package__') or ''
+        module_name = f"{package}.{name}" if name else package
+    if module_name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+
+    _import_stack.append(0.0)
+    start = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = time.perf_counter() - start
+        children = _import_stack.pop()
+        if _import_stack:
+            _import_stack[-1] += elapsed
+        times = _import_times.setdefault(module_name, [0.0, 0.0])
+        times[0] += elapsed
+        times[1] += elapsed - children
+
+
+def _configure():
+    """Lire la configuration (environnement et ligne de commande)"""
+    global _enabled, _exit_after_first_frame, _report_path
+
+    env_value = os.environ.get('NETTOYEUR_STARTUP_PROFILE')
+    if env_value:
+        _enabled = True
+        if env_value != '1':
+            _report_path = env_value
+    if os.environ.get('NETTOYEUR_STARTUP_PROFILE_EXIT'):
+        _enabled = _exit_after_first_frame = True
+
+    # Retirer les options de sys.argv pour ne pas les transmettre à Qt
+    remaining = []
+    for arg in sys.argv:
+        if arg == CLI_EXIT_SWITCH:
+            _enabled = _exit_after_first_frame = True
+        elif arg == CLI_SWITCH:
+            _enabled = True
+        elif arg.startswith(CLI_SWITCH + '='):
+            _enabled = True
+            _report_path = arg.split('=', 1)[1]
+        else:
+            remaining.append(arg)
+    sys.argv[:] = remaining
+
+    if _enabled:
+        builtins.__import__ = _timed_import
+
+
+def mark(phase: str) -> float:
+    """Enregistrer la fin d'une phase du démarrage, retourne le temps écoulé (s)"""
+    elapsed = time.perf_counter() - _T0
+    _marks.append((phase, elapsed))
+    return elapsed
+
+
+def get_marks() -> List[Tuple[str, float]]:
+    """Obtenir les phases enregistrées (nom, secondes depuis le début)"""
+    return list(_marks)
+
+
+def is_enabled() -> bool:
+    """Vérifier si le profilage du démarrage est demandé"""
+    return _enabled
+
+
+def should_exit_after_first_frame() -> bool:
+    """Vérifier si l'application doit quitter dès la première image (benchmark)"""
+    return _exit_after_first_frame
+
+
+def _process_start_offset() -> Optional[float]:
+    """Temps (s) entre le lancement du processus et l'import de ce module"""
+    try:
+        import psutil
+        created = psutil.Process().create_time()
+    except Exception:
+        return None
+    return max(0.0, time.time() - (time.perf_counter() - _T0) - created)
+
+
+def build_report() -> Dict:
+    """Construire le rapport: phases et imports les plus longs"""
+    phases = []
+    previous = 0.0
+    for phase, elapsed in _marks:
+        phases.append({
+            'name': phase,
+            'at_ms': round(elapsed * 1000, 3),
+            'duration_ms': round((elapsed - previous) * 1000, 3),
+        })
+        previous = elapsed
+
+    imports = sorted(_import_times.items(), key=lambda item: item[1][1], reverse=True)
+    offset = _process_start_offset()
+
+    return {
+        'timestamp': time.time(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'qt_platform': os.environ.get('QT_QPA_PLATFORM'),
+        'process_start_ms': round(offset * 1000, 3) if offset is not None else None,
+        'total_ms': round(previous * 1000, 3),
+        'phases': phases,
+        'imports': [
+            {'module': name, 'cumulative_ms': round(cumulative * 1000, 3),
+             'self_ms': round(own * 1000, 3)}
+            for name, (cumulative, own) in imports[:TOP_IMPORTS]
+        ],
+    }
+
+
+def get_report_path() -> str:
+    """Chemin du rapport JSON"""
+    if _report_path:
+        return _report_path
+    from .app_paths import get_data_path
+    return get_data_path('startup_profile.json')
+
+
+def write_report(path: Optional[str] = None) -> str:
+    """Écrire le rapport JSON (écriture atomique), retourne son chemin"""
+    path = path or get_report_path()
+    report = build_report()
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def print_marks():
+    """Afficher les phases du démarrage"""
+    previous = 0.0
+    for phase, elapsed in _marks:
+        print(f"[démarrage] {phase:<28} {elapsed * 1000:8.1f} ms (+{(elapsed - previous) * 1000:.1f} ms)")
+        previous = elapsed
+
+
+def finish():
+    """Fin du démarrage: afficher les phases et écrire le rapport si demandé"""
+    if not _enabled:
+        return
+    builtins.__import__ = _original_import
+    print_marks()
+    try:
+        print(f"[démarrage] rapport écrit dans {write_report()}")
+    except OSError as e:
+        print(f"[démarrage] impossible d'écrire le rapport: {e}")
+
+
+_configure()
@@ -0,0 +1,762 @@
+"""
+StartupSources - Sources interchangeables des programmes lancés au démarrage
+
+- Windows : registre (Run / Run- / RunOnce / Policies) et dossiers Startup
+- Linux   : autostart XDG (*.desktop) et unités systemd utilisateur
+- Fake    : éléments en mémoire (tests, benchmarks)
+
+Chaque élément est un dictionnaire avec au minimum les clés "name", "path",
+"enabled", "source", "source_type" et "can_toggle". La clé "backend" est
+ajoutée par collect_items et désigne la source qui l'a produit.
+"""
+
+import os
+import json
+import copy
+import time
+import shutil
+import subprocess
+import configparser
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import winreg
+except ImportError:  # hors Windows: seules les sources Linux/fake sont disponibles
+    winreg = None
+
+
+class StartupSource(ABC):
+    """Interface d'une source d'éléments de démarrage"""
+
+    name = "source"
+    label = "Source"
+
+    @abstractmethod
+    def is_available(self) -> bool:
+        """Vérifier si la source existe sur cette machine"""
+
+    @abstractmethod
+    def list_items(self) -> List[Dict]:
+        """Lister les éléments de démarrage"""
+
+    @abstractmethod
+    def set_enabled(self, item: Dict, enabled: bool):
+        """Activer ou désactiver un élément (met à jour le dictionnaire)"""
+
+    @abstractmethod
+    def delete(self, item: Dict):
+        """Retirer un élément du démarrage"""
+
+
+# =====================================================================
+#  WINDOWS
+# =====================================================================
+
+class WindowsRegistrySource(StartupSource):
+    """Clés Run / Run- / RunOnce / Policies de HKCU et HKLM"""
+
+    name = "windows_registry"
+    label = "registre Windows"
+
+    RUN_PATH = r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run"
+    APPROVED_RUN_PATH = r"SOFTWARE\Microsoft\Windows\CurrentVersion\Explorer\StartupApproved\Run"
+
+    def __init__(self):
+        if winreg is None:
+            self.registry_defs = []
+            return
+
+        # Registres : Run (activé) / Run- (désactivé)
+        self.registry_defs = [
+            # HKCU Run / Run-
+            (winreg.HKEY_CURRENT_USER,
+             r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run",
+             "HKCU", True,
+             r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run-"),
+            (winreg.HKEY_CURRENT_USER,
+             r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run-",
+             "HKCU", False,
+             r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run"),
+
+            # HKLM Run / Run-
+            (winreg.HKEY_LOCAL_MACHINE,
+             r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run",
+             "HKLM", True,
+             r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run-"),
+            (winreg.HKEY_LOCAL_MACHINE,
+             r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run-",
+             "HKLM", False,
+             r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run"),
+
+            # HKCU RunOnce (exécuté une seule fois au prochain démarrage)
+            (winreg.HKEY_CURRENT_USER,
+             r"SOFTWARE\Microsoft\Windows\CurrentVersion\RunOnce",
+             "HKCU", True,
+             None),  # RunOnce n'a pas d'équivalent Run-
+
+            # HKLM RunOnce (exécuté une seule fois au prochain démarrage)
+            (winreg.HKEY_LOCAL_MACHINE,
+             r"SOFTWARE\Microsoft\Windows\CurrentVersion\RunOnce",
+             "HKLM", True,
+             None),
+
+            # Wow6432Node (applications 32-bit sur système 64-bit)
+            (winreg.HKEY_LOCAL_MACHINE,
+             r"SOFTWARE\Wow6432Node\Microsoft\Windows\CurrentVersion\Run",
+             "HKLM32", True,
+             r"SOFTWARE\Wow6432Node\Microsoft\Windows\CurrentVersion\Run-"),
+            (winreg.HKEY_LOCAL_MACHINE,
+             r"SOFTWARE\Wow6432Node\Microsoft\Windows\CurrentVersion\Run-",
+             "HKLM32", False,
+             r"SOFTWARE\Wow6432Node\Microsoft\Windows\CurrentVersion\Run"),
+
+            # HKCU Policies (programmes imposés par les stratégies)
+            (winreg.HKEY_CURRENT_USER,
+             r"SOFTWARE\Microsoft\Windows\CurrentVersion\Policies\Explorer\Run",
+             "HKCU Policy", True,
+             None),
+
+            # HKLM Policies (programmes imposés par les stratégies système)
+            (winreg.HKEY_LOCAL_MACHINE,
+             r"SOFTWARE\Microsoft\Windows\CurrentVersion\Policies\Explorer\Run",
+             "HKLM Policy", True,
+             None),
+        ]
+
+    def is_available(self) -> bool:
+        return winreg is not None
+
+    def _read_values(self, hive, path) -> Optional[List[Tuple[str, object]]]:
+        """Lire toutes les valeurs d'une clé en une seule ouverture (None si absente)"""
+        try:
+            with winreg.OpenKey(hive, path) as key:
+                count = winreg.QueryInfoKey(key)[1]
+                return [winreg.EnumValue(key, i)[:2] for i in range(count)]
+        except OSError:
+            return None
+
+    def _load_status_table(self, key_values) -> Dict:
+        """Table d'état lue une seule fois par analyse
+
+        - 'approved': par hive, nom en minuscules -> valeur StartupApproved\Run
+        - 'run_names': noms en minuscules des clés Run de HKCU et HKLM (déjà lues)
+        """
+        approved = {}
+        for hive in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+            values = self._read_values(hive, self.APPROVED_RUN_PATH) or []
+            approved[hive] = {name.lower(): data for name, data in values}
+
+        run_names = set()
+        for hive in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+            for name, _ in key_values.get((hive, self.RUN_PATH)) or []:
+                run_names.add(name.lower())
+
+        return {'approved': approved, 'run_names': run_names}
+
+    def list_items(self) -> List[Dict]:
+        # Chaque clé est ouverte une seule fois, StartupApproved compris
+        key_values = {}
+        for hive, path, _, _, _ in self.registry_defs:
+            key_values[(hive, path)] = self._read_values(hive, path)
+        status = self._load_status_table(key_values)
+
+        items = []
+        for hive, path, hive_label, enabled, opposite_path in self.registry_defs:
+            values = key_values[(hive, path)]
+            if values is None:
+                # clé absente => ignorer
+                continue
+
+            for name, value in values:
+                if not value or not isinstance(value, str):
+                    continue
+
+                # Filtrer les éléments inutiles
+                name_lower = name.lower()
+                value_lower = value.lower()
+
+                # Ignorer les éléments liés au bureau
+                if ('desktop' in name_lower or 'desktop' in value_lower or
+                    'bureau' in name_lower or 'bureau' in value_lower):
+                    continue
+
+                # Ignorer les éléments vides ou système inutiles
+                if name_lower.strip() == '' or value_lower.strip() == '':
+                    continue
+
+                # Vérifier l'état réel du programme
+                real_enabled = self._check_real_program_status(name, value, enabled, status)
+
+                item_data = {
+                    "name": name,
+                    "path": value,
+                    "enabled": real_enabled,
+                    "source": f"{hive_label} {os.path.basename(path)}",
+                    "source_type": "registry",
+                    "hive": hive_label,
+                    "reg_path": path,
+                    # RunOnce et Policies n'ont pas de clé opposée
+                    "can_toggle": bool(opposite_path),
+                }
+                # Ajouter reg_opposite_path seulement s'il existe (pas pour RunOnce ou Policies)
+                if opposite_path:
+                    item_data["reg_opposite_path"] = opposite_path
+                items.append(item_data)
+        return items
+
+    def _check_real_program_status(self, name: str, path: str, registry_enabled: bool,
+                                   status: Dict) -> bool:
+        """Vérifier l'état réel d'un programme au démarrage"""
+        try:
+            # Si le registre dit déjà désactivé, c'est probablement correct
+            if not registry_enabled:
+                return False
+
+            # Vérifications spécifiques pour certains programmes connus
+            name_lower = name.lower()
+            path_lower = path.lower()
+
+            # OneDrive : vérification spéciale
+            if 'onedrive' in name_lower or 'onedrive' in path_lower:
+                return self._check_onedrive_status(status)
+
+            # Microsoft Teams : vérification spéciale
+            if 'teams' in name_lower or 'teams' in path_lower:
+                return self._check_teams_status(status)
+
+            # Pour les autres programmes, vérification basique
+            return self._check_generic_startup_status(path)
+
+        except Exception:
+            # En cas d'erreur, revenir à l'état du registre
+            return registry_enabled
+
+    @staticmethod
+    def _approved_contains(status: Dict, keyword: str) -> bool:
+        """Vérifier si un nom de StartupApproved\Run (HKCU ou HKLM) contient le mot-clé"""
+        return any(keyword in name for table in status['approved'].values() for name in table)
+
+    def _check_onedrive_status(self, status: Dict) -> bool:
+        """Vérifier si OneDrive est réellement activé au démarrage"""
+        # Présent dans StartupApproved: généralement désactivé (0x02 = désactivé)
+        if self._approved_contains(status, 'onedrive'):
+            return False
+
+        # Si trouvé dans Run mais pas dans StartupApproved = activé
+        return any('onedrive' in name for name in status['run_names'])
+
+    def _check_teams_status(self, status: Dict) -> bool:
+        """Vérifier si Microsoft Teams est réellement activé au démarrage"""
+        # Même logique que OneDrive
+        return not self._approved_contains(status, 'teams')
+
+    def _check_generic_startup_status(self, path: str) -> bool:
+        """Vérification générique pour les programmes"""
+        try:
+            # Vérifier si le fichier existe et n'est pas désactivé
+            if os.path.isfile(path) and not path.endswith('.disabled'):
+                return True
+            return False
+        except Exception:
+            return True
+
+    def _get_hive_handle(self, hive_label: str):
+        if hive_label == "HKCU":
+            return winreg.HKEY_CURRENT_USER
+        if hive_label == "HKLM":
+            return winreg.HKEY_LOCAL_MACHINE
+        raise ValueError(f"Hive inconnu: {hive_label}")
+
+    def set_enabled(self, item: Dict, enabled: bool):
+        """Déplacer la valeur entre Run et Run-"""
+        if item["enabled"] == enabled:
+            return
+
+        hive = self._get_hive_handle(item["hive"])
+        src_path = item["reg_path"]
+        name = item["name"]
+
+        # Vérifier si l'élément peut être désactivé (a un opposite_path)
+        if "reg_opposite_path" not in item:
+            raise RuntimeError(f"Impossible de désactiver {name}: RunOnce et Policies ne peuvent pas être désactivés")
+
+        dst_path = item["reg_opposite_path"]
+
+        # Lecture valeur depuis src
+        with winreg.OpenKey(hive, src_path, 0, winreg.KEY_READ | winreg.KEY_WRITE) as src_key:
+            value_data, value_type = winreg.QueryValueEx(src_key, name)
+
+        # Écriture dans la clé opposée (création si besoin)
+        with winreg.CreateKey(hive, dst_path) as dst_key:
+            winreg.SetValueEx(dst_key, name, 0, value_type, value_data)
+
+        # Suppression dans la clé d'origine
+        with winreg.OpenKey(hive, src_path, 0, winreg.KEY_SET_VALUE) as src_key:
+            winreg.DeleteValue(src_key, name)
+
+        # Mise à jour de la structure
+        item["enabled"] = not item["enabled"]
+        item["reg_path"], item["reg_opposite_path"] = (
+            item["reg_opposite_path"],
+            item["reg_path"],
+        )
+        item["source"] = f"{item['hive']} {os.path.basename(item['reg_path'])}"
+
+    def delete(self, item: Dict):
+        hive = self._get_hive_handle(item["hive"])
+        name = item["name"]
+
+        # on essaie de supprimer dans les deux clés (Run et Run-)
+        for path in [item.get("reg_path"), item.get("reg_opposite_path")]:
+            if not path:
+                continue
+            try:
+                with winreg.OpenKey(hive, path, 0, winreg.KEY_SET_VALUE) as key:
+                    winreg.DeleteValue(key, name)
+            except OSError:
+                # déjà absent : ignorer
+                continue
+
+
+class WindowsStartupFolderSource(StartupSource):
+    """Dossiers Startup de l'utilisateur et du système"""
+
+    name = "windows_folder"
+    label = "dossiers Startup"
+
+    def __init__(self):
+        user_startup = os.path.expanduser(
+            "~/AppData/Roaming/Microsoft/Windows/Start Menu/Programs/Startup"
+        )
+        sys_startup = os.path.join(
+            os.environ.get("PROGRAMDATA", "C:/ProgramData"),
+            "Microsoft/Windows/Start Menu/Programs/Startup"
+        )
+        self.folder_defs = [
+            (user_startup, False, "Startup utilisateur"),
+            (sys_startup, True, "Startup système"),
+        ]
+
+    def is_available(self) -> bool:
+        return os.name == 'nt'
+
+    def list_items(self) -> List[Dict]:
+        items = []
+        for folder, is_system, label in self.folder_defs:
+            if not os.path.isdir(folder):
+                continue
+
+            for fname in os.listdir(folder):
+                full = os.path.join(folder, fname)
+                if not os.path.isfile(full):
+                    continue
+
+                # Filtrer les éléments inutiles
+                fname_lower = fname.lower()
+                if ('desktop' in fname_lower or 'bureau' in fname_lower):
+                    continue
+
+                # Gestion du .disabled
+                if fname.endswith(".disabled"):
+                    enabled = False
+                    base_name = fname[:-9]  # remove ".disabled"
+                else:
+                    enabled = True
+                    base_name = fname
+
+                items.append({
+                    "name": os.path.splitext(base_name)[0],
+                    "path": full,
+                    "enabled": enabled,
+                    "source": label,
+                    "source_type": "folder",
+                    "folder_path": folder,
+                    "is_system": is_system,
+                    "can_toggle": False,
+                })
+        return items
+
+    def set_enabled(self, item: Dict, enabled: bool):
+        """Ajouter ou retirer le suffixe .disabled"""
+        if item["enabled"] == enabled:
+            return
+
+        current_path = item["path"]
+        if current_path.endswith(".disabled"):
+            # activer : enlever le suffixe
+            new_path = current_path[:-9]
+        else:
+            # désactiver : ajouter le suffixe
+            new_path = current_path + ".disabled"
+
+        if os.path.exists(current_path):
+            os.rename(current_path, new_path)
+        else:
+            # si le fichier n'existe plus, on marque simplement comme désactivé
+            new_path = current_path
+
+        item["path"] = new_path
+        item["enabled"] = not item["enabled"]
+
+    def delete(self, item: Dict):
+        path = item["path"]
+        if os.path.exists(path):
+            os.remove(path)
+
+
+# =====================================================================
+#  LINUX
+# =====================================================================
+
+class XdgAutostartSource(StartupSource):
+    """Fichiers *.desktop des dossiers autostart XDG
+
+    Un fichier du dossier utilisateur remplace celui du même nom dans les
+    dossiers système. Désactiver ou supprimer une entrée système écrit une
+    copie utilisateur avec Hidden=true (spécification XDG Autostart).
+    """
+
+    name = "xdg_autostart"
+    label = "autostart XDG"
+
+    def __init__(self, user_dir: Optional[str] = None, system_dirs: Optional[List[str]] = None):
+        config_home = os.environ.get('XDG_CONFIG_HOME') or os.path.expanduser('~/.config')
+        self.user_dir = user_dir or os.path.join(config_home, 'autostart')
+        if system_dirs is None:
+            config_dirs = os.environ.get('XDG_CONFIG_DIRS') or '/etc/xdg'
+            system_dirs = [os.path.join(d, 'autostart') for d in config_dirs.split(':') if d]
+        self.system_dirs = system_dirs
+
+    def is_available(self) -> bool:
+        return os.name == 'posix' and any(
+            os.path.isdir(d) for d in [self.user_dir] + self.system_dirs
+        )
+
+    @staticmethod
+    def _read_desktop_file(path: str) -> Optional[Dict[str, str]]:
+        """Lire la section [Desktop Entry] d'un fichier .desktop"""
+        parser = configparser.ConfigParser(interpolation=None, strict=False)
+        parser.optionxform = str
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                parser.read_file(f)
+        except (OSError, configparser.Error):
+            return None
+        if not parser.has_section('Desktop Entry'):
+            return None
+        return dict(parser.items('Desktop Entry'))
+
+    def list_items(self) -> List[Dict]:
+        # Le dossier utilisateur est prioritaire, puis les dossiers système dans l'ordre
+        entries = {}
+        for directory, is_system in [(self.user_dir, False)] + [(d, True) for d in self.system_dirs]:
+            try:
+                names = sorted(os.listdir(directory))
+            except OSError:
+                continue
+            for fname in names:
+                if fname.endswith('.desktop') and fname not in entries:
+                    entries[fname] = (os.path.join(directory, fname), is_system)
+
+        items = []
+        for fname, (path, is_system) in entries.items():
+            entry = self._read_desktop_file(path)
+            if entry is None:
+                continue
+            enabled = (entry.get('Hidden', 'false').lower() != 'true' and
+                       entry.get('X-GNOME-Autostart-enabled', 'true').lower() != 'false')
+            items.append({
+                "name": entry.get('Name') or os.path.splitext(fname)[0],
+                "path": entry.get('Exec', ''),
+                "enabled": enabled,
+                "source": "Autostart système" if is_system else "Autostart utilisateur",
+                "source_type": "xdg",
+                "desktop_file": path,
+                "desktop_name": fname,
+                "is_system": is_system,
+                "can_toggle": True,
+            })
+        return items
+
+    def _write_user_entry(self, item: Dict, hidden: bool):
+        """Écrire (ou mettre à jour) la copie utilisateur avec Hidden=true/false
+
+        Pour réactiver une entrée, X-GNOME-Autostart-enabled (que list_items
+        lit aussi) est remis à true s'il est présent.
+        """
+        os.makedirs(self.user_dir, exist_ok=True)
+        target = os.path.join(self.user_dir, item["desktop_name"])
+        if os.path.abspath(item["desktop_file"]) != os.path.abspath(target):
+            shutil.copyfile(item["desktop_file"], target)
+
+        with open(target, 'r', encoding='utf-8', errors='replace') as f:
+            lines = f.read().splitlines()
+
+        # Remplacer les clés dans [Desktop Entry]; Hidden= est ajouté à la fin
+        # de la section s'il manque
+        values = {'Hidden': 'true' if hidden else 'false'}
+        if not hidden:
+            values['X-GNOME-Autostart-enabled'] = 'true'
+        section = None
+        insert_at = len(lines)
+        replaced = set()
+        for i, line in enumerate(lines):
+            stripped = line.strip()
+            if stripped.startswith('['):
+                if section == 'Desktop Entry':
+                    insert_at = i
+                    break
+                section = stripped[1:-1]
+            elif section == 'Desktop Entry':
+                key = stripped.split('=', 1)[0].strip()
+                if key in values:
+                    lines[i] = f"{key}={values[key]}"
+                    replaced.add(key)
+        if 'Hidden' not in replaced:
+            while insert_at > 0 and not lines[insert_at - 1].strip():
+                insert_at -= 1
+            lines.insert(insert_at, f"Hidden={values['Hidden']}")
+
+        tmp_path = target + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_path, target)
+
+        item["desktop_file"] = target
+        item["is_system"] = False
+        item["source"] = "Autostart utilisateur"
+
+    def set_enabled(self, item: Dict, enabled: bool):
+        self._write_user_entry(item, hidden=not enabled)
+        item["enabled"] = enabled
+
+    def delete(self, item: Dict):
+        overrides_system = any(
+            os.path.exists(os.path.join(d, item["desktop_name"])) for d in self.system_dirs
+        )
+        if item.get("is_system") or overrides_system:
+            # Un fichier système ne peut pas être supprimé: le masquer pour cet utilisateur
+            self._write_user_entry(item, hidden=True)
+            item["enabled"] = False
+        elif os.path.exists(item["desktop_file"]):
+            os.remove(item["desktop_file"])
+
+
+class SystemdUserSource(StartupSource):
+    """Services systemd de l'utilisateur (systemctl --user)"""
+
+    name = "systemd_user"
+    label = "services systemd utilisateur"
+
+    # États de list-unit-files qui correspondent à un démarrage modifiable
+    TOGGLE_STATES = {'enabled': True, 'disabled': False}
+
+    def __init__(self, timeout: float = 10):
+        self.timeout = timeout
+        self.user_unit_dir = os.path.join(
+            os.environ.get('XDG_CONFIG_HOME') or os.path.expanduser('~/.config'),
+            'systemd', 'user'
+        )
+
+    def _systemctl(self, *args) -> str:
+        result = subprocess.run(
+            ['systemctl', '--user', '--no-pager'] + list(args),
+            capture_output=True, text=True, timeout=self.timeout
+        )
+        if result.returncode != 0 and not result.stdout:
+            raise RuntimeError(result.stderr.strip() or f"systemctl --user {' '.join(args)} a échoué")
+        return result.stdout
+
+    def is_available(self) -> bool:
+        return os.name == 'posix' and shutil.which('systemctl') is not None
+
+    def list_items(self) -> List[Dict]:
+        try:
+            output = self._systemctl('list-unit-files', '--type=service', '--no-legend')
+        except (OSError, subprocess.TimeoutExpired, RuntimeError):
+            return []
+
+        units = {}
+        for line in output.splitlines():
+            parts = line.split()
+            if len(parts) >= 2 and parts[1] in self.TOGGLE_STATES and '@' not in parts[0]:
+                units[parts[0]] = self.TOGGLE_STATES[parts[1]]
+        if not units:
+            return []
+
+        # Une seule commande pour la description et la commande de tous les services
+        details = self._show_units(list(units))
+
+        items = []
+        for unit, enabled in units.items():
+            info = details.get(unit, {})
+            fragment = info.get('FragmentPath', '')
+            items.append({
+                "name": info.get('Description') or unit,
+                "path": self._exec_command(info.get('ExecStart', '')) or fragment,
+                "enabled": enabled,
+                "source": "systemd utilisateur",
+                "source_type": "systemd",
+                "unit": unit,
+                "unit_file": fragment,
+                "can_toggle": True,
+            })
+        return items
+
+    def _show_units(self, units: List[str]) -> Dict[str, Dict[str, str]]:
+        """Propriétés Id, Description, FragmentPath et ExecStart de plusieurs services"""
+        try:
+            output = self._systemctl('show', '--property=Id,Description,FragmentPath,ExecStart', *units)
+        except (OSError, subprocess.TimeoutExpired, RuntimeError):
+            return {}
+
+        details = {}
+        for block in output.split('\n\n'):
+            info = {}
+            for line in block.splitlines():
+                key, _, value = line.partition('=')
+                info[key] = value
+            if info.get('Id'):
+                details[info['Id']] = info
+        return details
+
+    @staticmethod
+    def _exec_command(exec_start: str) -> str:
+        """Extraire la ligne de commande de la propriété ExecStart"""
+        marker = 'argv[]='
+        start = exec_start.find(marker)
+        if start < 0:
+            return ''
+        end = exec_start.find(' ;', start)
+        return exec_start[start + len(marker):end if end > 0 else None].strip()
+
+    def set_enabled(self, item: Dict, enabled: bool):
+        self._systemctl('enable' if enabled else 'disable', item["unit"])
+        item["enabled"] = enabled
+
+    def delete(self, item: Dict):
+        self._systemctl('disable', item["unit"])
+        item["enabled"] = False
+
+        # Seules les unités écrites par l'utilisateur sont supprimées
+        unit_file = item.get("unit_file") or ''
+        if unit_file and os.path.dirname(os.path.abspath(unit_file)) == os.path.abspath(self.user_unit_dir):
+            os.remove(unit_file)
+            self._systemctl('daemon-reload')
+
+
+# =====================================================================
+#  FAKE
+# =====================================================================
+
+class FakeStartupSource(StartupSource):
+    """Source en mémoire pour les tests et benchmarks (délai optionnel par lecture)"""
+
+    def __init__(self, items: Optional[List[Dict]] = None, name: str = "fake",
+                 label: str = "source de test", delay: float = 0.0):
+        self.name = name
+        self.label = label
+        self.delay = delay
+        self.items = []
+        for item in items or []:
+            item = dict(item)
+            item.setdefault("enabled", True)
+            item.setdefault("path", "")
+            item.setdefault("source", label)
+            item.setdefault("source_type", "fake")
+            item.setdefault("can_toggle", True)
+            self.items.append(item)
+
+    @classmethod
+    def from_json(cls, path: str, **kwargs) -> 'FakeStartupSource':
+        """Charger les éléments depuis un fichier JSON (liste de dictionnaires)"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f), **kwargs)
+
+    def is_available(self) -> bool:
+        return True
+
+    def list_items(self) -> List[Dict]:
+        if self.delay:
+            time.sleep(self.delay)
+        return copy.deepcopy(self.items)
+
+    def _find(self, item: Dict) -> Dict:
+        for stored in self.items:
+            if stored["name"] == item["name"] and stored["path"] == item["path"]:
+                return stored
+        raise RuntimeError(f"Élément introuvable: {item['name']}")
+
+    def set_enabled(self, item: Dict, enabled: bool):
+        self._find(item)["enabled"] = enabled
+        item["enabled"] = enabled
+
+    def delete(self, item: Dict):
+        self.items.remove(self._find(item))
+
+
+# =====================================================================
+#  COLLECTE
+# =====================================================================
+
+def get_default_sources() -> List[StartupSource]:
+    """Sources disponibles sur cette machine
+
+    Si NETTOYEUR_STARTUP_FIXTURE désigne un fichier JSON, seule une source
+    fake chargée depuis ce fichier est utilisée.
+    """
+    fixture = os.environ.get('NETTOYEUR_STARTUP_FIXTURE')
+    if fixture:
+        return [FakeStartupSource.from_json(fixture)]
+
+    candidates = [
+        WindowsRegistrySource(),
+        WindowsStartupFolderSource(),
+        XdgAutostartSource(),
+        SystemdUserSource(),
+    ]
+    return [source for source in candidates if source.is_available()]
+
+
+def collect_items(sources: List[StartupSource],
+                  progress: Optional[Callable[[int, str], None]] = None,
+                  max_workers: int = 4) -> Tuple[List[Dict], Dict[str, Exception]]:
+    """Interroger toutes les sources en parallèle et fusionner leurs éléments
+
+    Les éléments sont retournés dans l'ordre des sources. Une source en échec
+    n'empêche pas les autres: son exception est retournée dans le second
+    élément (nom de la source -> exception).
+    """
+    results: Dict[str, List[Dict]] = {}
+    errors: Dict[str, Exception] = {}
+    if not sources:
+        return [], errors
+
+    workers = max(1, min(max_workers, len(sources)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(source.list_items): source for source in sources}
+        for done, future in enumerate(as_completed(futures), 1):
+            source = futures[future]
+            try:
+                results[source.name] = future.result()
+            except Exception as e:
+                errors[source.name] = e
+            if progress:
+                progress(int(done / len(sources) * 100), f"Lecture {source.label} terminée")
+
+    items = []
+    for source in sources:
+        for item in results.get(source.name, []):
+            item["backend"] = source.name
+            items.append(item)
+    return items, errors
+
+
+def find_source(sources: List[StartupSource], item: Dict) -> StartupSource:
+    """Retrouver la source d'un élément"""
+    for source in sources:
+        if source.name == item.get("backend"):
+            return source
+    raise RuntimeError("Type de source inconnu")
@@ -17,7 +17,9 @@ from PySide6.QtGui import QPixmap, QPainter, QColor, QPen, QFont
 from .nav_button import NavButton
 
 from core.smart_controller import SmartControllerThread
-from core.disk_scanner import DiskScannerThread
+from core.disk_scanner import DiskScannerThread, DiskExportThread, DiskWatchThread
+from core.scan_export import EXPORT_FORMATS, get_available_formats
+from core.scan_snapshot import format_diff
 
 
 class DiskAnalysisWidget(QWidget):
@@ -36,6 +38,11 @@ class DiskAnalysisWidget(QWidget):
         self.smart_results = {}
         self.scanner_thread = None
         self.smart_thread = None
+        self.export_thread = None
+        self.watch_thread = None
+        self.live_seed = None   # Dossiers du dernier scan (état initial du suivi)
+        self.live_large_files = None
+        self.live_state = None  # État du dernier suivi, repris au redémarrage
         self.setup_ui()
         self.setup_style()
         self.refresh_disk_list()
@@ -202,7 +209,7 @@ class DiskAnalysisWidget(QWidget):
 
         self.scan_type_combo = QComboBox()
         self.scan_type_combo.setFixedHeight(32)  # Forcer la même hauteur que les boutons
-        self.scan_type_combo.addItems(["Scan Rapide", "Scan Complet", "Scan par Type", "Scan Personnalisé"])
+        self.scan_type_combo.addItems(["Scan Rapide", "Scan Complet", "Scan Limité (60 s)", "Scan par Type", "Scan Personnalisé"])
         self.scan_type_combo.setStyleSheet("""
             QComboBox {
                 background: #ffffff;
@@ -306,9 +313,17 @@ class DiskAnalysisWidget(QWidget):
         self.btn_export.sizeType = "small"
         self.btn_export.clicked.connect(self.export_results)
 
+        self.btn_watch = NavButton("👁️ Suivi en direct", self)
+        self.btn_watch.set_secondary()
+        self.btn_watch.sizeType = "small"
+        self.btn_watch.setToolTip("Mettre à jour les résultats quand des fichiers sont créés, modifiés ou supprimés")
+        self.btn_watch.clicked.connect(self.toggle_live_watch)
+        self.btn_watch.setEnabled(False)
+
         right_layout.addWidget(self.btn_scan)
         right_layout.addWidget(self.btn_cancel)
         right_layout.addWidget(self.btn_export)
+        right_layout.addWidget(self.btn_watch)
 
         # Ajouter les groupes au layout principal
         control_layout.addWidget(left_group)
@@ -795,9 +810,17 @@ class DiskAnalysisWidget(QWidget):
             }
         """)
 
-        # Ajouter le titre et le bouton au layout
+        # Bouton SMART de tous les disques (même style)
+        self.btn_smart_all = QPushButton("💽 Tous les disques")
+        self.btn_smart_all.setObjectName("smartAllBtn")
+        self.btn_smart_all.setCursor(Qt.PointingHandCursor)
+        self.btn_smart_all.setToolTip("Lire l'état SMART de tous les disques détectés")
+        self.btn_smart_all.setStyleSheet(self.btn_smart.styleSheet())
+
+        # Ajouter le titre et les boutons au layout
         title_button_layout.addWidget(smart_title)
-        title_button_layout.addStretch()  # Espace flexible pour pousser le bouton à droite
+        title_button_layout.addStretch()  # Espace flexible pour pousser les boutons à droite
+        title_button_layout.addWidget(self.btn_smart_all)
         title_button_layout.addWidget(self.btn_smart)
 
         self.smart_info_text = QTextEdit()
@@ -1038,6 +1061,7 @@ class DiskAnalysisWidget(QWidget):
         """Appliquer le style général"""
         # Connecter le bouton SMART
         self.btn_smart.clicked.connect(self.run_smart_check)
+        self.btn_smart_all.clicked.connect(self.run_all_smart_check)
 
     def refresh_disk_list(self):
         """Rafraîchir la liste des disques disponibles"""
@@ -1082,6 +1106,10 @@ class DiskAnalysisWidget(QWidget):
 
     def clear_results(self):
         """Effacer les résultats précédents"""
+        self.stop_live_watch()
+        self.stop_export()
+        self.btn_watch.setEnabled(False)
+        self.live_seed = self.live_large_files = self.live_state = None
         self.scan_results = {}
         self.smart_results = {}
         self.file_types_tree.clear()
@@ -1103,11 +1131,15 @@ class DiskAnalysisWidget(QWidget):
         scan_type_map = {
             "Scan Rapide": "quick",
             "Scan Complet": "full",
+            "Scan Limité (60 s)": "full",
             "Scan par Type": "type",
             "Scan Personnalisé": "custom"
         }
         scan_type = scan_type_map.get(self.scan_type_combo.currentText(), "quick")
 
+        # Budget de temps pour les scans limités (résultats partiels)
+        time_budget = 60 if self.scan_type_combo.currentText() == "Scan Limité (60 s)" else None
+
         # Gérer le scan personnalisé
         if scan_type == "custom":
             folder = QFileDialog.getExistingDirectory(self, "Sélectionner un dossier")
@@ -1124,7 +1156,7 @@ class DiskAnalysisWidget(QWidget):
         self.btn_cancel.setEnabled(True)
 
         # Démarrer le thread d'analyse
-        self.scanner_thread = DiskScannerThread(self.current_disk, scan_type)
+        self.scanner_thread = DiskScannerThread(self.current_disk, scan_type, time_budget)
         self.scanner_thread.progress_updated.connect(self.update_progress)
         self.scanner_thread.scan_completed.connect(self.on_scan_completed)
         self.scanner_thread.error_occurred.connect(self.on_scan_error)
@@ -1144,6 +1176,9 @@ class DiskAnalysisWidget(QWidget):
     def on_scan_completed(self, results):
         """Gérer la fin de l'analyse"""
         self.scan_results = results
+        self.live_seed = self.scanner_thread.live_seed
+        self.live_large_files = self.scanner_thread.live_large_files
+        self.live_state = None
         self.progress_bar.setValue(100)
         self.status_label.setText("Analyse terminée")
 
@@ -1159,6 +1194,7 @@ class DiskAnalysisWidget(QWidget):
         # Réactiver les boutons
         self.btn_scan.setEnabled(True)
         self.btn_cancel.setEnabled(False)
+        self.btn_watch.setEnabled(bool(results.get('root')))
 
         # Cacher la barre de progression après 2 secondes
         QTimer.singleShot(2000, lambda: self.progress_bar.setVisible(False))
@@ -1173,11 +1209,70 @@ class DiskAnalysisWidget(QWidget):
         QTimer.singleShot(2000, lambda: self.progress_bar.setVisible(False))
         self.error_occurred.emit(error_message)
 
+    def toggle_live_watch(self):
+        """Démarrer ou arrêter le suivi en direct du dossier analysé"""
+        if self.watch_thread and self.watch_thread.isRunning():
+            self.stop_live_watch()
+            self.status_label.setText("Suivi en direct arrêté")
+            return
+
+        if not self.scan_results:
+            return
+        root = self.scan_results.get('root', self.current_disk)
+        max_depth = self.scan_results.get('max_depth')
+
+        self.btn_watch.setText("⏹️ Arrêter le suivi")
+        # Partir du scan terminé (ou du suivi précédent) plutôt que de tout relire
+        self.watch_thread = DiskWatchThread(root, max_depth, results=self.scan_results,
+                                            seed=self.live_seed,
+                                            large_files=self.live_large_files,
+                                            state=self.live_state)
+        self.watch_thread.results_updated.connect(self.on_live_results)
+        self.watch_thread.status_changed.connect(self.status_label.setText)
+        self.watch_thread.error_occurred.connect(self.on_live_error)
+        self.watch_thread.finished.connect(lambda: self.btn_watch.setText("👁️ Suivi en direct"))
+        self.watch_thread.start()
+
+    def stop_live_watch(self):
+        """Arrêter le suivi en direct s'il est actif"""
+        if self.watch_thread and self.watch_thread.isRunning():
+            self.watch_thread.cancel()
+            self.watch_thread.wait(2000)
+        if self.watch_thread and not self.watch_thread.isRunning():
+            self.live_state = self.watch_thread.state
+
+    def stop_export(self):
+        """Annuler l'export de l'inventaire s'il est en cours"""
+        if self.export_thread and self.export_thread.isRunning():
+            self.export_thread.cancel()
+            self.export_thread.wait(2000)
+
+    def on_live_results(self, results):
+        """Résultats mis à jour par le suivi en direct"""
+        self.scan_results = results
+        self.update_overview_tab()
+        self.update_file_types_tab()
+        self.update_large_files_tab()
+        self.update_directories_tab()
+        self.update_stats()
+
+    def on_live_error(self, error_message):
+        """Erreur du suivi en direct"""
+        self.status_label.setText(f"Erreur du suivi en direct: {error_message}")
+
     def update_overview_tab(self):
         """Mettre à jour l'onglet de vue d'ensemble"""
         if not self.scan_results:
             return
 
+        # Part de l'espace utilisé expliquée, et signalement d'un scan partiel
+        coverage_text = ""
+        coverage = self.scan_results.get('coverage')
+        if coverage is not None:
+            coverage_text = f"📐 Espace utilisé expliqué : {coverage:.0%}\n"
+        if self.scan_results.get('partial'):
+            coverage_text += "⏱️ RÉSULTATS PARTIELS : budget de temps atteint\n"
+
         # Mettre à jour le texte d'information
         info_text = f"""
 📊 RÉSULTATS DE L'ANALYSE
@@ -1186,7 +1281,7 @@ class DiskAnalysisWidget(QWidget):
 📁 Fichiers analysés : {self.scan_results['total_files']:,}
 💾 Espace total : {self.format_size(self.scan_results['total_size'])}
 🕐 Date de l'analyse : {self.scan_results['scan_time']}
-
+{coverage_text}
 📈 TYPES DE FICHIERS TROUVÉS : {len(self.scan_results['file_types'])}
 💎 GROS FICHIERS : {len(self.scan_results['large_files'])}
 📂 DOSSIERS VOLUMINEUX : {len(self.scan_results['directories'])}
@@ -1205,6 +1300,11 @@ class DiskAnalysisWidget(QWidget):
             percentage = (data['size'] / self.scan_results['total_size']) * 100
             info_text += f"   {ext or '(sans extension)'} : {data['count']} fichiers ({percentage:.1f}%)\n"
 
+        # Évolution depuis l'analyse précédente du même dossier
+        changes = self.scan_results.get('changes')
+        if changes:
+            info_text += f"\n📉 ÉVOLUTION :\n{format_diff(changes, top=5)}\n"
+
         self.overview_info.setText(info_text)
 
         # Créer une visualisation simple
@@ -1514,6 +1614,43 @@ class DiskAnalysisWidget(QWidget):
         self.smart_thread.error_occurred.connect(self.on_smart_error)
         self.smart_thread.start()
 
+    def run_all_smart_check(self):
+        """Lancer le contrôle SMART de tous les disques"""
+        if self.smart_thread and self.smart_thread.isRunning():
+            return
+
+        self.status_label.setText("Contrôle SMART de tous les disques en cours...")
+
+        self.smart_thread = SmartControllerThread(self.current_disk, all_drives=True)
+        self.smart_thread.all_smart_data_received.connect(self.on_all_smart_completed)
+        self.smart_thread.error_occurred.connect(self.on_smart_error)
+        self.smart_thread.start()
+
+    def on_all_smart_completed(self, all_data):
+        """Afficher l'état SMART de tous les disques"""
+        if not all_data:
+            self.smart_info_text.setText("Aucun disque détecté par smartctl")
+            self.status_label.setText("Contrôle SMART terminé")
+            return
+
+        smart_info = "💽 ÉTAT SMART DE TOUS LES DISQUES\n═══════════════════════════════════════\n"
+        for device, smart_data in sorted(all_data.items()):
+            smart_info += f"\n📂 {device}\n"
+            if smart_data.get('error'):
+                smart_info += f"   ❌ Erreur : {smart_data['error']}\n"
+                continue
+            smart_info += (
+                f"   💽 {smart_data.get('disk_model', 'Inconnu')} ({smart_data.get('interface_type', 'Inconnu')})\n"
+                f"   🏥 État : {smart_data.get('health_status', 'Inconnu')}\n"
+                f"   🌡️ Température : {smart_data.get('temperature', 'Inconnue')}\n"
+            )
+            if smart_data.get('percent_used'):
+                smart_info += f"   📊 Usure NVMe : {smart_data['percent_used']}\n"
+            smart_info += f"   ⚠️ Erreurs média : {smart_data.get('media_errors', '0')}\n"
+
+        self.smart_info_text.setText(smart_info)
+        self.status_label.setText(f"Contrôle SMART terminé: {len(all_data)} disque(s)")
+
     def on_smart_completed(self, smart_data):
         """Gérer la fin du contrôle SMART"""
         self.smart_results = smart_data
@@ -1541,6 +1678,13 @@ class DiskAnalysisWidget(QWidget):
         if smart_data.get('data_written_gb'):
             smart_info += f"💾 Données écrites : {smart_data.get('data_written_gb', 'Inconnu')}\n"
 
+        # Projection d'usure d'après l'historique SMART
+        projection = smart_data.get('wear_projection')
+        if projection and projection.get('write_rate_gb_per_day') is not None:
+            smart_info += f"📈 Rythme d'écriture : {projection['write_rate_gb_per_day']:.1f} GB/jour\n"
+            if projection.get('days_remaining') is not None:
+                smart_info += f"⏳ Fin de vie estimée : dans {projection['days_remaining'] / 365:.1f} ans\n"
+
         smart_info += f"""
 ⚠️ ERREURS MÉDIA : {smart_data.get('media_errors', '0')}
 
@@ -1610,26 +1754,77 @@ class DiskAnalysisWidget(QWidget):
         self.error_occurred.emit(f"Erreur SMART: {error_message}")
 
     def export_results(self):
-        """Exporter les résultats de l'analyse"""
+        """Exporter les résultats de l'analyse (ou annuler l'export en cours)"""
+        if self.export_thread and self.export_thread.isRunning():
+            self.stop_export()
+            self.status_label.setText("Export annulé")
+            return
+
         if not self.scan_results:
             self.status_label.setText("Aucun résultat à exporter")
             return
 
-        file_path, _ = QFileDialog.getSaveFileName(
+        # Résumés (petits, écrits directement) puis inventaires complets (écrits en arrière-plan)
+        summary_filters = {
+            "Rapport texte (*.txt)": self.export_to_txt,
+            "Résumé CSV (*.csv)": self.export_to_csv,
+        }
+        inventory_filters = {
+            f"{EXPORT_FORMATS[fmt][0]} (*{EXPORT_FORMATS[fmt][1]})": fmt
+            for fmt in get_available_formats()
+        }
+
+        file_path, selected_filter = QFileDialog.getSaveFileName(
             self, "Exporter les résultats", f"disk_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
-            "Fichiers texte (*.txt);;Fichiers CSV (*.csv)"
+            ";;".join(list(summary_filters) + list(inventory_filters))
         )
 
-        if file_path:
-            try:
-                if file_path.endswith('.csv'):
-                    self.export_to_csv(file_path)
-                else:
-                    self.export_to_txt(file_path)
+        if not file_path:
+            return
+
+        fmt = inventory_filters.get(selected_filter)
+        if fmt is not None:
+            extension = EXPORT_FORMATS[fmt][1]
+            if os.path.splitext(file_path)[1].lower() != extension:
+                file_path = os.path.splitext(file_path)[0] + extension
+            self.start_inventory_export(file_path, fmt)
+            return
+
+        try:
+            export = summary_filters.get(selected_filter)
+            if export is None:
+                export = self.export_to_csv if file_path.endswith('.csv') else self.export_to_txt
+            export(file_path)
+
+            self.status_label.setText(f"Résultats exportés: {os.path.basename(file_path)}")
+        except Exception as e:
+            self.status_label.setText(f"Erreur lors de l'export: {str(e)}")
+
+    def start_inventory_export(self, file_path, fmt):
+        """Exporter tous les fichiers du dossier analysé (thread d'arrière-plan)"""
+        root = self.scan_results.get('root', self.current_disk)
+        max_depth = self.scan_results.get('max_depth')
+
+        self.btn_export.setText("⏹️ Annuler l'export")
+        self.status_label.setText("Export de l'inventaire en cours...")
+        self.export_thread = DiskExportThread(root, file_path, fmt, max_depth)
+        self.export_thread.progress_updated.connect(self.on_export_progress)
+        self.export_thread.export_completed.connect(self.on_export_completed)
+        self.export_thread.error_occurred.connect(self.on_export_error)
+        self.export_thread.finished.connect(lambda: self.btn_export.setText("📄 Exporter"))
+        self.export_thread.start()
+
+    def on_export_progress(self, count, message):
+        """Progression de l'export de l'inventaire"""
+        self.status_label.setText(message)
+
+    def on_export_completed(self, file_path, count):
+        """Fin de l'export de l'inventaire"""
+        self.status_label.setText(f"Inventaire exporté: {count:,} fichiers dans {os.path.basename(file_path)}")
 
-                self.status_label.setText(f"Résultats exportés: {os.path.basename(file_path)}")
-            except Exception as e:
-                self.status_label.setText(f"Erreur lors de l'export: {str(e)}")
+    def on_export_error(self, error_message):
+        """Erreur pendant l'export de l'inventaire"""
+        self.status_label.setText(f"Erreur lors de l'export: {error_message}")
 
     def export_to_txt(self, file_path):
         """Exporter les résultats en format texte"""
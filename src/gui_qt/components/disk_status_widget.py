@@ -4,10 +4,11 @@ DiskStatusWidget - Composant pour afficher l'état intelligent du disque
 
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                               QFrame, QProgressBar, QSizePolicy)
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont
 
 from .system_info_label import SystemInfoLabel
+from core.metrics_sampler import MetricsSubscription
 
 
 class DiskStatusWidget(QWidget):
@@ -158,21 +159,33 @@ class DiskStatusWidget(QWidget):
         layout.addWidget(self.main_container)
 
     def setup_timer(self):
-        """Configurer le timer pour les mises à jour automatiques"""
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.update_disk_info)
-        self.update_timer.start(5000)  # Mise à jour toutes les 5 secondes
+        """S'abonner au bus de métriques (toutes les 5 secondes)"""
+        self.subscription = MetricsSubscription(
+            self, self.on_metrics_updated, [f'disk:{self.disk_path}'], interval=5
+        )
 
     def update_disk_info(self):
-        """Mettre à jour les informations du disque"""
-        try:
-            import psutil
+        """Mettre à jour avec la dernière mesure connue et demander une nouvelle mesure"""
+        if self.subscription.sampler.latest:
+            self.on_metrics_updated(self.subscription.sampler.latest)
+        self.subscription.sampler.request_update()
+
+    def on_metrics_updated(self, metrics):
+        """Appliquer une mesure reçue de l'échantillonneur (aucun appel système ici)"""
+        disk = metrics.get('disks', {}).get(self.disk_path)
+        if disk is None:
+            if metrics.get('error'):
+                self.show_error_state(f"Erreur: {metrics['error']}")
+            return
+        if 'error' in disk:
+            self.show_error_state(f"Erreur: {disk['error']}")
+            return
 
+        try:
             # Obtenir les informations du disque
-            disk_usage = psutil.disk_usage(self.disk_path)
-            total_gb = disk_usage.total / (1024**3)  # Convertir en GB
-            used_gb = disk_usage.used / (1024**3)
-            free_gb = disk_usage.free / (1024**3)
+            total_gb = disk['total'] / (1024**3)  # Convertir en GB
+            used_gb = disk['used'] / (1024**3)
+            free_gb = disk['free'] / (1024**3)
             percent_used = (used_gb / total_gb) * 100
 
             # Mettre à jour les labels
@@ -267,16 +280,18 @@ class DiskStatusWidget(QWidget):
     def set_disk_path(self, path):
         """Définir le chemin du disque à surveiller"""
         self.disk_path = path
-        self.update_disk_info()  # Mise à jour immédiate
+        self.subscription.set_metrics([f'disk:{path}'])  # Mesure immédiate en arrière-plan
+        self.update_disk_info()
 
     def get_disk_info(self):
-        """Obtenir les informations actuelles du disque"""
+        """Obtenir les informations du disque (dernière mesure de l'échantillonneur)"""
         try:
-            import psutil
-            disk_usage = psutil.disk_usage(self.disk_path)
-            total_gb = disk_usage.total / (1024**3)
-            used_gb = disk_usage.used / (1024**3)
-            free_gb = disk_usage.free / (1024**3)
+            disk_usage = self.subscription.sampler.latest.get('disks', {}).get(self.disk_path)
+            if not disk_usage or 'error' in disk_usage:
+                return None
+            total_gb = disk_usage['total'] / (1024**3)
+            used_gb = disk_usage['used'] / (1024**3)
+            free_gb = disk_usage['free'] / (1024**3)
             percent_used = (used_gb / total_gb) * 100
 
             return {
@@ -304,15 +319,15 @@ class DiskStatusWidget(QWidget):
 
     def set_update_interval(self, seconds):
         """Définir l'intervalle de mise à jour en secondes"""
-        self.update_timer.setInterval(seconds * 1000)
+        self.subscription.set_interval(seconds)
 
     def start_updates(self):
         """Démarrer les mises à jour automatiques"""
-        self.update_timer.start()
+        self.subscription.set_enabled(True)
 
     def stop_updates(self):
         """Arrêter les mises à jour automatiques"""
-        self.update_timer.stop()
+        self.subscription.set_enabled(False)
 
     def closeEvent(self, event):
         """Nettoyage lors de la fermeture"""
@@ -10,6 +10,11 @@ import glob
 import subprocess
 from PySide6.QtCore import QThread, Signal
 
+from core.name_filter import NameFilter, walk_filtered
+from core.path_policy import get_cleaning_policy
+from core.size_sampling import SizeEstimate
+from core.quarantine import QuarantineSession, purge_expired, restore_session
+
 
 class FileScannerThread(QThread):
     """Thread pour scanner les fichiers en arrière-plan"""
@@ -21,6 +26,7 @@ class FileScannerThread(QThread):
         self.categories = categories
         self.quick_scan = quick_scan
         self.is_running = True
+        self.details = ""  # Précision de l'estimation de la catégorie en cours
 
     def run(self):
         """Scanner les fichiers réels"""
@@ -33,6 +39,7 @@ class FileScannerThread(QThread):
 
             # Normaliser la catégorie en retirant les 2 premiers caractères (émoticône + espace)
             category_clean = category[2:].strip() if len(category) > 2 else category.strip()
+            self.details = ""
 
             if "Temporaires" in category_clean or "tempora" in category_clean.lower():
                 files_count, size_mb = self.scan_temp_files()
@@ -58,7 +65,7 @@ class FileScannerThread(QThread):
 
             # Émettre le progrès
             progress = int(((i + 1) / total_categories) * 100)
-            self.progress_updated.emit(progress, category, files_count, size_mb, "")
+            self.progress_updated.emit(progress, category, files_count, size_mb, self.details)
 
             # Délai pour ne pas surcharger le système
             self.msleep(500 if self.quick_scan else 1000)
@@ -267,8 +274,8 @@ class FileScannerThread(QThread):
             os.path.join(os.environ.get("LOCALAPPDATA", ""), "Microsoft", "Edge", "User Data", "Default", "Cache"),
         ]
 
-        total_files = 0
-        total_size = 0
+        # Scan rapide: les gros répertoires sont échantillonnés puis extrapolés
+        estimate = self._new_estimate(100)
 
         for browser_path in browser_paths:
             if os.path.exists(browser_path):
@@ -280,42 +287,14 @@ class FileScannerThread(QThread):
                             if os.path.isdir(profile_path):
                                 cache_path = os.path.join(profile_path, "cache2")
                                 if os.path.exists(cache_path):
-                                    for root, dirs, files in os.walk(cache_path):
-                                        if not self.is_running:
-                                            break
-                                        if self.quick_scan and len(files) > 100:  # Limiter pour les scans rapides
-                                            total_files += len(files)
-                                            continue
-                                        for file in files:
-                                            try:
-                                                file_path = os.path.join(root, file)
-                                                if os.path.isfile(file_path):
-                                                    file_size = os.path.getsize(file_path) // (1024 * 1024)
-                                                    total_files += 1
-                                                    total_size += file_size
-                                            except (OSError, PermissionError):
-                                                continue
+                                    estimate.add_tree(cache_path, lambda: self.is_running)
                     else:
                         # Chrome/Edge
-                        for root, dirs, files in os.walk(browser_path):
-                            if not self.is_running:
-                                break
-                            if self.quick_scan and len(files) > 100:  # Limiter pour les scans rapides
-                                total_files += len(files)
-                                continue
-                            for file in files:
-                                try:
-                                    file_path = os.path.join(root, file)
-                                    if os.path.isfile(file_path):
-                                        file_size = os.path.getsize(file_path) // (1024 * 1024)
-                                        total_files += 1
-                                        total_size += file_size
-                                except (OSError, PermissionError):
-                                    continue
+                        estimate.add_tree(browser_path, lambda: self.is_running)
                 except (OSError, PermissionError):
                     continue
 
-        return total_files, total_size
+        return self._estimate_result(estimate)
 
     def scan_windows_updates(self):
         """Scanner les fichiers de mises à jour Windows"""
@@ -325,31 +304,29 @@ class FileScannerThread(QThread):
             os.path.join(os.environ.get("LOCALAPPDATA", ""), "Microsoft", "Windows", "WinStore"),
         ]
 
-        total_files = 0
-        total_size = 0
+        # Scan rapide: les gros répertoires sont échantillonnés puis extrapolés
+        estimate = self._new_estimate(50)
 
         for update_path in update_paths:
             if os.path.exists(update_path):
                 try:
-                    for root, dirs, files in os.walk(update_path):
-                        if not self.is_running:
-                            break
-                        if self.quick_scan and len(files) > 50:  # Limiter pour les scans rapides
-                            total_files += len(files)
-                            continue
-                        for file in files:
-                            try:
-                                file_path = os.path.join(root, file)
-                                if os.path.isfile(file_path):
-                                    file_size = os.path.getsize(file_path) // (1024 * 1024)
-                                    total_files += 1
-                                    total_size += file_size
-                            except (OSError, PermissionError):
-                                continue
+                    estimate.add_tree(update_path, lambda: self.is_running)
                 except (OSError, PermissionError):
                     continue
 
-        return total_files, total_size
+        return self._estimate_result(estimate)
+
+    def _new_estimate(self, threshold):
+        """Estimateur de taille: échantillonnage au-delà de 'threshold' fichiers en scan rapide
+
+        (seulement là où stat() coûte un appel système; sous Windows tout est mesuré)
+        """
+        return SizeEstimate(threshold if self.quick_scan else None)
+
+    def _estimate_result(self, estimate):
+        """(fichiers, taille en MB) d'une estimation, précision dans self.details"""
+        self.details = estimate.describe()
+        return estimate.file_count, estimate.size_mb
 
     def scan_recovery_files(self):
         """Scanner les fichiers de récupération"""
@@ -527,7 +504,9 @@ class FileCleanerThread(QThread):
         self.settings = settings or default_settings
 
         self.is_running = True
-        self.deleted_files = []  # Liste des fichiers supprimés pour restauration potentielle
+        # En mode sécurité, les fichiers sont mis en quarantaine (restaurables) plutôt que supprimés
+        self.quarantine = QuarantineSession() if self.settings.get('safe_mode', True) else None
+        self.path_policy = get_cleaning_policy()
 
     def run(self):
         """Nettoyer les fichiers réels"""
@@ -535,6 +514,11 @@ class FileCleanerThread(QThread):
         total_categories = len(self.categories)
 
         self.progress_updated.emit(0, "Initialisation", 0, 0, "")
+        if self.quarantine is not None:
+            try:
+                purge_expired()
+            except OSError:
+                pass
         self.msleep(1000)  # Pause pour sécurité
 
         for i, category in enumerate(self.categories):
@@ -583,6 +567,8 @@ class FileCleanerThread(QThread):
             # Pause entre les catégories pour sécurité
             self.msleep(1000)
 
+        if self.quarantine is not None:
+            self.quarantine.close()
         self.cleaning_completed.emit(results)
 
     def _format_files_details(self, file_list):
@@ -657,7 +643,7 @@ class FileCleanerThread(QThread):
                 for recycle_path in recycle_paths:
                     if os.path.exists(recycle_path):
                         safe_mode = self.settings.get('safe_mode', True)
-                        deleted, freed = self._clean_directory(recycle_path, "*", safe=safe_mode)
+                        deleted, freed, _ = self._clean_directory(recycle_path, "*", safe=safe_mode)
                         files_deleted += deleted
                         size_freed += freed
         except Exception as e:
@@ -768,64 +754,87 @@ class FileCleanerThread(QThread):
 
         return 0, 0, []  # Erreur: aucun fichier traité
 
-    def _clean_directory_list(self, directories, pattern="*", safe=True):
+    def _clean_directory_list(self, directories, pattern="*", safe=True, exclude=None):
         """Nettoyer une liste de répertoires"""
         total_deleted = 0
         total_freed = 0
         all_files = []
+        name_filter = NameFilter.from_pattern(pattern, exclude)
 
         for directory in directories:
             if not self.is_running:
                 break
             if os.path.exists(directory):
-                deleted, freed, files = self._clean_directory(directory, pattern, safe)
+                deleted, freed, files = self._clean_directory(directory, name_filter, safe)
                 total_deleted += deleted
                 total_freed += freed
                 all_files.extend(files)
 
         return total_deleted, total_freed, all_files
 
-    def _clean_directory(self, directory, pattern="*", safe=True):
-        """Nettoyer un répertoire spécifique"""
+    def _clean_directory(self, directory, pattern="*", safe=True, exclude=None):
+        """Nettoyer un répertoire spécifique
+
+        pattern/exclude: motifs glob (ou listes de motifs) appliqués aux noms
+        pendant le parcours, avant tout stat(); les sous-répertoires qui ne
+        peuvent contenir aucun fichier correspondant ne sont pas parcourus.
+        """
         files_deleted = 0
         size_freed = 0
         deleted_files_list = []
+        name_filter = NameFilter.from_pattern(pattern, exclude)
+
+        # Répertoires vidés (supprimés en fin de parcours, enfants d'abord) et
+        # nombre de sous-répertoires vidés par parent: aucune relecture des répertoires
+        emptied_dirs = []
+        emptied_children = {}
 
         try:
-            for root, dirs, files in os.walk(directory, topdown=False):
+            for root, dirs, entries, others in walk_filtered(directory, name_filter):
                 if not self.is_running:
                     break
 
-                # Supprimer les fichiers
-                for file in files:
+                # Entrées restantes: celles ignorées par le filtre, les fichiers retenus
+                # et les sous-répertoires qui n'ont pas été vidés
+                remaining = others + len(entries) + len(dirs) - emptied_children.pop(root, 0)
+
+                # Verdict de la politique de chemins, une fois par répertoire
+                dir_allowed = not safe or self.path_policy.is_directory_allowed(root)
+
+                # Supprimer les fichiers (déjà filtrés sur leur nom)
+                for entry in entries if dir_allowed else ():
                     if not self.is_running:
                         break
                     try:
-                        file_path = os.path.join(root, file)
-                        if self._should_delete_file(file_path, safe):
-                            size_before = os.path.getsize(file_path)
-                            os.remove(file_path)
+                        file_path = entry.path
+                        file_stat = entry.stat()
+                        if self._should_delete_file(file_path, safe, dir_allowed, file_stat):
+                            size_before = file_stat.st_size
+                            freed = self._remove_file(file_path, size_before)
+                            remaining -= 1
                             files_deleted += 1
-                            size_freed += size_before // (1024 * 1024)  # MB
-                            self.deleted_files.append(file_path)
+                            if freed:
+                                size_freed += size_before // (1024 * 1024)  # MB
                             deleted_files_list.append(file_path)
                     except (OSError, PermissionError) as e:
                         continue  # Ignorer les fichiers verrouillés
 
-                # Supprimer les répertoires vides
-                for dir_name in dirs:
-                    if not self.is_running:
-                        break
-                    try:
-                        dir_path = os.path.join(root, dir_name)
-                        if os.path.isdir(dir_path) and not os.listdir(dir_path):
-                            os.rmdir(dir_path)
-                    except (OSError, PermissionError):
-                        continue
+                # Répertoire vidé (sauf la racine du nettoyage): à supprimer
+                if remaining == 0 and dir_allowed and root != directory:
+                    emptied_dirs.append(root)
+                    parent = os.path.dirname(root)
+                    emptied_children[parent] = emptied_children.get(parent, 0) + 1
 
         except (OSError, PermissionError):
             pass
 
+        # Supprimer les répertoires vides (ordre du parcours: enfants avant parents)
+        for dir_path in emptied_dirs:
+            try:
+                os.rmdir(dir_path)
+            except (OSError, PermissionError):
+                continue
+
         return files_deleted, size_freed, deleted_files_list
 
     def _clean_file_patterns(self, patterns, safe=True):
@@ -844,10 +853,9 @@ class FileCleanerThread(QThread):
                     if self._should_delete_file(file_path, safe):
                         try:
                             size_before = os.path.getsize(file_path)
-                            os.remove(file_path)
+                            if self._remove_file(file_path, size_before):
+                                size_freed += size_before // (1024 * 1024)
                             files_deleted += 1
-                            size_freed += size_before // (1024 * 1024)
-                            self.deleted_files.append(file_path)
                             deleted_files_list.append(file_path)
                         except (OSError, PermissionError):
                             continue
@@ -856,110 +864,68 @@ class FileCleanerThread(QThread):
 
         return files_deleted, size_freed, deleted_files_list
 
-    def _should_delete_file(self, file_path, safe=True):
-        """Vérifier si un fichier peut être supprimé en toute sécurité"""
-        if not os.path.exists(file_path):
+    def _remove_file(self, file_path, size=0):
+        """Supprimer un fichier, ou le mettre en quarantaine en mode sécurité
+
+        Retourne True si l'espace est réellement libéré, False si le fichier
+        est seulement placé en quarantaine (l'espace reste occupé jusqu'à la
+        purge). Lève OSError si le fichier n'a pas pu être traité.
+        """
+        if self.quarantine is not None:
+            self.quarantine.move(file_path, size)
             return False
+        os.remove(file_path)
+        return True
+
+    def _should_delete_file(self, file_path, safe=True, dir_allowed=None, file_stat=None):
+        """Vérifier si un fichier peut être supprimé en toute sécurité
+
+        dir_allowed: verdict déjà connu de la politique de chemins pour le
+        répertoire du fichier (évite de le recalculer dans les boucles)
+        file_stat: résultat de stat() déjà obtenu pendant le parcours
+        """
+        if file_stat is None:
+            try:
+                file_stat = os.stat(file_path)
+            except OSError:
+                return False
 
         # Vérifications de sécurité
         if safe:
-            # Protection améliorée des répertoires système critiques
-            if self._is_system_critical_path(file_path):
+            # Répertoires système critiques et ProgramData (verdict du répertoire, mémorisé)
+            if dir_allowed is None:
+                dir_allowed = self.path_policy.is_allowed(file_path)
+            if not dir_allowed:
                 return False
 
-            # Autoriser les répertoires de nettoyage utilisateur
-            if self._is_user_cleanable_path(file_path):
-                pass  # Continuer les autres vérifications
-            else:
-                # Pour ProgramData, vérifications plus strictes
-                if self._is_restricted_programdata_path(file_path):
-                    return False
-
             # Ne supprimer que les fichiers selon l'âge minimum configuré
-            try:
-                file_age = (time.time() - os.path.getmtime(file_path)) / (24 * 3600)  # jours
-                min_age = self.settings.get('min_file_age_days', 30)
-                if file_age < min_age:
-                    return False
-            except OSError:
+            file_age = (time.time() - file_stat.st_mtime) / (24 * 3600)  # jours
+            min_age = self.settings.get('min_file_age_days', 30)
+            if file_age < min_age:
                 return False
 
             # Ne supprimer que les fichiers selon la taille maximum configurée
-            try:
-                file_size = os.path.getsize(file_path) / (1024 * 1024)  # MB
-                max_size = self.settings.get('max_file_size_mb', 100)
-                if file_size > max_size:
-                    return False
-            except OSError:
+            file_size = file_stat.st_size / (1024 * 1024)  # MB
+            max_size = self.settings.get('max_file_size_mb', 100)
+            if file_size > max_size:
                 return False
 
         return True
 
-    def _is_system_critical_path(self, file_path):
-        """Vérifier si le chemin est un répertoire système critique"""
-        file_path_lower = file_path.lower()
-
-        # Répertoires système absolument critiques
-        critical_paths = [
-            r"\windows",           # C:\Windows
-            r"\windows\system32",  # C:\Windows\System32
-            r"\windows\syswow64",  # C:\Windows\SysWOW64
-            r"\program files",     # C:\Program Files
-            r"\program files (x86)", # C:\Program Files (x86)
-        ]
-
-        for critical_path in critical_paths:
-            if file_path_lower.find(critical_path) == 1:  # Après la lettre du lecteur
-                return True
-
-        return False
-
-    def _is_user_cleanable_path(self, file_path):
-        """Vérifier si le chemin est dans les répertoires utilisateur autorisés pour le nettoyage"""
-        file_path_lower = file_path.lower()
-
-        # Chemins utilisateur autorisés pour le nettoyage
-        user_cleanable_patterns = [
-            r"\users\*\appdata\local\temp",      # C:\Users\username\AppData\Local\Temp
-            r"\users\*\appdata\local\microsoft\windows\inetcache",  # Cache navigateur
-            r"\users\*\appdata\local\microsoft\windows\explorer",   # Explorer cache
-            r"\users\*\appdata\roaming\microsoft\windows\recent",  # Fichiers récents
-            r"\users\*\appdata\local\google\chrome",    # Chrome cache
-            r"\users\*\appdata\local\microsoft\edge",    # Edge cache
-            r"\users\*\appdata\roaming\mozilla\firefox", # Firefox cache
-        ]
-
-        for pattern in user_cleanable_patterns:
-            # Remplacer '*' par le nom d'utilisateur actuel
-            username = os.path.basename(os.path.expanduser("~"))
-            actual_pattern = pattern.replace("*", username).lower()
-            if actual_pattern in file_path_lower:
-                return True
-
-        return False
-
-    def _is_restricted_programdata_path(self, file_path):
-        """Vérifier si le chemin ProgramData est restreint"""
-        file_path_lower = file_path.lower()
-
-        # ProgramData : autoriser seulement certains sous-répertoires de nettoyage
-        allowed_programdata_patterns = [
-            r"\programdata\microsoft\windows\wer",       # Windows Error Reporting
-            r"\programdata\microsoft\windows\start menu", # Menu démarrer vieux fichiers
-        ]
+    def stop(self):
+        """Arrêter le nettoyage"""
+        self.is_running = False
 
-        # Si c'est dans ProgramData
-        if r"\programdata" in file_path_lower:
-            # Vérifier si c'est un chemin autorisé
-            for allowed_pattern in allowed_programdata_patterns:
-                if allowed_pattern in file_path_lower:
-                    return False  # Autorisé
 
-            # Autres chemins ProgramData sont interdits
-            return True
+class QuarantineRestoreThread(QThread):
+    """Thread pour restaurer une session de quarantaine en arrière-plan"""
+    restore_completed = Signal(int, int)  # fichiers restaurés, échecs
 
-        return False
+    def __init__(self, session_id):
+        super().__init__()
+        self.session_id = session_id
 
-    def stop(self):
-        """Arrêter le nettoyage"""
-        self.is_running = False
\ No newline at end of file
+    def run(self):
+        """Remettre les fichiers de la session à leur emplacement d'origine"""
+        restored, failed = restore_session(self.session_id)
+        self.restore_completed.emit(restored, failed)
@@ -16,8 +16,9 @@ from PySide6.QtCore import Qt, Signal, QTimer, QThread, QSettings
 from PySide6.QtGui import QFont, QPixmap, QPainter, QColor
 
 from .nav_button import NavButton
-from .file_scanner_threads import FileScannerThread, FileCleanerThread
+from .file_scanner_threads import FileScannerThread, FileCleanerThread, QuarantineRestoreThread
 from .settings_dialog import SettingsDialog
+from core.quarantine import QUARANTINE_RETENTION_DAYS
 
 
 
@@ -38,6 +39,8 @@ class ModernCleanerWidget(QWidget):
         self.is_cleaning = False
         self.scanner_thread = None
         self.cleaner_thread = None
+        self.restore_thread = None
+        self.last_quarantine_session = None
 
         # QSettings pour les paramètres (même organisation que settings_dialog)
         self.qsettings = QSettings("NettoyeurRapide", "CleaningSettings")
@@ -135,6 +138,12 @@ class ModernCleanerWidget(QWidget):
         self.btn_clean.set_accent()
         self.btn_clean.clicked.connect(self.start_cleaning)
 
+        self.btn_restore = NavButton("↩️ Restaurer", self)
+        self.btn_restore.set_secondary()
+        self.btn_restore.clicked.connect(self.restore_last_cleaning)
+        self.btn_restore.setToolTip("Restaurer les fichiers mis en quarantaine par le dernier nettoyage")
+        self.btn_restore.setEnabled(False)
+
         self.btn_settings = NavButton("⚙️", self)
         self.btn_settings.set_secondary()
         self.btn_settings.set_size("carre_xl")
@@ -151,6 +160,7 @@ class ModernCleanerWidget(QWidget):
         toolbar_layout.addWidget(self.btn_select_all)
         toolbar_layout.addWidget(self.btn_deselect_all)
         toolbar_layout.addWidget(self.btn_clean)
+        toolbar_layout.addWidget(self.btn_restore)
         toolbar_layout.addWidget(self.btn_settings)
 
         parent_layout.addWidget(toolbar_frame)
@@ -649,13 +659,16 @@ class ModernCleanerWidget(QWidget):
         self.scanner_thread.scan_completed.connect(self.on_scan_completed)
         self.scanner_thread.start()
 
-    def on_scan_progress(self, progress, category, files_count, size_mb):
+    def on_scan_progress(self, progress, category, files_count, size_mb, details=""):
         """Mettre à jour la progression du scan"""
         self.update_progress_with_text(progress)
 
         if files_count > 0:
             size_formatted = self._format_size(size_mb)
-            self.results_text.append(f"✓ {category}: {files_count} fichiers, {size_formatted}")
+            message = f"✓ {category}: {files_count} fichiers, {size_formatted}"
+            if details:
+                message += f"\n   📊 {details}"
+            self.results_text.append(message)
         else:
             # Afficher même les catégories vides pendant l'analyse
             self.results_text.append(f"ℹ️ {category}: 0 fichier trouvé (catégorie vide)")
@@ -763,7 +776,11 @@ class ModernCleanerWidget(QWidget):
 
         if files_deleted > 0:
             size_formatted = self._format_size(size_freed)
-            message = f"✅ {category}: {files_deleted} fichiers supprimés, {size_formatted} libérés"
+            if self.settings['safe_mode']:
+                message = (f"✅ {category}: {files_deleted} fichiers supprimés ou placés en quarantaine, "
+                           f"{size_formatted} libérés")
+            else:
+                message = f"✅ {category}: {files_deleted} fichiers supprimés, {size_formatted} libérés"
             if files_details:
                 message += f"\n   📄 {files_details}"
             self.results_text.append(message)
@@ -797,11 +814,25 @@ class ModernCleanerWidget(QWidget):
         self.results_text.append(f"📊 Résumé du nettoyage:")
         self.results_text.append(f"   • Fichiers supprimés: {total_files}")
         self.results_text.append(f"   • Espace libéré: {size_formatted}")
+
+        # En mode sécurité, l'espace des fichiers en quarantaine n'est libéré qu'à la purge
+        quarantine = self.cleaner_thread.quarantine if self.cleaner_thread else None
+        if quarantine is not None and quarantine.files:
+            quarantined = self._format_size(quarantine.size // (1024 * 1024))
+            self.results_text.append(f"   • Placé en quarantaine: {quarantined} ({quarantine.files} fichiers)")
+        if quarantine is not None and quarantine.skipped:
+            self.results_text.append(f"   • Fichiers ignorés (quarantaine impossible sur leur volume): "
+                                     f"{quarantine.skipped}")
         self.results_text.append(f"   • Catégories traitées: {len(results)}")
 
         if self.settings['safe_mode']:
             self.results_text.append(f"\n⚠️  Le nettoyage a été effectué en mode sécurité")
             self.results_text.append(f"   Certains fichiers ont été préservés pour votre sécurité")
+            if quarantine is not None and quarantine.files:
+                self.last_quarantine_session = quarantine.session_id
+                self.btn_restore.setEnabled(True)
+                self.results_text.append(f"   {quarantine.files} fichiers placés en quarantaine, restaurables "
+                                         f"pendant {QUARANTINE_RETENTION_DAYS} jours (bouton Restaurer)")
         else:
             self.results_text.append(f"\n🚨 Le nettoyage a été effectué en mode réel")
             self.results_text.append(f"   Les fichiers supprimés ne peuvent pas être restaurés")
@@ -818,6 +849,29 @@ class ModernCleanerWidget(QWidget):
         # Cacher la barre de progression après 3 secondes
         QTimer.singleShot(3000, lambda: self.progress_bar.setVisible(False))
 
+    def restore_last_cleaning(self):
+        """Restaurer les fichiers mis en quarantaine par le dernier nettoyage"""
+        if not self.last_quarantine_session or self.is_cleaning:
+            return
+        if self.restore_thread is not None and self.restore_thread.isRunning():
+            return
+
+        self.btn_restore.setEnabled(False)
+        self.status_label.setText("Restauration en cours...")
+        self.restore_thread = QuarantineRestoreThread(self.last_quarantine_session)
+        self.restore_thread.restore_completed.connect(self.on_restore_completed)
+        self.restore_thread.start()
+
+    def on_restore_completed(self, restored, failed):
+        """Appelé quand la restauration est terminée"""
+        self.results_text.append(f"\n↩️ Restauration: {restored} fichiers remis en place")
+        if failed:
+            self.results_text.append(f"   ⚠️  {failed} fichiers laissés en quarantaine (emplacement occupé ou inaccessible)")
+            self.btn_restore.setEnabled(True)
+        else:
+            self.last_quarantine_session = None
+        self.status_label.setText("Restauration terminée")
+
     def toggle_safe_mode(self):
         """Basculer entre mode sécurité et mode réel"""
         self.settings['safe_mode'] = not self.settings['safe_mode']
@@ -2,9 +2,9 @@
 # -*- coding: utf-8 -*-
 
 """
-Gestion des programmes au démarrage (Windows)
-- Lecture Run / Run-
-- Lecture dossiers Startup
+Gestion des programmes au démarrage
+- Lecture Run / Run- et dossiers Startup (Windows)
+- Lecture autostart XDG et services systemd utilisateur (Linux)
 - Activation / désactivation réelle (registre + fichiers)
 - Suppression avec sauvegarde JSON
 - Export JSON
@@ -13,8 +13,7 @@ Gestion des programmes au démarrage (Windows)
 
 import os
 import json
-import winreg
-import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
 from PySide6.QtWidgets import (
@@ -26,6 +25,9 @@ from .modern_header import ModernHeader
 from PySide6.QtCore import Qt, QTimer, Signal, QThread, QEvent
 from PySide6.QtGui import QBrush, QColor
 
+from core.publisher_info import get_publisher_cache
+from core.startup_sources import get_default_sources, collect_items, find_source
+
 # Plus besoin du delegate - le CSS gère le hover et la sélection
 
 # =====================================================================
@@ -33,12 +35,14 @@ from PySide6.QtGui import QBrush, QColor
 # =====================================================================
 
 class StartupScannerThread(QThread):
+    """Interroge toutes les sources de démarrage en parallèle et fusionne leurs éléments"""
     progress = Signal(int, str)
     completed = Signal(list)
     error = Signal(str)
 
-    def __init__(self):
+    def __init__(self, sources=None):
         super().__init__()
+        self.sources = sources if sources is not None else get_default_sources()
 
     def run(self):
         try:
@@ -52,266 +56,47 @@ class StartupScannerThread(QThread):
 
     def scan_startup_items(self):
         """Scan complet des programmes au démarrage."""
-        items = []
-
-        # Registres : Run (activé) / Run- (désactivé)
-        registry_defs = [
-            # HKCU Run / Run-
-            (winreg.HKEY_CURRENT_USER,
-             r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run",
-             "HKCU", True,
-             r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run-"),
-            (winreg.HKEY_CURRENT_USER,
-             r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run-",
-             "HKCU", False,
-             r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run"),
-
-            # HKLM Run / Run-
-            (winreg.HKEY_LOCAL_MACHINE,
-             r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run",
-             "HKLM", True,
-             r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run-"),
-            (winreg.HKEY_LOCAL_MACHINE,
-             r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run-",
-             "HKLM", False,
-             r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run"),
-
-            # HKCU RunOnce (exécuté une seule fois au prochain démarrage)
-            (winreg.HKEY_CURRENT_USER,
-             r"SOFTWARE\Microsoft\Windows\CurrentVersion\RunOnce",
-             "HKCU", True,
-             None),  # RunOnce n'a pas d'équivalent Run-
-
-            # HKLM RunOnce (exécuté une seule fois au prochain démarrage)
-            (winreg.HKEY_LOCAL_MACHINE,
-             r"SOFTWARE\Microsoft\Windows\CurrentVersion\RunOnce",
-             "HKLM", True,
-             None),
-
-            # Wow6432Node (applications 32-bit sur système 64-bit)
-            (winreg.HKEY_LOCAL_MACHINE,
-             r"SOFTWARE\Wow6432Node\Microsoft\Windows\CurrentVersion\Run",
-             "HKLM32", True,
-             r"SOFTWARE\Wow6432Node\Microsoft\Windows\CurrentVersion\Run-"),
-            (winreg.HKEY_LOCAL_MACHINE,
-             r"SOFTWARE\Wow6432Node\Microsoft\Windows\CurrentVersion\Run-",
-             "HKLM32", False,
-             r"SOFTWARE\Wow6432Node\Microsoft\Windows\CurrentVersion\Run"),
-
-            # HKCU Policies (programmes imposés par les stratégies)
-            (winreg.HKEY_CURRENT_USER,
-             r"SOFTWARE\Microsoft\Windows\CurrentVersion\Policies\Explorer\Run",
-             "HKCU Policy", True,
-             None),
-
-            # HKLM Policies (programmes imposés par les stratégies système)
-            (winreg.HKEY_LOCAL_MACHINE,
-             r"SOFTWARE\Microsoft\Windows\CurrentVersion\Policies\Explorer\Run",
-             "HKLM Policy", True,
-             None),
-        ]
-
-        # Dossiers Startup
-        user_startup = os.path.expanduser(
-            "~/AppData/Roaming/Microsoft/Windows/Start Menu/Programs/Startup"
-        )
-        sys_startup = os.path.join(
-            os.environ.get("PROGRAMDATA", "C:/ProgramData"),
-            "Microsoft/Windows/Start Menu/Programs/Startup"
-        )
-
-        folder_defs = [
-            (user_startup, False, "Startup utilisateur"),
-            (sys_startup, True, "Startup système"),
-        ]
-
-        total_steps = len(registry_defs) + len(folder_defs)
-        step = 0
-
-        # --- Lecture registre ---
-        for hive, path, hive_label, enabled, opposite_path in registry_defs:
-            step += 1
-            self.progress.emit(
-                int(step / total_steps * 100),
-                f"Lecture registre {hive_label} ({'Run' if enabled else 'Run-'})..."
-            )
-            try:
-                with winreg.OpenKey(hive, path) as key:
-                    count = winreg.QueryInfoKey(key)[1]
-                    for i in range(count):
-                        name, value, _ = winreg.EnumValue(key, i)
-                        if not value:
-                            continue
-
-                        # Filtrer les éléments inutiles
-                        name_lower = name.lower()
-                        value_lower = value.lower()
-
-                        # Ignorer les éléments liés au bureau
-                        if ('desktop' in name_lower or 'desktop' in value_lower or
-                            'bureau' in name_lower or 'bureau' in value_lower):
-                            continue
-
-                        # Ignorer les éléments vides ou système inutiles
-                        if name_lower.strip() == '' or value_lower.strip() == '':
-                            continue
-
-                        # Vérifier l'état réel du programme
-                        real_enabled = self._check_real_program_status(name, value, enabled)
-
-                        item_data = {
-                            "name": name,
-                            "path": value,
-                            "enabled": real_enabled,
-                            "source": f"{hive_label} {os.path.basename(path)}",
-                            "source_type": "registry",
-                            "hive": hive_label,
-                            "reg_path": path,
-                        }
-                        # Ajouter reg_opposite_path seulement s'il existe (pas pour RunOnce ou Policies)
-                        if opposite_path:
-                            item_data["reg_opposite_path"] = opposite_path
-                        items.append(item_data)
-            except OSError:
-                # clé absente => ignorer
-                continue
-
-        # --- Lecture dossiers Startup ---
-        for folder, is_system, label in folder_defs:
-            step += 1
-            self.progress.emit(
-                int(step / total_steps * 100),
-                f"Lecture {label}..."
-            )
-            if not os.path.isdir(folder):
-                continue
-
-            for fname in os.listdir(folder):
-                full = os.path.join(folder, fname)
-                if not os.path.isfile(full):
-                    continue
-
-                # Filtrer les éléments inutiles
-                fname_lower = fname.lower()
-                if ('desktop' in fname_lower or 'bureau' in fname_lower):
-                    continue
-
-                # Gestion du .disabled
-                if fname.endswith(".disabled"):
-                    enabled = False
-                    base_name = fname[:-9]  # remove ".disabled"
-                else:
-                    enabled = True
-                    base_name = fname
-
-                items.append({
-                    "name": os.path.splitext(base_name)[0],
-                    "path": full,
-                    "enabled": enabled,
-                    "source": label,
-                    "source_type": "folder",
-                    "folder_path": folder,
-                    "is_system": is_system,
-                })
+        items, errors = collect_items(self.sources, progress=self.progress.emit)
 
+        # Échec de toutes les sources: signaler l'erreur au lieu d'une liste vide
+        if errors and len(errors) == len(self.sources):
+            raise RuntimeError("; ".join(str(e) for e in errors.values()))
         return items
 
-    def _check_real_program_status(self, name: str, path: str, registry_enabled: bool) -> bool:
-        """Vérifier l'état réel d'un programme au démarrage"""
-        try:
-            # Si le registre dit déjà désactivé, c'est probablement correct
-            if not registry_enabled:
-                return False
-
-            # Vérifications spécifiques pour certains programmes connus
-            name_lower = name.lower()
-            path_lower = path.lower()
-
-            # OneDrive : vérification spéciale
-            if 'onedrive' in name_lower or 'onedrive' in path_lower:
-                return self._check_onedrive_status()
 
-            # Microsoft Teams : vérification spéciale
-            if 'teams' in name_lower or 'teams' in path_lower:
-                return self._check_teams_status()
-
-            # Pour les autres programmes, vérification basique
-            return self._check_generic_startup_status(path)
+# =====================================================================
+#  THREAD : recherche des éditeurs
+# =====================================================================
 
-        except Exception:
-            # En cas d'erreur, revenir à l'état du registre
-            return registry_enabled
+class PublisherLookupThread(QThread):
+    """Lit l'éditeur des exécutables en parallèle (ressources de version PE, avec cache)
 
-    def _check_onedrive_status(self) -> bool:
-        """Vérifier si OneDrive est réellement activé au démarrage"""
-        try:
-            # Vérifier la clé spécifique de démarrage approuvé
-            approved_key_path = r"SOFTWARE\Microsoft\Windows\CurrentVersion\Explorer\StartupApproved\Run"
+    Chaque résultat est émis dès qu'il est connu pour remplir la ligne
+    correspondante sans attendre les autres.
+    """
+    found = Signal(int, int, str)  # génération, ligne, éditeur ("" si inconnu)
 
-            for hive in [winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE]:
-                try:
-                    with winreg.OpenKey(hive, approved_key_path) as key:
-                        # Chercher OneDrive dans cette clé
-                        count = winreg.QueryInfoKey(key)[1]
-                        for i in range(count):
-                            name, value, _ = winreg.EnumValue(key, i)
-                            if 'onedrive' in name.lower():
-                                # La valeur est généralement un binaire indicant l'état
-                                # Si présent ici, c'est généralement désactivé (0x02 = désactivé)
-                                return False
-                except OSError:
-                    continue
-
-            # Si pas trouvé dans StartupApproved, vérifier s'il est dans Run normal
-            run_key_path = r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run"
-            for hive in [winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE]:
-                try:
-                    with winreg.OpenKey(hive, run_key_path) as key:
-                        count = winreg.QueryInfoKey(key)[1]
-                        for i in range(count):
-                            name, value, _ = winreg.EnumValue(key, i)
-                            if 'onedrive' in name.lower():
-                                # Si trouvé dans Run mais pas dans StartupApproved = activé
-                                return True
-                except OSError:
-                    continue
-
-            return False
-
-        except Exception:
-            return False  # Par défaut, considérer comme désactivé si détection échoue
-
-    def _check_teams_status(self) -> bool:
-        """Vérifier si Microsoft Teams est réellement activé au démarrage"""
-        try:
-            # Même logique que OneDrive
-            approved_key_path = r"SOFTWARE\Microsoft\Windows\CurrentVersion\Explorer\StartupApproved\Run"
+    def __init__(self, generation, lookups, max_workers=4, parent=None):
+        super().__init__(parent)
+        self.generation = generation
+        self.lookups = lookups  # liste de (ligne, ligne de commande)
+        self.max_workers = max_workers
 
-            for hive in [winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE]:
+    def run(self):
+        cache = get_publisher_cache()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(cache.lookup, command): row for row, command in self.lookups}
+            for future in as_completed(futures):
+                if self.isInterruptionRequested():
+                    for pending in futures:
+                        pending.cancel()
+                    break
                 try:
-                    with winreg.OpenKey(hive, approved_key_path) as key:
-                        count = winreg.QueryInfoKey(key)[1]
-                        for i in range(count):
-                            name, value, _ = winreg.EnumValue(key, i)
-                            if 'teams' in name.lower():
-                                return False
-                except OSError:
-                    continue
-
-            return True
-
-        except Exception:
-            return True
-
-    def _check_generic_startup_status(self, path: str) -> bool:
-        """Vérification générique pour les programmes"""
-        try:
-            # Vérifier si le fichier existe et n'est pas désactivé
-            if os.path.isfile(path) and not path.endswith('.disabled'):
-                return True
-            return False
-        except Exception:
-            return True
+                    company = future.result() or ""
+                except Exception:
+                    company = ""
+                self.found.emit(self.generation, futures[future], company)
+        cache.save()
 
 
 # =====================================================================
@@ -320,7 +105,7 @@ class StartupScannerThread(QThread):
 
 class StartupWidget(QWidget):
     """
-    Widget de gestion des programmes au démarrage (Windows)
+    Widget de gestion des programmes au démarrage (Windows et Linux)
     """
 
     status = Signal(str, str)  # message, type ('success', 'error', 'info', ...)
@@ -328,7 +113,10 @@ class StartupWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.items = []   # liste de dict
+        self.sources = get_default_sources()
         self.thread = None
+        self.publisher_thread = None
+        self._publisher_generation = 0
         self.backup_path = os.path.join(
             os.path.expanduser("~"), "startup_manager_backup.json"
         )
@@ -538,8 +326,8 @@ class StartupWidget(QWidget):
     #  CHARGEMENT / PROGRESSION
     # =================================================================
 
-    def get_creator_info(self, program_name: str, program_path: str) -> str:
-        """Détecte le créateur/éditeur d'un programme"""
+    def _guess_creator(self, program_name: str, program_path: str):
+        """Éditeur déduit du nom ou du chemin (mots-clés connus), sinon None"""
         program_name_lower = program_name.lower()
         program_path_lower = program_path.lower()
 
@@ -680,21 +468,11 @@ class StartupWidget(QWidget):
         if any(keyword in program_name_lower or keyword in program_path_lower for keyword in hp_keywords):
             return "HP"
 
-        
-        # Try to get from file properties
-        try:
-            if os.path.isfile(program_path):
-                # Look for company name in executable properties
-                import subprocess
-                result = subprocess.run(['powershell', '-Command',
-                    f'(Get-Item "{program_path}").VersionInfo.CompanyName'],
-                    capture_output=True, text=True, timeout=5)
-                if result.returncode == 0 and result.stdout.strip():
-                    company = result.stdout.strip()
-                    if company and company != '':
-                        return company
-        except Exception:
-            pass
+        return None
+
+    def _creator_from_path(self, program_path: str) -> str:
+        """Éditeur déduit du dossier d'installation, sinon 'Inconnu'"""
+        program_path_lower = program_path.lower()
 
         # Try to extract from path
         if 'program files' in program_path_lower:
@@ -718,7 +496,7 @@ class StartupWidget(QWidget):
         self.progress_bar.setValue(0)
         self.progress_label.setText("Analyse en cours...")
 
-        self.thread = StartupScannerThread()
+        self.thread = StartupScannerThread(self.sources)
         self.thread.progress.connect(self.update_progress)
         self.thread.completed.connect(self.on_items_loaded)
         self.thread.error.connect(self.on_error)
@@ -746,6 +524,9 @@ class StartupWidget(QWidget):
     def populate_table(self):
         self.table.setRowCount(len(self.items))
 
+        # Les éditeurs inconnus sont recherchés en arrière-plan
+        publisher_lookups = []
+
         for row, item in enumerate(self.items):
             # --- NOM ---
             name_item = QTableWidgetItem(item["name"])
@@ -756,7 +537,10 @@ class StartupWidget(QWidget):
             self.table.setItem(row, 0, name_item)
 
             # --- CRÉATEUR ---
-            creator = self.get_creator_info(item["name"], item["path"])
+            creator = self._guess_creator(item["name"], item["path"])
+            if not creator:
+                creator = "Recherche..."
+                publisher_lookups.append((row, item["path"]))
             creator_item = QTableWidgetItem(creator)
             creator_item.setForeground(QBrush(QColor("#000000")))
             self.table.setItem(row, 1, creator_item)
@@ -774,7 +558,7 @@ class StartupWidget(QWidget):
 
             # --- BOUTON ACTIVER / DÉSACTIVER ---
             # Vérifier si l'élément peut être désactivé
-            can_toggle = item.get("source_type") == "registry" and "reg_opposite_path" in item
+            can_toggle = item.get("can_toggle", False)
 
             if can_toggle:
                 btn_toggle = QPushButton("Marche" if item["enabled"] else "Stop")
@@ -853,6 +637,42 @@ class StartupWidget(QWidget):
         # réapplique le filtre courant
         self.apply_filter(self.search_edit.text())
 
+        self.start_publisher_lookup(publisher_lookups)
+
+    def start_publisher_lookup(self, lookups):
+        """Lancer la recherche des éditeurs (les résultats précédents sont ignorés)"""
+        self._publisher_generation += 1
+        if self.publisher_thread and self.publisher_thread.isRunning():
+            self.publisher_thread.requestInterruption()
+        if not lookups:
+            return
+
+        # Le parent garde le thread en vie jusqu'à sa fin, même s'il est remplacé
+        thread = PublisherLookupThread(self._publisher_generation, lookups, parent=self)
+        thread.found.connect(self.on_publisher_found)
+        thread.finished.connect(lambda t=thread: self._on_publisher_thread_finished(t))
+        self.publisher_thread = thread
+        thread.start()
+
+    def _on_publisher_thread_finished(self, thread):
+        """Libérer un thread de recherche terminé"""
+        if self.publisher_thread is thread:
+            self.publisher_thread = None
+        thread.deleteLater()
+
+    def on_publisher_found(self, generation, row, company):
+        """Remplir la colonne Créateur d'une ligne"""
+        if generation != self._publisher_generation or row >= len(self.items):
+            return
+        creator_item = self.table.item(row, 1)
+        if creator_item is None:
+            return
+        creator_item.setText(company or self._creator_from_path(self.items[row]["path"]))
+
+        # Le filtre peut porter sur le créateur
+        if self.search_edit.text():
+            self.apply_filter(self.search_edit.text())
+
     # =================================================================
     #  STYLES BOUTONS
     # =================================================================
@@ -916,12 +736,7 @@ class StartupWidget(QWidget):
         item = self.items[row]
 
         try:
-            if item.get("source_type") == "registry":
-                self._toggle_registry_item(item)
-            elif item.get("source_type") == "folder":
-                self._toggle_folder_item(item)
-            else:
-                raise RuntimeError("Type de source inconnu")
+            find_source(self.sources, item).set_enabled(item, not item["enabled"])
 
             # Mise à jour UI - récupérer le bouton depuis le conteneur
             btn_container = self.table.cellWidget(row, 3)
@@ -939,73 +754,6 @@ class StartupWidget(QWidget):
         except Exception as e:
             self.status.emit(f"Erreur lors du changement d'état: {e}", "error")
 
-    # ---------- registre ----------
-
-    def _get_hive_handle(self, hive_label: str):
-        if hive_label == "HKCU":
-            return winreg.HKEY_CURRENT_USER
-        if hive_label == "HKLM":
-            return winreg.HKEY_LOCAL_MACHINE
-        raise ValueError(f"Hive inconnu: {hive_label}")
-
-    def _toggle_registry_item(self, item: dict):
-        hive = self._get_hive_handle(item["hive"])
-        src_path = item["reg_path"]
-        name = item["name"]
-
-        # Vérifier si l'élément peut être désactivé (a un opposite_path)
-        if "reg_opposite_path" not in item:
-            raise RuntimeError(f"Impossible de désactiver {name}: RunOnce et Policies ne peuvent pas être désactivés")
-
-        dst_path = item["reg_opposite_path"]
-
-        # Lecture valeur depuis src
-        with winreg.OpenKey(hive, src_path, 0, winreg.KEY_READ | winreg.KEY_WRITE) as src_key:
-            value_data, value_type = winreg.QueryValueEx(src_key, name)
-
-        # Écriture dans la clé opposée (création si besoin)
-        with winreg.CreateKey(hive, dst_path) as dst_key:
-            winreg.SetValueEx(dst_key, name, 0, value_type, value_data)
-
-        # Suppression dans la clé d'origine
-        with winreg.OpenKey(hive, src_path, 0, winreg.KEY_SET_VALUE) as src_key:
-            winreg.DeleteValue(src_key, name)
-
-        # Mise à jour de la structure
-        item["enabled"] = not item["enabled"]
-        item["reg_path"], item["reg_opposite_path"] = (
-            item["reg_opposite_path"],
-            item["reg_path"],
-        )
-        item["source"] = f"{item['hive']} {os.path.basename(item['reg_path'])}"
-
-    # ---------- dossier Startup ----------
-
-    def _toggle_folder_item(self, item: dict):
-        current_path = item["path"]
-        if current_path.endswith(".disabled"):
-            # activer : enlever le suffixe
-            new_path = current_path[:-9]
-        else:
-            # désactiver : ajouter le suffixe
-            new_path = current_path + ".disabled"
-
-        if os.path.exists(current_path):
-            os.rename(current_path, new_path)
-        else:
-            # si le fichier n'existe plus, on marque simplement comme désactivé
-            new_path = current_path
-
-        item["path"] = new_path
-        item["enabled"] = not item["enabled"]
-
-        # mettre à jour l'affichage du chemin
-        # (on recherche la ligne correspondant à cet item)
-        for row in range(self.table.rowCount()):
-            if self.table.item(row, 0).text() == item["name"]:
-                # Le chemin n'est plus affiché dans la table, donc pas besoin de mettre à jour
-                break
-
     # =================================================================
     #  SUPPRESSION AVEC BACKUP
     # =================================================================
@@ -1031,10 +779,7 @@ class StartupWidget(QWidget):
             # Backup JSON
             self._backup_action(item, "delete")
 
-            if item.get("source_type") == "registry":
-                self._delete_registry_item(item)
-            elif item.get("source_type") == "folder":
-                self._delete_folder_item(item)
+            find_source(self.sources, item).delete(item)
 
             # Supprimer de la liste et recharger la table
             del self.items[row]
@@ -1045,26 +790,6 @@ class StartupWidget(QWidget):
         except Exception as e:
             self.status.emit(f"Erreur lors de la suppression: {e}", "error")
 
-    def _delete_registry_item(self, item: dict):
-        hive = self._get_hive_handle(item["hive"])
-        name = item["name"]
-
-        # on essaie de supprimer dans les deux clés (Run et Run-)
-        for path in [item.get("reg_path"), item.get("reg_opposite_path")]:
-            if not path:
-                continue
-            try:
-                with winreg.OpenKey(hive, path, 0, winreg.KEY_SET_VALUE) as key:
-                    winreg.DeleteValue(key, name)
-            except OSError:
-                # déjà absent : ignorer
-                continue
-
-    def _delete_folder_item(self, item: dict):
-        path = item["path"]
-        if os.path.exists(path):
-            os.remove(path)
-
     # =================================================================
     #  BACKUP JSON
     # =================================================================
@@ -2,21 +2,30 @@
 SystemInfoWidget - Composant autonome pour les informations système
 """
 
+import platform
+
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QHBoxLayout)
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont
 
 from .system_info_label import SystemInfoLabel
+from core.metrics_sampler import MetricsSubscription
 
 
 class SystemInfoWidget(QWidget):
-    """Composant autonome qui gère les informations système avec mise à jour automatique"""
+    """Composant autonome qui gère les informations système avec mise à jour automatique
+
+    Les mesures viennent du bus de métriques partagé (thread d'arrière-plan):
+    le widget ne fait aucun appel système depuis le thread de l'interface, et
+    l'échantillonnage s'arrête quand il n'est pas visible.
+    """
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.disk_path = 'C:\\' if platform.system() == 'Windows' else '/'
         self.setup_ui()
         self.setup_timer()
-        self.update_info()  # Mise à jour initiale
+        self.update_info()  # Mise à jour initiale (dernière mesure connue)
 
     def setup_ui(self):
         """Configuration de l'interface utilisateur"""
@@ -62,62 +71,44 @@ class SystemInfoWidget(QWidget):
         layout.addWidget(self.info_container)
 
     def setup_timer(self):
-        """Configurer le timer pour les mises à jour automatiques"""
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.update_info)
-        self.update_timer.start(2000)  # Mise à jour toutes les 2 secondes
+        """S'abonner au bus de métriques (toutes les 2 secondes)"""
+        self.subscription = MetricsSubscription(
+            self, self.on_metrics_updated,
+            ['cpu', 'memory', f'disk:{self.disk_path}'], interval=2
+        )
 
     def update_info(self):
-        """Mettre à jour toutes les informations système"""
-        try:
-            import psutil
-            import platform
-
-            # Mettre à jour CPU
-            try:
-                cpu_percent = psutil.cpu_percent(interval=0.1)
-                self.cpu_info.set_value(f"{cpu_percent:.1f}%")
-
-                # Mettre en surbrillance si CPU élevé
-                if cpu_percent > 80:
-                    self.cpu_info.set_highlight(True)
-                else:
-                    self.cpu_info.set_highlight(False)
-            except Exception:
-                self.cpu_info.set_value("N/A")
-                self.cpu_info.set_highlight(False)
-
-            # Mettre à jour RAM
-            try:
-                memory = psutil.virtual_memory()
-                self.memory_info.set_value(f"{memory.percent:.1f}%")
-
-                # Mettre en surbrillance si RAM élevée
-                if memory.percent > 85:
-                    self.memory_info.set_highlight(True)
-                else:
-                    self.memory_info.set_highlight(False)
-            except Exception:
-                self.memory_info.set_value("N/A")
-                self.memory_info.set_highlight(False)
-
-            # Mettre à jour Disque
-            try:
-                disk = psutil.disk_usage('C:\\' if platform.system() == 'Windows' else '/')
-                self.disk_info.set_value(f"{disk.percent:.1f}%")
-
-                # Mettre en surbrillance si disque presque plein
-                if disk.percent > 90:
-                    self.disk_info.set_highlight(True)
-                else:
-                    self.disk_info.set_highlight(False)
-            except Exception:
-                self.disk_info.set_value("N/A")
-                self.disk_info.set_highlight(False)
-
-        except Exception:
+        """Mettre à jour avec la dernière mesure connue et demander une nouvelle mesure"""
+        if self.subscription.sampler.latest:
+            self.on_metrics_updated(self.subscription.sampler.latest)
+        self.subscription.sampler.request_update()
+
+    def on_metrics_updated(self, metrics):
+        """Appliquer une mesure reçue de l'échantillonneur"""
+        if metrics.get('error'):
             # psutil non disponible ou autre erreur
             self.show_error_state()
+            return
+
+        # Mettre à jour CPU (surbrillance si CPU élevé)
+        self._apply_value(self.cpu_info, metrics.get('cpu_percent'), 80)
+
+        # Mettre à jour RAM (surbrillance si RAM élevée)
+        self._apply_value(self.memory_info, metrics.get('memory_percent'), 85)
+
+        # Mettre à jour Disque (surbrillance si disque presque plein)
+        disk = metrics.get('disks', {}).get(self.disk_path, {})
+        self._apply_value(self.disk_info, disk.get('percent'), 90)
+
+    def _apply_value(self, info_label, percent, threshold):
+        """Afficher un pourcentage et la surbrillance associée"""
+        if percent is None:
+            info_label.set_value("N/A")
+            info_label.set_highlight(False)
+            return
+
+        info_label.set_value(f"{percent:.1f}%")
+        info_label.set_highlight(percent > threshold)
 
     def show_error_state(self):
         """Afficher un état d'erreur si les informations système ne sont pas disponibles"""
@@ -132,15 +123,15 @@ class SystemInfoWidget(QWidget):
 
     def set_update_interval(self, seconds):
         """Définir l'intervalle de mise à jour en secondes"""
-        self.update_timer.setInterval(seconds * 1000)
+        self.subscription.set_interval(seconds)
 
     def start_updates(self):
         """Démarrer les mises à jour automatiques"""
-        self.update_timer.start()
+        self.subscription.set_enabled(True)
 
     def stop_updates(self):
         """Arrêter les mises à jour automatiques"""
-        self.update_timer.stop()
+        self.subscription.set_enabled(False)
 
     def get_cpu_info(self):
         """Obtenir les informations CPU actuelles"""
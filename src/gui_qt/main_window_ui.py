@@ -23,12 +23,12 @@ from core.cleaner import Cleaner
 from core.disk_analyzer import DiskAnalyzer
 from core.startup_manager import StartupManager
 from core.thread_manager import ThreadManager, WorkerType
+from core.metrics_sampler import get_metrics_sampler, stop_metrics_sampler
 
-# Widgets imports
-from gui_qt.components.modern_cleaner_widget import ModernCleanerWidget
-from gui_qt.components.disk_analysis_widget import DiskAnalysisWidget
-from gui_qt.components.windows_widget import WindowsWidget
-from gui_qt.components.startup_widget import StartupWidget
+from core import startup_profiler
+
+# Les widgets des pages sont importés à la première ouverture de leur page
+# (voir _ensure_page) pour accélérer le démarrage
 
 
 class MainWindowUI(QMainWindow):
@@ -38,6 +38,8 @@ class MainWindowUI(QMainWindow):
 
     def __init__(self):
         super().__init__()
+        startup_profiler.mark("main_window_init")
+        self._first_frame_shown = False
 
         # Configuration frameless
         self.setWindowFlags(Qt.FramelessWindowHint)
@@ -50,6 +52,7 @@ class MainWindowUI(QMainWindow):
         # Initialiser l'interface utilisateur générée
         self.ui = Ui_MainWindow()
         self.ui.setupUi(self)
+        startup_profiler.mark("ui_mainform_setup")
 
         # Ajuster les marges pour que le header soit au niveau du bord supérieur
         self.centralwidget = self.findChild(QWidget, "centralwidget")
@@ -80,10 +83,10 @@ class MainWindowUI(QMainWindow):
         self._setup_initial_state()
         self._apply_frameless_style()
 
-        # Timer pour les mises à jour périodiques
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self._update_status)
-        self.update_timer.start(1000)  # Mise à jour chaque seconde
+        # Les métriques système sont diffusées par le bus partagé (core.metrics_sampler):
+        # aucun timer périodique n'est nécessaire ici
+
+        startup_profiler.mark("main_window_built")
 
     def _setup_ui(self):
         """Configuration supplémentaire de l'interface"""
@@ -162,11 +165,16 @@ class MainWindowUI(QMainWindow):
         # Maintenant configurer les infos système séparément
         self._setup_system_info()
 
-        # Ajouter les widgets modernes au stack widget
-        self._setup_modern_cleaner()
-        self._setup_disk_analysis()
-        self._setup_windows_widget()
-        self._setup_startup_widget()
+        # Seule la page affichée au démarrage (nettoyage) est construite maintenant,
+        # les autres le sont à leur première ouverture
+        self._page_builders = {
+            0: self._setup_windows_widget,
+            1: self._setup_modern_cleaner,
+            2: self._setup_disk_analysis,
+            3: self._setup_startup_widget,
+        }
+        self._built_pages = set()
+        self._ensure_page(1)
 
         # Configurer les autres composants
         self._setup_connections()
@@ -178,6 +186,17 @@ class MainWindowUI(QMainWindow):
         # Corriger l'alignement des boutons de navigation après l'initialisation complète
         #self._fix_navigation_layout()
 
+    def _ensure_page(self, page_index):
+        """Construire le widget d'une page à sa première ouverture"""
+        if page_index in self._built_pages:
+            return
+        builder = self._page_builders.get(page_index)
+        if builder is None:
+            return
+        self._built_pages.add(page_index)
+        builder()
+        startup_profiler.mark(f"page_{page_index}_built")
+
     def _setup_modern_cleaner(self):
         """Configurer et ajouter le ModernCleanerWidget au stack widget"""
         from gui_qt.components.modern_cleaner_widget import ModernCleanerWidget
@@ -520,6 +539,9 @@ class MainWindowUI(QMainWindow):
 
     def _navigate_to_page(self, page_index):
         """Naviguer vers une page spécifique"""
+        # Construire la page si c'est sa première ouverture
+        self._ensure_page(page_index)
+
         # Mettre à jour le stack widget
         self.ui.stackedWidget.setCurrentIndex(page_index)
 
@@ -792,17 +814,37 @@ class MainWindowUI(QMainWindow):
                         border-bottom: 1px solid rgba(255, 255, 255, 0.1);
                     }
                 """)
+        if event.type() == event.Type.WindowStateChange:
+            # Aucune mesure système tant que la fenêtre est réduite
+            if self.isMinimized():
+                get_metrics_sampler().pause()
+            else:
+                get_metrics_sampler().resume()
         super().changeEvent(event)
 
+    def showEvent(self, event):
+        """Mesurer le temps jusqu'à la première image affichée"""
+        super().showEvent(event)
+        if not self._first_frame_shown:
+            self._first_frame_shown = True
+            QTimer.singleShot(0, self._on_first_frame)
+
+    def _on_first_frame(self):
+        """Appelé une fois la première image peinte"""
+        self.startup_time = startup_profiler.mark("first_frame")
+        startup_profiler.finish()
+
+        # Mode benchmark: quitter sans confirmation dès la première image
+        if startup_profiler.should_exit_after_first_frame():
+            self.thread_manager.stop_all_workers()
+            stop_metrics_sampler()
+            QApplication.quit()
+
     def closeEvent(self, event):
         """Gérer la fermeture de l'application"""
         # Arrêter tous les workers actifs
         self.thread_manager.stop_all_workers()
 
-        # Arrêter le timer
-        if self.update_timer.isActive():
-            self.update_timer.stop()
-
         # Arrêter les mises à jour du widget de disque
         if hasattr(self, 'disk_status_widget'):
             self.disk_status_widget.stop_updates()
@@ -818,6 +860,12 @@ class MainWindowUI(QMainWindow):
                                                    ["Oui", "Non"])
 
         if reply == "Oui":
+            # Arrêter l'échantillonneur de métriques en arrière-plan
+            stop_metrics_sampler()
+            # Arrêter le suivi en direct et l'export en cours de l'analyse disque
+            if hasattr(self, 'disk_analysis_widget'):
+                self.disk_analysis_widget.stop_live_watch()
+                self.disk_analysis_widget.stop_export()
             event.accept()
         else:
             event.ignore()
@@ -9,14 +9,20 @@ import os
 # Ajouter le répertoire src au chemin Python
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+# Importé en premier: référence des mesures du temps de démarrage
+from core import startup_profiler
+
 from PySide6.QtWidgets import QApplication
+startup_profiler.mark("import_pyside6")
 from gui_qt.main_window_ui import MainWindowUI
+startup_profiler.mark("import_main_window")
 
 def main():
     """Fonction principale"""
     app = QApplication(sys.argv)
     app.setApplicationName("NettoyeurRapide")
     app.setOrganizationName("Xenatronics")
+    startup_profiler.mark("qapplication")
 
     # Créer la fenêtre principale
     window = MainWindowUI()
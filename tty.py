@@ -1,8 +1,19 @@
 import requests
 import os
+import json
 import time
-
-ELEVENLABS_API_KEY = "sk_25d7e9a8061625eef2b8f143cb394c7f394e2ec7101d9a44"
+import shutil
+import hashlib
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+
+# Clé d'API lue uniquement dans l'environnement (voir require_api_key)
+ELEVENLABS_API_KEY = os.environ.get("ELEVENLABS_API_KEY", "").strip()
+
+# URL de l'API (remplaçable par un serveur local de test, ex: benchmarks/tts_stub_server.py)
+API_BASE_URL = os.environ.get("ELEVENLABS_API_URL", "https://api.elevenlabs.io").rstrip("/")
 #rachel="EXAVITQu4vr4xnSDxMaL"
 
 # Liste de voix masculines standard à tester
@@ -19,12 +30,35 @@ VOICE_ID = MALE_VOICES[0]  # Adam - première voix masculine par défaut
 
 OUTPUT_DIR = "tts_output"
 
+# Cache adressé par contenu (même disque que OUTPUT_DIR pour les liens physiques)
+CACHE_DIR = os.path.join(OUTPUT_DIR, ".cache")
+
+MODEL_ID = "eleven_multilingual_v2"
+VOICE_SETTINGS = {
+    "stability": 0.4,
+    "similarity_boost": 0.8
+}
+
+# Codes HTTP pour lesquels la requête est retentée après une pause
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Taille des blocs lus pendant le téléchargement de l'audio
+CHUNK_SIZE = 64 * 1024
+
+
+def require_api_key() -> str:
+    """Clé d'API ElevenLabs; erreur explicite si ELEVENLABS_API_KEY n'est pas définie"""
+    if not ELEVENLABS_API_KEY:
+        raise RuntimeError("La variable d'environnement ELEVENLABS_API_KEY n'est pas définie "
+                           "(clé d'API ElevenLabs requise)")
+    return ELEVENLABS_API_KEY
+
 
 def test_voice_available(voice_id: str) -> bool:
     """Teste si une voix est disponible avec l'API"""
+    headers = {"xi-api-key": require_api_key()}
     try:
-        url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
-        headers = {"xi-api-key": ELEVENLABS_API_KEY}
+        url = f"{API_BASE_URL}/v1/text-to-speech/{voice_id}"
         response = requests.get(url + "/settings", headers=headers, timeout=10)
         return response.status_code == 200
     except:
@@ -41,7 +75,297 @@ def get_working_voice_id() -> str:
     print(f"⚠️ Aucune voix masculine testée n'a fonctionné, utilisation de: {MALE_VOICES[0]}")
     return MALE_VOICES[0]
 
-def generate_astuce(num: int) -> str:
+def create_session(pool_size: int = 4) -> requests.Session:
+    """Session HTTP avec connexions réutilisées (une par requête simultanée)"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "Accept": "audio/mpeg",
+        "Content-Type": "application/json",
+        "xi-api-key": require_api_key()
+    })
+    return session
+
+
+class RateLimiter:
+    """Espacement minimal entre deux requêtes, partagé par tous les threads
+
+    Une réponse 429 suspend toutes les requêtes pendant la durée demandée.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = max(0.0, interval)
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, seconds: float):
+        with self._lock:
+            self._next_time = max(self._next_time, time.monotonic() + seconds)
+
+
+def _retry_delay(response, attempt: int, backoff: float) -> float:
+    """Pause avant une nouvelle tentative: Retry-After si fourni, sinon exponentielle"""
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+    return backoff * (2 ** attempt)
+
+
+class IncompleteAudioError(IOError):
+    """Audio reçu vide ou tronqué"""
+
+
+def _stream_to_file(response, dest_path: str):
+    """Écrire le corps de la réponse par blocs dans un fichier temporaire puis le renommer
+
+    Vérifie que l'audio n'est pas vide et que sa longueur correspond à
+    Content-Length. Un téléchargement interrompu ou invalide ne laisse aucun
+    fichier. Retourne (taille, empreinte SHA-256).
+    """
+    directory = os.path.dirname(dest_path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".part")
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                if chunk:
+                    f.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+
+        expected = response.headers.get("Content-Length")
+        # Content-Length porte sur le corps compressé si Content-Encoding est présent
+        if expected and not response.headers.get("Content-Encoding") and int(expected) != size:
+            raise IncompleteAudioError(f"Audio incomplet: {size} octets reçus sur {expected}")
+        if size == 0:
+            raise IncompleteAudioError("Audio vide reçu")
+
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    return size, digest.hexdigest()
+
+
+def synthesize_to_file(text: str, voice_id: str, dest_path: str,
+                       session: requests.Session = None, limiter: RateLimiter = None,
+                       max_retries: int = 5, backoff: float = 1.0):
+    """Demande l'audio d'un texte à l'API et l'enregistre en continu dans dest_path
+
+    Les réponses limitées (429, 5xx), les coupures et les audios incomplets
+    sont retentés. Retourne (taille, empreinte SHA-256).
+    """
+    session = session or create_session(1)
+    url = f"{API_BASE_URL}/v1/text-to-speech/{voice_id}?optimize_streaming_latency=0"
+
+    payload = {
+        "text": text,
+        "model_id": MODEL_ID,
+        "voice_settings": VOICE_SETTINGS
+    }
+
+    for attempt in range(max_retries + 1):
+        if limiter:
+            limiter.wait()
+
+        response = None
+        try:
+            response = session.post(url, json=payload, timeout=60, stream=True)
+            with response:
+                if response.status_code not in RETRY_STATUS_CODES or attempt == max_retries:
+                    response.raise_for_status()
+                    return _stream_to_file(response, dest_path)
+        except (requests.ConnectionError, requests.Timeout,
+                requests.exceptions.ChunkedEncodingError, IncompleteAudioError):
+            if attempt == max_retries:
+                raise
+            response = None
+
+        delay = _retry_delay(response, attempt, backoff)
+        if limiter and response is not None and response.status_code == 429:
+            limiter.pause(delay)
+        time.sleep(delay)
+
+    raise RuntimeError("Nombre maximal de tentatives atteint")
+
+
+class AudioCache:
+    """Cache local des audios générés, adressé par contenu
+
+    La clé est l'empreinte SHA-256 de (texte, voix, modèle, réglages): un
+    même audio n'est demandé qu'une fois à l'API et stocké une seule fois,
+    puis lié (lien physique, sinon copie) vers astuce_N.mp3. L'index
+    (index.json) décrit chaque entrée et la clé actuellement liée à chaque
+    fichier de sortie.
+    """
+
+    def __init__(self, cache_dir: str = None):
+        self.cache_dir = cache_dir or CACHE_DIR
+        self.index_path = os.path.join(self.cache_dir, "index.json")
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.entries = {}
+        self.outputs = {}
+        self._verified = {}  # clé -> (taille, date) du fichier dont l'empreinte a été contrôlée
+        self.load()
+
+    @staticmethod
+    def make_key(text: str, voice_id: str, model_id: str, settings: dict) -> str:
+        """Empreinte du contenu demandé à l'API"""
+        data = json.dumps([text, voice_id, model_id, settings], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def load(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.entries = data.get("entries", {})
+        self.outputs = data.get("outputs", {})
+
+    def save(self):
+        """Enregistrer l'index (écriture atomique) s'il a changé"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"entries": dict(self.entries), "outputs": dict(self.outputs)}
+            self._dirty = False
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.index_path)
+
+    def blob_path(self, key: str) -> str:
+        """Chemin de l'audio d'une clé dans le cache"""
+        return os.path.join(self.cache_dir, f"{key}.mp3")
+
+    def get(self, key: str, verify: bool = True):
+        """Chemin de l'audio en cache, ou None s'il est absent ou altéré
+
+        La taille est toujours contrôlée. Avec verify (par défaut), l'empreinte
+        SHA-256 est aussi recalculée, une fois par session tant que le fichier
+        ne change pas; une entrée altérée est retirée de l'index pour être
+        régénérée.
+        """
+        with self._lock:
+            entry = self.entries.get(key)
+        if entry is None:
+            return None
+        path = self.blob_path(key)
+        try:
+            st = os.stat(path)
+            if st.st_size != entry["size"]:
+                return None
+            if verify and entry.get("sha256"):
+                stamp = (st.st_size, st.st_mtime_ns)
+                with self._lock:
+                    verified = self._verified.get(key) == stamp
+                if not verified:
+                    if _file_sha256(path) != entry["sha256"]:
+                        self._discard(key, entry)
+                        return None
+                    with self._lock:
+                        self._verified[key] = stamp
+        except OSError:
+            return None
+        return path
+
+    def _discard(self, key: str, entry: dict):
+        """Retirer de l'index une entrée dont l'audio ne correspond plus à l'empreinte"""
+        with self._lock:
+            if self.entries.get(key) is entry:
+                del self.entries[key]
+                self._verified.pop(key, None)
+                self._dirty = True
+
+    def add(self, key: str, size: int, sha256: str, **meta):
+        """Enregistrer dans l'index un audio écrit dans blob_path(key)"""
+        with self._lock:
+            self.entries[key] = dict(meta, size=size, sha256=sha256)
+            self._verified.pop(key, None)
+            self._dirty = True
+
+    def is_linked(self, key: str, target: str) -> bool:
+        """Vérifier si le fichier de sortie contient déjà l'audio de cette clé"""
+        with self._lock:
+            linked = self.outputs.get(os.path.basename(target)) == key
+        return linked and os.path.isfile(target) and self.get(key) is not None
+
+    def is_tracked(self, target: str) -> bool:
+        """Vérifier si le fichier de sortie a été produit via le cache"""
+        with self._lock:
+            return os.path.basename(target) in self.outputs
+
+    def link(self, key: str, target: str):
+        """Lier l'audio en cache vers le fichier de sortie (après contrôle par get)"""
+        source = self.blob_path(key)
+        tmp_path = f"{target}.{threading.get_ident()}.tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        try:
+            os.link(source, tmp_path)
+        except OSError:
+            # Liens physiques non supportés: copie
+            shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, target)
+
+        with self._lock:
+            self.outputs[os.path.basename(target)] = key
+            self._dirty = True
+
+
+def _file_sha256(path: str) -> str:
+    """Empreinte SHA-256 d'un fichier, lu par blocs"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+_audio_cache = None
+_audio_cache_lock = threading.Lock()
+
+
+def get_audio_cache() -> AudioCache:
+    """Cache audio partagé"""
+    global _audio_cache
+    with _audio_cache_lock:
+        if _audio_cache is None:
+            _audio_cache = AudioCache()
+        return _audio_cache
+
+
+def astuce_key(num: int, voice_id: str = None) -> str:
+    """Clé de cache de l'astuce num avec la voix donnée (voix courante par défaut)"""
+    return AudioCache.make_key(f"Astuce numéro {num}", voice_id or VOICE_ID, MODEL_ID, VOICE_SETTINGS)
+
+
+def generate_astuce(num: int, session: requests.Session = None,
+                    limiter: RateLimiter = None, cache: AudioCache = None) -> str:
     """
     Génère un fichier audio ElevenLabs contenant la phrase :
     'astuce numéro {num}'
@@ -55,76 +379,143 @@ def generate_astuce(num: int) -> str:
         VOICE_ID = get_working_voice_id()
         generate_astuce.voice_tested = True
 
-    # Préparation
+    # Appel isolé: l'index du cache est enregistré à la fin (sinon par l'appelant)
+    save_index = cache is None
+    cache = cache or get_audio_cache()
     text = f"Astuce numéro {num}"
-    url = f"https://api.elevenlabs.io/v1/text-to-speech/{VOICE_ID}?optimize_streaming_latency=0"
-
-    payload = {
-        "text": text,
-        "model_id": "eleven_multilingual_v2",
-        "voice_settings": {
-            "stability": 0.4,
-            "similarity_boost": 0.8
-        }
-    }
-
-    headers = {
-        "Accept": "audio/mpeg",
-        "Content-Type": "application/json",
-        "xi-api-key": ELEVENLABS_API_KEY
-    }
-
-    # Requête API
-    response = requests.post(url, json=payload, headers=headers)
-    response.raise_for_status()
+    key = astuce_key(num)
 
     # Création dossier si besoin
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
     filename = os.path.join(OUTPUT_DIR, f"astuce_{num}.mp3")
 
-    # Écriture fichier
-    with open(filename, "wb") as f:
-        f.write(response.content)
+    # Requête API seulement si ce texte n'a jamais été généré avec cette voix et ces réglages
+    if cache.get(key) is None:
+        size, sha256 = synthesize_to_file(text, VOICE_ID, cache.blob_path(key), session, limiter)
+        cache.add(key, size, sha256, text=text, voice_id=VOICE_ID, model_id=MODEL_ID)
 
+    cache.link(key, filename)
+    if save_index:
+        cache.save()
     return filename
 
 
-def generate_astuces_range(start: int, end: int, tempo: float = 0.5):
+def generate_astuces_batch(start: int, end: int, workers: int = 4, tempo: float = 0.5,
+                           overwrite: bool = False, on_result=None):
+    """
+    Génère une plage d'astuces en parallèle
+
+    Args:
+        start, end: plage de numéros (inclus)
+        workers: nombre de requêtes simultanées
+        tempo: espacement minimal en secondes entre deux requêtes (tous threads confondus)
+        overwrite: remplacer les fichiers présents produits hors cache (sinon reprise: ils sont ignorés)
+        on_result: appelé pour chaque numéro avec (num, fichier ou None, erreur ou None, ignoré)
+
+    Retourne (fichiers générés, fichiers ignorés, [(num, erreur)]).
+    """
+    global VOICE_ID
+
+    # Choisir la voix une seule fois, avant de lancer les threads
+    if not hasattr(generate_astuce, 'voice_tested'):
+        VOICE_ID = get_working_voice_id()
+        generate_astuce.voice_tested = True
+
+    successful_files = []
+    skipped_files = []
+    failed_files = []
+
+    cache = get_audio_cache()
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    todo = []
+    for num in range(start, end + 1):
+        filename = os.path.join(OUTPUT_DIR, f"astuce_{num}.mp3")
+        key = astuce_key(num)
+
+        if cache.is_linked(key, filename):
+            # Déjà à jour
+            skipped_files.append(filename)
+            if on_result:
+                on_result(num, filename, None, True)
+        elif cache.get(key) is not None:
+            # Déjà généré (autre plage ou voix précédente): aucun appel API
+            cache.link(key, filename)
+            successful_files.append(filename)
+            if on_result:
+                on_result(num, filename, None, False)
+        elif (not overwrite and not cache.is_tracked(filename)
+              and os.path.isfile(filename) and os.path.getsize(filename) > 0):
+            # Fichier produit hors cache: conservé (reprise)
+            skipped_files.append(filename)
+            if on_result:
+                on_result(num, filename, None, True)
+        else:
+            todo.append(num)
+
+    if not todo:
+        cache.save()
+        return successful_files, skipped_files, failed_files
+
+    workers = max(1, min(workers, len(todo)))
+    session = create_session(workers)
+    limiter = RateLimiter(tempo)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(generate_astuce, num, session, limiter, cache): num for num in todo}
+            for future in as_completed(futures):
+                num = futures[future]
+                try:
+                    filename = future.result()
+                    successful_files.append(filename)
+                    if on_result:
+                        on_result(num, filename, None, False)
+                except Exception as e:
+                    failed_files.append((num, str(e)))
+                    if on_result:
+                        on_result(num, None, str(e), False)
+    finally:
+        session.close()
+        cache.save()
+
+    failed_files.sort()
+    return successful_files, skipped_files, failed_files
+
+
+def generate_astuces_range(start: int, end: int, tempo: float = 0.5,
+                           workers: int = 4, overwrite: bool = False):
     """
     Génère des fichiers audio pour une plage de numéros avec tempo personnalisé
 
     Args:
         start: numéro de départ
         end: numéro de fin (inclus)
-        tempo: délai en secondes entre chaque génération (défaut: 0.5)
+        tempo: délai minimal en secondes entre deux requêtes (défaut: 0.5)
+        workers: nombre de requêtes simultanées (défaut: 4)
+        overwrite: régénérer les fichiers existants (défaut: reprise, ils sont ignorés)
     """
     total_files = end - start + 1
     print(f"Génération de {total_files} fichiers audio (de {start} à {end})...")
-    print(f"Tempo: {tempo}s entre chaque génération")
+    print(f"Tempo: {tempo}s entre deux requêtes, {workers} requêtes simultanées")
 
-    successful_files = []
-    failed_files = []
-
-    for i in range(start, end + 1):
-        try:
-            print(f"Génération de l'astuce {i}... ", end="")
-            filename = generate_astuce(i)
-            successful_files.append(filename)
+    def report(num, filename, error, skipped):
+        if skipped:
+            return
+        if error:
+            print(f"✗ Astuce {num}: {error}")
+        else:
             print(f"✓ {os.path.basename(filename)}")
 
-            # Pause personnalisée pour éviter de surcharger l'API
-            if tempo > 0:
-                time.sleep(tempo)
-
-        except Exception as e:
-            print(f"✗ Erreur: {e}")
-            failed_files.append((i, str(e)))
+    successful_files, skipped_files, failed_files = generate_astuces_batch(
+        start, end, workers=workers, tempo=tempo, overwrite=overwrite, on_result=report
+    )
 
     # Résumé
     print("\n" + "="*50)
     print("RÉSUMÉ DE LA GÉNÉRATION:")
     print(f"✓ Fichiers générés avec succès: {len(successful_files)}/{total_files}")
+    print(f"↷ Fichiers déjà présents (ignorés): {len(skipped_files)}")
     print(f"✗ Échecs: {len(failed_files)}")
 
     if successful_files:
@@ -143,6 +534,10 @@ def generate_astuces_range(start: int, end: int, tempo: float = 0.5):
 if __name__ == "__main__":
     print("=== Générateur d'Astuces Audio (Voix Masculine) ===")
 
+    if not ELEVENLABS_API_KEY:
+        print("Erreur: définissez la variable d'environnement ELEVENLABS_API_KEY (clé d'API ElevenLabs)")
+        exit(1)
+
     # Saisie utilisateur pour la plage
     try:
         start_input = input("Début du numéro d'astuce : ")
@@ -169,11 +564,18 @@ if __name__ == "__main__":
                 print("Erreur: le tempo doit être positif")
                 exit(1)
 
+        # Nombre de requêtes simultanées
+        workers_input = input("Requêtes simultanées (défaut: 4) : ")
+        workers = int(workers_input) if workers_input.strip() else 4
+        if workers < 1:
+            print("Erreur: il faut au moins une requête simultanée")
+            exit(1)
+
     except ValueError:
         print("Erreur: veuillez entrer des nombres valides")
         exit(1)
 
-    print(f"\nConfiguration: Plage {start}-{end}, Tempo: {tempo}s")
+    print(f"\nConfiguration: Plage {start}-{end}, Tempo: {tempo}s, {workers} requêtes simultanées")
     print("-" * 50)
 
     # Lancement de la génération
@@ -185,5 +587,5 @@ if __name__ == "__main__":
         except Exception as e:
             print(f"❌ Erreur lors de la génération: {e}")
     else:
-        # Plusieurs fichiers avec tempo
-        generate_astuces_range(start, end, tempo)
+        # Plusieurs fichiers en parallèle (les fichiers déjà présents sont ignorés)
+        generate_astuces_range(start, end, tempo, workers)